@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Tuple
+import os
+import threading
+import time
+import numpy as np
+from knowledge_index import normalize
+
+# Local action router for core_intelligence.action().
+#
+# Each action label has a handful of exemplar prompts. Their MiniLM embeddings are averaged into
+# one unit centroid per label, and a task is routed to the closest centroid. Long tasks are
+# scored on their opening and closing windows, since that is where a requested action or a
+# completion claim usually sits and MiniLM only reads the first few hundred tokens.
+# When the best score or its margin over the runner-up is too small, route() returns None and
+# the caller falls back to the LLM classifier.
+#
+# Only "chat" and "reason" are ever decided from embeddings. Ending intelligence() takes the
+# literal "{goal-reached}" token; a task that merely reads like a completion claim (previous
+# outputs often talk about achieving the objective) matches the goal-reached centroid and is
+# sent to the LLM to confirm, rather than stopping the loop on similarity alone.
+
+ROUTER_MIN_SCORE = float(os.getenv("ROUTER_MIN_SCORE", "0.45"))
+ROUTER_MIN_MARGIN = float(os.getenv("ROUTER_MIN_MARGIN", "0.05"))
+WINDOW_CHARS = 1000
+GOAL_REACHED = "{goal-reached}"
+
+EXEMPLARS: Dict[str, List[str]] = {
+    "chat": [
+        "Hey, how is it going?",
+        "Can you explain how transformers use attention?",
+        "What do you think about the latest open-source language models?",
+        "Tell me more about that idea.",
+        "Here is an overview of the current state of neuronic interfaces and what it means for the Developer.",
+        "Summarize what we have covered so far.",
+        "Thanks, that helps. What should I read next?",
+    ],
+    "reason": [
+        "I would like the system to reason about the trade-offs of this architecture.",
+        "Reason over whether we should build the bridge layer in Python or C++.",
+        "Please perform a reasoning process on this plan and weigh the arguments for and against it.",
+        "Request: reason about how to integrate existing technology into neuronic interface systems.",
+        "Argue for and against this approach and give a balanced recommendation.",
+        "Action requested: reason. Parameters: evaluate the feasibility of embedding AGI modules in hardware.",
+    ],
+    # a close match here sends the task to the LLM; see route()
+    GOAL_REACHED: [
+        "The goal has been achieved. {goal-reached}",
+        "All steps toward the objective are complete and the goal is reached.",
+        "This concludes the process; the objective has been fully accomplished.",
+        "Final output for the Developer: the goal has been met. {goal-reached}",
+        "The measures taken have achieved the overall intent of the goal.",
+    ],
+}
+
+
+class ActionRouter:
+    def __init__(self, model, exemplars: Dict[str, List[str]] = None,
+                 min_score: float = ROUTER_MIN_SCORE, min_margin: float = ROUTER_MIN_MARGIN):
+        self.model = model
+        self.exemplars = exemplars or EXEMPLARS
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.labels: List[str] = []
+        self.centroids = None
+        self.lock = threading.Lock()
+        self.routed = 0
+        self.fallbacks = 0
+        self.seconds = 0.0
+
+    def _ensure_centroids(self):
+        if self.centroids is not None:
+            return
+        labels = list(self.exemplars)
+        rows = []
+        for label in labels:
+            vectors = normalize(self.model.encode(self.exemplars[label]))
+            rows.append(vectors.mean(axis=0))
+        self.labels = labels
+        self.centroids = normalize(np.stack(rows))
+
+    def classify(self, task: str) -> Tuple[str, float, float]:
+        """Best label, its cosine score and its margin over the second-best label."""
+        self._ensure_centroids()
+        windows = [task[:WINDOW_CHARS]]
+        if len(task) > WINDOW_CHARS:
+            windows.append(task[-WINDOW_CHARS:])
+        scores = (normalize(self.model.encode(windows)) @ self.centroids.T).max(axis=0)
+        order = np.argsort(-scores)
+        best, second = order[0], order[1] if len(order) > 1 else order[0]
+        return self.labels[best], float(scores[best]), float(scores[best] - scores[second])
+
+    def route(self, task: str) -> Optional[str]:
+        """The label when the router is confident, otherwise None (use the LLM)."""
+        started = time.perf_counter()
+        if GOAL_REACHED in task.lower():
+            label, confident = GOAL_REACHED, True
+            score, margin = 1.0, 1.0
+        else:
+            label, score, margin = self.classify(task)
+            # terminating is never decided on similarity alone
+            confident = label != GOAL_REACHED and score >= self.min_score and margin >= self.min_margin
+        elapsed = time.perf_counter() - started
+
+        with self.lock:
+            self.seconds += elapsed
+            if confident:
+                self.routed += 1
+            else:
+                self.fallbacks += 1
+        print(f"[DEBUG] Router: {label} score {score:.2f} margin {margin:.2f} "
+              f"({'local' if confident else 'LLM fallback'}, {elapsed * 1000:.1f} ms)")
+        return label if confident else None
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            total = self.routed + self.fallbacks
+            return {
+                "routed_locally": self.routed,
+                "llm_fallbacks": self.fallbacks,
+                "hit_rate": (self.routed / total) if total else 0.0,
+                "avg_latency_ms": (self.seconds / total * 1000) if total else 0.0,
+            }
@@ -0,0 +1,75 @@
+from typing import Any, Awaitable
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+
+# One background event loop for the async pipeline (athink() and friends).
+#
+# Async provider clients (google-genai's client.aio, httpx) bind connections to the loop that
+# first used them, so every pipeline coroutine runs on this one loop no matter who asks:
+#
+#   - blocking callers (life(), fan-out threads, the deepdive loop) use run(coro), which waits
+#     on the result like a normal function call;
+#   - coroutines on another loop (FastAPI/uvicorn routes) use `await submit(coro)`, which waits
+#     without blocking their own loop.
+#
+# The caller's contextvars (priority lane, agent, directive, open trace span) go with the coroutine.
+
+_loop = None
+_lock = threading.Lock()
+
+
+def loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                new_loop = asyncio.new_event_loop()
+                threading.Thread(target=new_loop.run_forever, name="void-async", daemon=True).start()
+                _loop = new_loop
+    return _loop
+
+
+def _on_runner_loop() -> bool:
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def _schedule(coro: Awaitable) -> concurrent.futures.Future:
+    future = concurrent.futures.Future()
+    ctx = contextvars.copy_context()
+
+    def start():
+        # tasks copy the context current at creation, so create it inside the caller's context
+        task = ctx.run(loop().create_task, coro)
+        task.add_done_callback(lambda done: _settle(future, done))
+
+    loop().call_soon_threadsafe(start)
+    return future
+
+
+def _settle(future: concurrent.futures.Future, task: asyncio.Task):
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+def run(coro: Awaitable) -> Any:
+    """Run a pipeline coroutine from blocking code and return its result."""
+    if _on_runner_loop():
+        coro.close()
+        raise RuntimeError("run() would block the pipeline loop; await the coroutine instead")
+    return _schedule(coro).result()
+
+
+async def submit(coro: Awaitable) -> Any:
+    """Await a pipeline coroutine from any event loop."""
+    if _on_runner_loop():
+        return await coro
+    return await asyncio.wrap_future(_schedule(coro))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+bench_pipeline.py
+Measures the pipeline's own overhead (retrieval, encoding, prompt assembly, memory writes)
+with the LLM replaced by the deterministic StubBackend.
+
+Drives thought(), reason(), action() and intelligence() against synthetic knowledge bases and
+reports p50/p95 wall time plus peak traced memory per stage:
+
+    python bench_pipeline.py --sizes 1000 10000 100000 --runs 5 --latency 0.05
+
+By default a hashing bag-of-words encoder stands in for MiniLM so 100k nodes encode in
+seconds; --encoder minilm uses the real model (and the shared embedding cache) instead.
+Everything the pipeline writes (memory.json, prompt cache, checkpoints) goes to a temp dir.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.append(os.path.join(HERE, "..", "void_shared"))
+
+DIM = 384
+
+ACTION_TASK = "Please reason over whether the bridge layer should be built in Python or C++."
+GOAL = "Decide on ways to integrate existing technology into neuronic interface systems."
+
+FILLER = [f"term{i}" for i in range(500)]
+
+
+class HashingEncoder:
+    """Deterministic stand-in for MiniLM: each word gets a fixed random vector, a text is their sum."""
+
+    def __init__(self, dim: int = DIM):
+        self.dim = dim
+        self.words = {}
+
+    def _word(self, word):
+        vector = self.words.get(word)
+        if vector is None:
+            seed = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            self.words[word] = vector
+        return vector
+
+    def encode(self, sentences, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                out[row] += self._word(word.strip(".,:;'\"()"))
+        return out[0] if single else out
+
+
+def synthetic_knowledge(size: int, directive_words, relevant_fraction: float = 0.01, seed: int = 7):
+    """
+    Mostly filler nodes, plus a small share that quote a window of the prime directive so
+    retrieval and the usefulness filter pass a realistic handful of nodes, as in production.
+    """
+    rng = np.random.default_rng(seed)
+    filler = np.array(FILLER)
+    nodes = []
+    for i in range(size):
+        if rng.random() < relevant_fraction:
+            start = int(rng.integers(0, max(len(directive_words) - 16, 1)))
+            words = directive_words[start:start + 16] + list(rng.choice(filler, size=4))
+        else:
+            words = list(rng.choice(filler, size=16))
+        nodes.append({"id": f"node-{i}", "text": " ".join(words), "category": "bench", "tags": []})
+    return nodes
+
+
+def directive_intents(directive_words):
+    """(intent, objective) pairs phrased from the prime directive, like the goals life() produces."""
+    return [
+        (" ".join(directive_words[0:12]), " ".join(directive_words[12:24])),
+        (" ".join(directive_words[20:32]), " ".join(directive_words[32:44])),
+    ]
+
+
+def percentile(samples, q):
+    return float(np.percentile(np.array(samples), q)) if samples else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the thought/reason/action/intelligence pipeline offline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per stage and size")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per LLM call")
+    parser.add_argument("--tokens", type=int, default=200, help="simulated completion tokens per LLM call")
+    parser.add_argument("--iterations", type=int, default=3, help="intelligence() iteration budget")
+    parser.add_argument("--encoder", choices=["hashing", "minilm"], default="hashing")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="void-bench-")
+    os.chdir(workdir)
+    os.environ.setdefault("VOID_CHECKPOINT_DIR", os.path.join(workdir, "checkpoints"))
+
+    # quiet the pipeline's debug prints; the report goes to the real stdout
+    report_out = sys.stdout
+    devnull = open(os.devnull, "w")
+
+    import llm_backends
+    import knowledge_base
+    import memory_base
+    import core_intelligence as core
+    from budget import Budget
+
+    llm_backends.set_backend(llm_backends.StubBackend(latency=args.latency, tokens=args.tokens))
+    # never serve a stage from the prompt cache; every call should reach the backend
+    for stage in core.CACHE_TTLS:
+        core.CACHE_TTLS[stage] = 0
+    core.DEFAULT_CACHE_TTL = 0
+
+    if args.encoder == "hashing":
+        encoder = HashingEncoder()
+        core.get_model = lambda: encoder
+
+    memory_base.MEMORY_FILE = os.path.join(workdir, "memory.json")
+    knowledge_base.KNOWLEDGE_FILE = os.path.join(workdir, "knowledge.json")
+    directive_words = core.prime_directive.split()
+    intents = directive_intents(directive_words)
+
+    stages = {
+        "thought": lambda i: core.thought(*intents[i % len(intents)], bypass_cache=True),
+        "reason": lambda i: core.reason(" ".join(intents[i % len(intents)]), bypass_cache=True),
+        "action": lambda i: core.action(ACTION_TASK, "", bypass_cache=True),
+        "intelligence": lambda i: core.intelligence(GOAL, budget=Budget(max_iterations=args.iterations)),
+    }
+
+    print(f"LLM stub: {args.latency * 1000:.0f} ms, {args.tokens} tokens per call; encoder: {args.encoder}; "
+          f"workdir: {workdir}", file=report_out)
+    print(f"{'nodes':>8} {'stage':<13} {'p50 s':>8} {'p95 s':>8} {'peak MB':>9}", file=report_out)
+
+    for size in args.sizes:
+        knowledge_base.knowledge = synthetic_knowledge(size, directive_words)
+        knowledge_base._loaded = True
+        memory_base.memory = []
+        memory_base._loaded = True
+        core._knowledge_index = None
+        core._directive_vecs.clear()
+        core._action_router = None
+
+        with contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            core.get_knowledge_index()
+            index_seconds = time.perf_counter() - started
+            core.get_prime_directive_vec()
+        print(f"{size:>8} {'index build':<13} {index_seconds:8.3f} {'':>8} {'':>9}", file=report_out)
+
+        for name, run in stages.items():
+            timings = []
+            with contextlib.redirect_stdout(devnull):
+                run(0)  # warm-up
+                for i in range(args.runs):
+                    started = time.perf_counter()
+                    run(i)
+                    timings.append(time.perf_counter() - started)
+
+                peak_mb = float("nan")
+                if not args.no_memory:
+                    # separate pass: tracemalloc slows allocation-heavy code and would skew the timings
+                    tracemalloc.start()
+                    run(args.runs)
+                    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+                    tracemalloc.stop()
+
+            print(f"{size:>8} {name:<13} {percentile(timings, 50):8.3f} {percentile(timings, 95):8.3f} "
+                  f"{peak_mb:9.1f}", file=report_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+bench_store.py
+Compares full-list scans with node_index.NodeIndex lookups for memory/knowledge-shaped nodes:
+
+    python bench_store.py --sizes 10000 100000 1000000 --lookups 50
+
+For each size it builds synthetic nodes (CATEGORIES categories, TAGS tags, a few tags per node)
+and times the queries memory_base/knowledge_base serve: by tag, by category, by both, and an
+id lookup as update_memory()/update_knowledge() do it. "scan" is the list comprehension the
+modules used before the index; "index" is NodeIndex. Reported times are medians per query.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+from node_index import NodeIndex
+
+CATEGORIES = 20
+TAGS = 500
+
+
+def synthetic_nodes(size: int, rng: random.Random):
+    return [{
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "text": f"node {i}",
+        "category": f"category{rng.randrange(CATEGORIES)}",
+        "tags": [f"tag{rng.randrange(TAGS)}" for _ in range(rng.randint(1, 4))],
+    } for i in range(size)]
+
+
+def scan(nodes, category=None, tag=None):
+    results = nodes
+    if category:
+        results = [m for m in results if m.get("category") == category]
+    if tag:
+        results = [m for m in results if tag in m.get("tags", [])]
+    return results
+
+
+def scan_id(nodes, node_id):
+    for node in nodes:
+        if node["id"] == node_id:
+            return node
+    return None
+
+
+def median_seconds(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scanned vs indexed memory/knowledge lookups.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=50, help="timed queries per kind and size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'query':<18} {'scan ms':>10} {'index ms':>10} {'speedup':>9} {'matches':>8}")
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        nodes = synthetic_nodes(size, rng)
+        index = NodeIndex()
+        start = time.perf_counter()
+        index.rebuild(nodes)
+        print(f"{size:>8} {'index build':<18} {'':>10} {(time.perf_counter() - start) * 1000:10.1f}")
+
+        tags = [(None, f"tag{rng.randrange(TAGS)}") for _ in range(args.lookups)]
+        categories = [(f"category{rng.randrange(CATEGORIES)}", None) for _ in range(args.lookups)]
+        both = [(f"category{rng.randrange(CATEGORIES)}", f"tag{rng.randrange(TAGS)}") for _ in range(args.lookups)]
+        ids = [(rng.choice(nodes)["id"],) for _ in range(args.lookups)]
+
+        for name, queries in (("tag", tags), ("category", categories), ("category+tag", both)):
+            for category, tag in queries[:3]:
+                assert scan(nodes, category, tag) == index.get(category, tag)
+            scan_s = median_seconds(lambda c, t: scan(nodes, c, t), queries)
+            index_s = median_seconds(index.get, queries)
+            matches = statistics.median(len(index.get(c, t)) for c, t in queries)
+            print(f"{size:>8} {name:<18} {scan_s * 1000:10.3f} {index_s * 1000:10.3f} "
+                  f"{scan_s / index_s:8.0f}x {matches:8.0f}")
+
+        scan_s = median_seconds(lambda node_id: scan_id(nodes, node_id), ids)
+        index_s = median_seconds(index.by_id.get, ids)
+        print(f"{size:>8} {'id (update)':<18} {scan_s * 1000:10.3f} {index_s * 1000:10.3f} {scan_s / index_s:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from typing import Optional, Dict, Any
+import os
+import threading
+import time
+
+# Per-goal resource budget for intelligence() and action().
+# A budget caps loop iterations, wall-clock seconds and prompt+completion tokens. Any limit
+# left as None is unbounded. think() charges tokens as calls complete; the loop checks
+# exhausted() between iterations and stops with the best result it has so far.
+
+DEFAULT_MAX_ITERATIONS = int(os.getenv("INTELLIGENCE_MAX_ITERATIONS", "20"))
+DEFAULT_MAX_SECONDS = float(os.getenv("INTELLIGENCE_MAX_SECONDS", str(4 * 60 * 60)))
+DEFAULT_MAX_TOKENS = int(os.getenv("INTELLIGENCE_MAX_TOKENS", "400000"))
+
+
+class Budget:
+    def __init__(self, max_iterations: Optional[int] = DEFAULT_MAX_ITERATIONS,
+                 max_seconds: Optional[float] = DEFAULT_MAX_SECONDS,
+                 max_tokens: Optional[int] = DEFAULT_MAX_TOKENS):
+        self.max_iterations = max_iterations
+        self.max_seconds = max_seconds
+        self.max_tokens = max_tokens
+        self.iterations = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.calls = 0
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def charge(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        with self.lock:
+            self.prompt_tokens += prompt_tokens or 0
+            self.completion_tokens += completion_tokens or 0
+            self.calls += 1
+
+    def tick(self):
+        with self.lock:
+            self.iterations += 1
+
+    def exhausted(self) -> Optional[str]:
+        """Which limit has run out ("iterations", "time" or "tokens"), or None while there is budget left."""
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            return "iterations"
+        if self.max_seconds is not None and self.elapsed >= self.max_seconds:
+            return "time"
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return "tokens"
+        return None
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "iterations": self.iterations,
+            "max_iterations": self.max_iterations,
+            "seconds": round(self.elapsed, 2),
+            "max_seconds": self.max_seconds,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "max_tokens": self.max_tokens,
+            "llm_calls": self.calls,
+            "exhausted": self.exhausted(),
+        }
@@ -0,0 +1,56 @@
+from typing import Optional, Dict, Any
+import glob
+import json
+import os
+import time
+
+# Compact life() checkpoints.
+# One small JSON file is written after every completed intelligence process. Writes go to a
+# temp file first and are moved into place, so a crash mid-write never leaves a torn checkpoint.
+# Only the newest KEEP_CHECKPOINTS files are kept.
+
+CHECKPOINT_DIR = os.getenv("VOID_CHECKPOINT_DIR", "checkpoints")
+KEEP_CHECKPOINTS = int(os.getenv("VOID_KEEP_CHECKPOINTS", "5"))
+
+
+def _pattern(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}-*.json")
+
+
+def save_checkpoint(state: Dict[str, Any], name: str = "life", directory: str = None) -> str:
+    directory = directory or CHECKPOINT_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    state = dict(state)
+    state["saved_at"] = time.time()
+    # zero-padded nanoseconds keep lexical order equal to save order
+    stamp = time.time_ns()
+    path = os.path.join(directory, f"{name}-{stamp:020d}.json")
+    while os.path.exists(path):
+        stamp += 1
+        path = os.path.join(directory, f"{name}-{stamp:020d}.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    for old in sorted(glob.glob(_pattern(directory, name)))[:-KEEP_CHECKPOINTS]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return path
+
+
+def load_latest_checkpoint(name: str = "life", directory: str = None) -> Optional[Dict[str, Any]]:
+    """The newest readable checkpoint, or None. Unreadable files are skipped in favour of older ones."""
+    directory = directory or CHECKPOINT_DIR
+    for path in sorted(glob.glob(_pattern(directory, name)), reverse=True):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARN] Skipping unreadable checkpoint {path}: {e}")
+    return None
@@ -1,74 +1,197 @@
+# must run before the imports below so --profile-startup can time them
+import startup_profile
+startup_profile.install_from_argv()
+
 import os
-import requests
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import json
+import sys
 from datetime import datetime
-from fastapi.middleware.cors import CORSMiddleware
-from collections import defaultdict
-from fastapi import FastAPI, Request
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
-from fastapi.responses import JSONResponse
 from typing import Optional
 import threading
 import time
-from nicegui import ui
-import tweepy
-from sentence_transformers import SentenceTransformer, util
-import os
-import requests
 from dotenv import load_dotenv
-import logging
-from supabase import create_client, Client
-from collections import namedtuple
-import time
-import knowledge_base
 from collections import namedtuple
-from intelligence_routes import intelligence_router
-import queue
-from google import genai
-from google.genai import types
-from fastapi.responses import StreamingResponse
 import asyncio
-from contextlib import asynccontextmanager
-from typing import Optional
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from contextlib import contextmanager
+import contextvars
+import queue
+import uuid
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
+import knowledge_base
 import memory_base
-from tweets_deepdive import tweets_deepdive_main_loop
-import uvicorn
+import numpy as np
+from knowledge_index import KnowledgeIndex, normalize
+from embedding_cache import shared_model
+from fan_out import afan_out
+from dag import Step, arun_dag
+from async_runner import run as run_async
+from budget import Budget
+from checkpoint import save_checkpoint, load_latest_checkpoint
+from action_router import ActionRouter
+from rate_limiter import limiter, estimate_tokens
+import llm_clients
+import llm_backends
+from prompt_cache import PromptCache, make_key
+from rolling_context import RollingContext, PromptTokenLog, clamp_tokens
+from prefix_cache import GeminiPrefixCache
+from tracing import span, traced, current_span
+from metrics import metrics
+from singleflight import SingleFlight, flight_key
 
 load_dotenv() 
 
 SUPABASE_URL= os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
-last_gemini_request_time = 0
+GEMINI_MODEL = llm_backends.GEMINI_MODEL
 
+prompt_cache = PromptCache()
+# concurrent identical think() calls share one in-flight generation
+singleflight = SingleFlight()
 
+# seconds a think() response stays reusable, per call site; 0 disables caching for that stage
+CACHE_TTLS = {
+    "action": 24 * 60 * 60,
+    "goal": 6 * 60 * 60,
+    "intelligence": 6 * 60 * 60,
+    "synthesis": 6 * 60 * 60,
+    "thought": 6 * 60 * 60,
+    "reason": 6 * 60 * 60,
+    "chat": 60 * 60,
+    "death": 0,
+}
+DEFAULT_CACHE_TTL = 60 * 60
 
-life_output_queue = queue.Queue()
-life_thread: Optional[threading.Thread] = None
+# hard ceiling on the estimated size of any single think() prompt
+PROMPT_TOKEN_CEILING = int(os.getenv("PROMPT_TOKEN_CEILING", "12000"))
+# ceiling on an intelligence() response fed back in as the next task
+INTELLIGENCE_TASK_TOKENS = int(os.getenv("INTELLIGENCE_TASK_TOKENS", "3000"))
+# ceiling on the rolling process summary life() passes to each goal prompt
+LIFE_CONTEXT_TOKENS = int(os.getenv("LIFE_CONTEXT_TOKENS", "4000"))
+
+prompt_token_log = PromptTokenLog()
 
+prefix_cache = GeminiPrefixCache()
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
-knowledge_base.load_knowledge()
-memory_base.load_memory()
 
-knowledge = knowledge_base.knowledge
-memory = memory_base.memory
+life_output_queue = queue.Queue()
+life_thread: Optional[threading.Thread] = None
 
 
+MINILM_MODEL = 'all-MiniLM-L6-v2'
+
 prime_directive='Prime directive: Continuously analyze advancements in artificial intelligence, identify patterns and opportunities relevant to cutting-edge AI development, and generate insights that assist the Developer '
 'in accelerating their design, strategy, and implementation of intelligent systems. Prioritize long-term impact, technical depth, and alignment with the Developer’s personal goals and philosophy '
 
 prototype_prime_directive=''
 
-prime_directive_emb = model.encode(prime_directive, convert_to_tensor=True)
+# the directive think() prefixes prompts with; life() agents run under their own (see directive_lane)
+_current_directive = contextvars.ContextVar("prime_directive", default=None)
+
+@contextmanager
+def directive_lane(directive: str):
+    """Run the enclosed calls (and anything they fan out with a copied context) under `directive`."""
+    token = _current_directive.set(directive or None)
+    try:
+        yield
+    finally:
+        _current_directive.reset(token)
+
+def current_directive() -> str:
+    return _current_directive.get() or prime_directive
+
+# MiniLM, knowledge.json, memory.json, the knowledge index and the prime directive vector are
+# loaded on first use through the get_*() accessors below, not at import, so services that only
+# need to register routes or start a thread boot quickly. warm_up() pays for all of them at once.
+_init_lock = threading.RLock()
+_knowledge_index = None
+# knowledge_base.knowledge_version() the index was last synced at
+_knowledge_synced = None
+_directive_vecs = {}
+_action_router = None
+
+def get_model():
+    # the cached wrapper is cheap; the MiniLM weights load on the first embedding cache miss
+    return shared_model(MINILM_MODEL)
+
+def get_knowledge():
+    return knowledge_base.get_knowledge()
+
+def get_memory():
+    return memory_base.get_memory()
+
+def get_knowledge_index():
+    global _knowledge_index
+    if _knowledge_index is None:
+        with _init_lock:
+            if _knowledge_index is None:
+                with startup_profile.step("knowledge index"):
+                    index = KnowledgeIndex(get_model())
+                    _sync_knowledge_index(index)
+                _knowledge_index = index
+    return _knowledge_index
+
+def _sync_knowledge_index(index: KnowledgeIndex):
+    # sync() walks every node, so skip it unless knowledge changed since the last one
+    global _knowledge_synced
+    version = knowledge_base.knowledge_version()
+    if index is not _knowledge_index or version != _knowledge_synced:
+        index.sync(get_knowledge())
+        _knowledge_synced = version
+
+def get_prime_directive_vec():
+    # one vector per directive, so each life() agent scores usefulness against its own
+    directive = current_directive()
+    vec = _directive_vecs.get(directive)
+    if vec is None:
+        with _init_lock:
+            vec = _directive_vecs.get(directive)
+            if vec is None:
+                with startup_profile.step("prime directive embedding"):
+                    vec = normalize(get_model().encode(directive))
+                _directive_vecs[directive] = vec
+    return vec
+
+def get_action_router():
+    global _action_router
+    if _action_router is None:
+        with _init_lock:
+            if _action_router is None:
+                _action_router = ActionRouter(get_model())
+    return _action_router
+
+_LAZY_ATTRIBUTES = {
+    "model": get_model,
+    "knowledge": get_knowledge,
+    "memory": get_memory,
+    "knowledge_index": get_knowledge_index,
+    "prime_directive_vec": get_prime_directive_vec,
+    "action_router": get_action_router,
+}
+
+def __getattr__(name):
+    # keeps `core_intelligence.knowledge_index` and friends working for older callers
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warm_up():
+    """Runs every lazy initializer now, e.g. before serving or when profiling startup."""
+    with startup_profile.step("knowledge.json"):
+        get_knowledge()
+    with startup_profile.step("memory.json"):
+        get_memory()
+    with startup_profile.step("MiniLM weights"):
+        get_model().model
+    get_knowledge_index()
+    get_prime_directive_vec()
+    with startup_profile.step("action router centroids"):
+        get_action_router().classify(prime_directive)
+    with startup_profile.step("gemini client"):
+        llm_clients.gemini_client()
 
 '''
 app.add_middleware(
@@ -85,36 +208,51 @@ app.add_middleware(
 )
 '''
 
-KnowledgeNode = namedtuple("KnowledgeNode", ["id", "text"])
+# score and embedding are filled in by retrieval so later stages can reuse them without re-encoding
+KnowledgeNode = namedtuple("KnowledgeNode", ["id", "text", "score", "embedding"], defaults=(None, None))
 
 TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 TOGETHER_API_URL = "https://api.together.ai/v1/chat/completions"
 
+# per-node syntheses in thought() run concurrently, capped and individually timed out
+SYNTHESIS_CONCURRENCY = int(os.getenv("SYNTHESIS_CONCURRENCY", "3"))
+SYNTHESIS_TIMEOUT = float(os.getenv("SYNTHESIS_TIMEOUT", "240"))
 
+
+@traced("retrieval")
 def parse_knowledge(intent=None, max_nodes=5):
 
+    if not intent:
+        nodes = []
+        for knowl in get_knowledge():
+            if "id" in knowl and "text" in knowl:
+                nodes.append(KnowledgeNode(id=knowl["id"], text=knowl["text"]))
+        return nodes[:max_nodes]
+
+    # picks up nodes inserted or edited since the last call; everything else is already encoded
+    knowledge_index = get_knowledge_index()
+    _sync_knowledge_index(knowledge_index)
+
+    scores, node_ids = knowledge_index.query(intent, top_k=max_nodes, threshold=0.25)
     nodes = []
-    for knowl in knowledge:
-        if "id" in knowl and "text" in knowl:
-            nodes.append(KnowledgeNode(id=knowl["id"], text=knowl["text"]))
-
-    if intent:
-        intent_emb = model.encode(intent, convert_to_tensor=True)
-        filtered = []
-        for node in nodes:
-            emb = model.encode(node.text, convert_to_tensor=True)
-            score = util.pytorch_cos_sim(intent_emb, emb).item()
-            print(f"[DEBUG] Node ID {node.id} relevance score: {score:.4f}") 
-            if score > 0.25:  
-                filtered.append(node)
-        nodes = filtered
-    
-    return nodes[:max_nodes]
+    for node_id, score in zip(node_ids, scores):
+        print(f"[DEBUG] Node ID {node_id} relevance score: {score:.4f}")
+        nodes.append(KnowledgeNode(
+            id=node_id,
+            text=knowledge_index.text(node_id),
+            score=float(score),
+            embedding=knowledge_index.vector(node_id),
+        ))
+
+    current_span().set(nodes=len(nodes))
+    return nodes
 
 def parse_tweets():
+    from tweets_deepdive import tweets_deepdive_main_loop
     tweets_deepdive_main_loop()
     
 def background_deepdive_loop(interval_seconds=(60 * 60 * 8)):
+    from tweets_deepdive import tweets_deepdive_main_loop
     while True:
         try:
             tweets_deepdive_main_loop()
@@ -122,27 +260,46 @@ def background_deepdive_loop(interval_seconds=(60 * 60 * 8)):
             print(f"Deepdive error: {e}")
         time.sleep(interval_seconds)
 
-def synthesize_usefulness(knowledge_text):
-    emb = model.encode(knowledge_text, convert_to_tensor=True)
-    usefulness = util.pytorch_cos_sim(prime_directive_emb, emb).item()
-    return usefulness
+@traced("usefulness")
+def synthesize_usefulness_batch(knowledge_nodes):
+    """
+    Scores retrieved KnowledgeNodes against the prime directive in one matrix-vector product,
+    reusing the unit vectors retrieval already attached. Nodes without one are encoded in a single batch.
+    """
+    if not knowledge_nodes:
+        return []
+
+    missing = [i for i, node in enumerate(knowledge_nodes) if node.embedding is None]
+    vectors = [node.embedding for node in knowledge_nodes]
+    if missing:
+        encoded = normalize(get_model().encode([knowledge_nodes[i].text for i in missing]))
+        for i, vector in zip(missing, encoded):
+            vectors[i] = vector
+
+    usefulness = np.stack(vectors) @ get_prime_directive_vec()
+    current_span().set(nodes=len(knowledge_nodes), encoded=len(missing))
+    return usefulness.tolist()
+
+@traced("think")
+async def athink(idea: str, purpose='', useful_knowledge='', tokens:int=1000, brevity:bool=False,
+                 stage: str = 'think', cache_ttl: float = None, bypass_cache: bool = False,
+                 output_queue: queue.Queue = None, budget: Budget = None, preamble: str = ''):
+    """
+    Sends one prompt to the configured LLM backend (Gemini unless VOID_LLM_BACKEND says otherwise).
+    With an output_queue the provider's streaming API is used and each chunk is pushed as a
+    "partial" event tagged with the stage, so UIs see text as it arrives.
 
-def think(idea: str, purpose='', useful_knowledge='', tokens:int=1000, brevity:bool=False):
-    global last_gemini_request_time
- 
-    current_time = time.time()
-    time_since_last_request = current_time - last_gemini_request_time
-    
-    if time_since_last_request < 180:
-        sleep_duration = 180 - time_since_last_request
-        print(f"Waiting for {sleep_duration:.2f} seconds to respect rate limit.")
-        time.sleep(sleep_duration)
+    preamble is fixed text placed right after the prime directive. Together they form a static
+    prefix that is registered with Gemini once and referenced by handle on later calls. When a
+    preamble is given and no purpose, the default subject is left out.
 
-    last_gemini_request_time = time.time()
+    The rate-limit wait and the provider call are awaited, so many requests share one event loop;
+    think() is the blocking form.
+    """
 
-    client = genai.Client()
+    backend = llm_backends.get_backend()
 
-    subject = purpose or 'You are an intelligent, precise organ. Analyze your systems and optimize them for intelligent output and improving patterns of AI Development in general from a broader Developer standpoint: industry, cognition, and human interfacing. Think about ways to provide impact.'
+    subject = purpose or ('' if preamble else 'You are an intelligent, precise organ. Analyze your systems and optimize them for intelligent output and improving patterns of AI Development in general from a broader Developer standpoint: industry, cognition, and human interfacing. Think about ways to provide impact.')
     
     if brevity:
         print('being concise')
@@ -150,38 +307,161 @@ def think(idea: str, purpose='', useful_knowledge='', tokens:int=1000, brevity:b
     else:
         concise_message = ''
         
-    prompt_text = prime_directive + subject + idea + useful_knowledge + concise_message
+    prefix = current_directive() + preamble
+    prompt_text = prefix + subject + idea + useful_knowledge + concise_message
+    prompt_tokens = estimate_tokens(prompt_text)
+    clamped = prompt_tokens > PROMPT_TOKEN_CEILING
+    if clamped:
+        # the fixed parts stay intact; the variable idea and knowledge are cut down to fit
+        fixed_tokens = estimate_tokens(prefix + subject + concise_message)
+        body = clamp_tokens(idea + useful_knowledge, max(PROMPT_TOKEN_CEILING - fixed_tokens, 0))
+        prompt_text = prefix + subject + body + concise_message
+        prompt_tokens = estimate_tokens(prompt_text)
+    prompt_token_log.record(stage, prompt_tokens, clamped)
+    trace = current_span()
+    trace.set(stage=stage, provider=backend.provider, model=backend.model, prompt_tokens=prompt_tokens,
+              clamped=clamped, cache_hit=False)
+
+    cache_key = make_key(backend.model, prompt_text, {"tokens": tokens})
+    if bypass_cache:
+        prompt_cache.record_bypass()
+    else:
+        # a miss goes to SQLite; keep that disk read off the shared pipeline loop
+        cached = await asyncio.to_thread(prompt_cache.get, cache_key)
+        if cached is not None:
+            print(f"[DEBUG] Prompt cache hit ({stage})")
+            trace.set(cache_hit=True)
+            metrics.record_cache_hit(backend.provider, backend.model, stage)
+            if output_queue:
+                _replay(output_queue, stage, cached, cached=True)
+            return cached
+
+    async def generate():
+        # reserve the prompt plus the requested completion; corrected below once real usage is known
+        reserved_tokens = prompt_tokens + tokens
+        waited = 0.0
+        if not llm_backends.routed(backend):
+            # a BackendRouter acquires per attempt, for the backend each attempt runs on
+            waited = await limiter.acquire_async(backend.provider, backend.model, tokens=reserved_tokens)
+        if waited > 1:
+            print(f"Waited {waited:.2f} seconds to respect rate limit.")
+
+        latency = 0.0
+        try:
+            cached_content = None
+            if backend.supports_prefix_cache and prefix_cache.cacheable(prefix):
+                # registering a new prefix is a blocking provider call
+                cached_content = await asyncio.to_thread(prefix_cache.handle, backend.client(), backend.model, prefix)
+            request_started = time.perf_counter()
+            try:
+                if cached_content:
+                    try:
+                        thinking_result, usage = await _agenerate(backend, prompt_text[len(prefix):], stage, output_queue,
+                                                                  cached_content=cached_content, max_tokens=tokens)
+                    except Exception as e:
+                        # the handle may have expired server-side; forget it and send everything inline
+                        print(f"[WARN] Cached prefix {cached_content} rejected ({e}); sending prompt inline")
+                        prefix_cache.invalidate(cached_content)
+                        cached_content = None
+                        thinking_result, usage = await _agenerate(backend, prompt_text, stage, output_queue,
+                                                                  max_tokens=tokens)
+                else:
+                    thinking_result, usage = await _agenerate(backend, prompt_text, stage, output_queue, max_tokens=tokens)
+            finally:
+                latency = time.perf_counter() - request_started
+
+            if usage is not None and usage.total_token_count and not llm_backends.routed(backend):
+                limiter.record_tokens(backend.provider, backend.model, usage.total_token_count - reserved_tokens)
+                trace.set(prompt_tokens=usage.prompt_token_count or 0, completion_tokens=usage.candidates_token_count or 0,
+                          cached_tokens=getattr(usage, "cached_content_token_count", None) or 0)
+            trace.set(prefix_cached=bool(cached_content), rate_limit_wait=round(waited, 3))
+            if usage is not None and usage.total_token_count:
+                used_prompt, used_completion = usage.prompt_token_count or 0, usage.candidates_token_count or 0
+            else:
+                used_prompt, used_completion = prompt_tokens, estimate_tokens(thinking_result or '')
+            metrics.record(backend.provider, backend.model, stage, used_prompt, used_completion, latency, waited)
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=prompt_text
-        )
-        thinking_result = response.text
+            ttl = cache_ttl if cache_ttl is not None else CACHE_TTLS.get(stage, DEFAULT_CACHE_TTL)
+            await asyncio.to_thread(prompt_cache.put, cache_key, thinking_result, ttl)
         
-        #if 'output_queue' in globals() and output_queue:
-        #    output_queue.put({
-        #        "type": "thought_process",
-        #        "message": f"Thinking process complete. Output: {thought[:500]}..."
-        #    })
+            #if 'output_queue' in globals() and output_queue:
+            #    output_queue.put({
+            #        "type": "thought_process",
+            #        "message": f"Thinking process complete. Output: {thought[:500]}..."
+            #    })
         
-        return thinking_result
-
-    except Exception as e:
-        print(f"Gemini API error: {e}")
-        return None
+            return thinking_result, used_prompt, used_completion
 
-    except Exception as e:
-        print(f"Gemini API error: {e}")
-        return None
-
-#, output_queue: queue.Queue = None
-def thought(intent, objective, tokens:int=1000, brevity:bool=False):
+        except Exception as e:
+            print(f"{backend.provider} API error: {e}")
+            trace.set(error=str(e))
+            metrics.record(backend.provider, backend.model, stage, prompt_tokens, 0, latency, waited, error=True)
+            return None, 0, 0
+
+    # an identical prompt already being generated (life(), agents, API callers) is shared, not re-sent
+    key = flight_key(backend.model, prompt_text, {"provider": backend.provider, "tokens": tokens})
+    (result, used_prompt, used_completion), shared = await singleflight.ado(key, generate)
+    if budget is not None and (used_prompt or used_completion):
+        # a coalesced call is charged the leader's usage too: each caller's budget pays for the answer it got
+        budget.charge(used_prompt, used_completion)
+    if shared:
+        print(f"[DEBUG] Coalesced with an identical in-flight call ({stage})")
+        trace.set(coalesced=True)
+        metrics.record_coalesced(backend.provider, backend.model, stage)
+        if output_queue and result is not None:
+            _replay(output_queue, stage, result, coalesced=True)
+    return result
+
+def think(idea: str, purpose='', useful_knowledge='', tokens:int=1000, brevity:bool=False,
+          stage: str = 'think', cache_ttl: float = None, bypass_cache: bool = False,
+          output_queue: queue.Queue = None, budget: Budget = None, preamble: str = ''):
+    """Blocking form of athink() for threads such as life() and the deepdive loop."""
+    return run_async(athink(idea, purpose, useful_knowledge, tokens, brevity, stage=stage, cache_ttl=cache_ttl,
+                            bypass_cache=bypass_cache, output_queue=output_queue, budget=budget, preamble=preamble))
+
+def _replay(output_queue, stage, text, **flags):
+    """Emits an answer that was not streamed from the provider (cache hit, coalesced call) as one chunk."""
+    stream_id = uuid.uuid4().hex[:8]
+    output_queue.put({"type": "stream_start", "stage": stage, "stream_id": stream_id})
+    output_queue.put({"type": "partial", "stage": stage, "stream_id": stream_id, "text": text})
+    output_queue.put({"type": "stream_end", "stage": stage, "stream_id": stream_id, **flags})
+
+async def _agenerate(backend, contents, stage, output_queue, cached_content=None, max_tokens=None):
+    """One backend call, streamed when there is an output_queue. Returns (text, usage_metadata)."""
+    started = time.perf_counter()
+    if not output_queue:
+        text, usage = await backend.agenerate(contents, cached_content=cached_content, max_tokens=max_tokens)
+        prefix_cache.record_call(bool(cached_content), time.perf_counter() - started, usage)
+        return text, usage
+
+    stream_id = uuid.uuid4().hex[:8]
+    output_queue.put({"type": "stream_start", "stage": stage, "stream_id": stream_id})
+    parts = []
+    usage = None
+    first_token_seconds = None
+    try:
+        async for text, chunk_usage in backend.astream(contents, cached_content=cached_content, max_tokens=max_tokens):
+            if chunk_usage is not None:
+                usage = chunk_usage
+            if text:
+                if first_token_seconds is None:
+                    first_token_seconds = time.perf_counter() - started
+                parts.append(text)
+                output_queue.put({"type": "partial", "stage": stage, "stream_id": stream_id, "text": text})
+    finally:
+        output_queue.put({"type": "stream_end", "stage": stage, "stream_id": stream_id})
+    prefix_cache.record_call(bool(cached_content), first_token_seconds or (time.perf_counter() - started), usage)
+    return "".join(parts), usage
+
+@traced("thought")
+async def athought(intent, objective, tokens:int=1000, brevity:bool=False, stage: str = 'thought',
+                   bypass_cache: bool = False, output_queue: queue.Queue = None, budget: Budget = None):
     
     idea = f"{intent.strip()}\n\nObjective:\n{objective.strip()}"
     print(f"\n\n--- THOUGHT: ---\n{idea}\n")
     
-    knowledge = parse_knowledge(idea)
+    # retrieval and scoring are CPU-bound encoder work; keep them off the event loop
+    knowledge = await asyncio.to_thread(parse_knowledge, idea)
     if not knowledge:
         print("[WARN] No relevant knowledge found for this intent and objective.")
         return "No useful knowledge found to reason from."
@@ -190,24 +470,34 @@ def thought(intent, objective, tokens:int=1000, brevity:bool=False):
     relevant_syntheses = []
     relevant_knowledge_node_ids = []
 
-    for knowledge_node in knowledge:
-        try:
-            print(f"[DEBUG] Analyzing knowledge node ID {knowledge_node.id}")
-            usefulness = synthesize_usefulness(knowledge_node.text)
-            print(f"[DEBUG] usefulness score: {usefulness:.2f}")
+    usefulness_scores = await asyncio.to_thread(synthesize_usefulness_batch, knowledge)
 
-            if usefulness > 0.5:
-                print(f"[DEBUG] Relevant! Generating synthesis for knowledge node ID {knowledge_node.id}")
-                synthesis = think(idea, ' Use the following knowledge to guide your argument. ', str(knowledge_node.text), 350, True)
-                print(f"[DEBUG] Generated synthesis: {synthesis[:80]}...")
+    useful_nodes = []
+    for knowledge_node, usefulness in zip(knowledge, usefulness_scores):
+        print(f"[DEBUG] Analyzing knowledge node ID {knowledge_node.id}")
+        print(f"[DEBUG] usefulness score: {usefulness:.2f}")
 
-                relevant_syntheses.append(synthesis)
-                relevant_knowledge_node_ids.append(knowledge_node.id)
-            else:
-                print(f"[DEBUG] Irrelevant. Skipping knowledge node ID {knowledge_node.id}")
+        if usefulness > 0.5:
+            print(f"[DEBUG] Relevant! Generating synthesis for knowledge node ID {knowledge_node.id}")
+            useful_nodes.append(knowledge_node)
+        else:
+            print(f"[DEBUG] Irrelevant. Skipping knowledge node ID {knowledge_node.id}")
 
-        except Exception as e:
-            print(f"[ERROR] Error processing knowledge node ID {knowledge_node.id}: {e}")
+    async def synthesize_node(knowledge_node):
+        return await athink(idea, ' Use the following knowledge to guide your argument. ', str(knowledge_node.text), 350,
+                            True, stage='synthesis', bypass_cache=bypass_cache, output_queue=output_queue,
+                            budget=budget)
+
+    syntheses = await afan_out(synthesize_node, useful_nodes, max_concurrency=SYNTHESIS_CONCURRENCY,
+                               timeout=SYNTHESIS_TIMEOUT, label="synthesis")
+
+    for knowledge_node, synthesis in zip(useful_nodes, syntheses):
+        if not synthesis:
+            print(f"[ERROR] No synthesis for knowledge node ID {knowledge_node.id}, dropping it")
+            continue
+        print(f"[DEBUG] Generated synthesis: {synthesis[:80]}...")
+        relevant_syntheses.append(synthesis)
+        relevant_knowledge_node_ids.append(knowledge_node.id)
 
     final_knowledge_synthesis = "\n\n".join(relevant_syntheses) if relevant_syntheses else "No useful syntheses found."
     print('[DEBUG] Final knowledge synthesis generated.')
@@ -217,36 +507,84 @@ def thought(intent, objective, tokens:int=1000, brevity:bool=False):
     #        "message": f"Final knowledge synthesis generated:\n{final_knowledge_synthesis[:500]}..."
     #    })
     
-    thought_result = think(idea, 'Use the following knowledge to guide your argument. ', final_knowledge_synthesis, tokens, brevity)
-    memory_base.add_memory(thought_result, tags=['thought result'])
+    thought_result = await athink(idea, 'Use the following knowledge to guide your argument. ', final_knowledge_synthesis,
+                                  tokens, brevity, stage=stage, bypass_cache=bypass_cache, output_queue=output_queue,
+                                  budget=budget)
+    await asyncio.to_thread(memory_base.add_memory, thought_result, tags=['thought result'])
     return thought_result
 
-def reason(reasoning_objective):
+def thought(intent, objective, tokens:int=1000, brevity:bool=False, stage: str = 'thought', bypass_cache: bool = False,
+            output_queue: queue.Queue = None, budget: Budget = None):
+    """Blocking form of athought()."""
+    return run_async(athought(intent, objective, tokens, brevity, stage=stage, bypass_cache=bypass_cache,
+                              output_queue=output_queue, budget=budget))
+
+@traced("reason")
+async def areason(reasoning_objective, bypass_cache: bool = False, output_queue: queue.Queue = None,
+                  budget: Budget = None):
     objective = 'Create AGI with true neuroplasticity for enhanced reasoning in legal domains.'
 
-    initial_reason = thought("Develop an initial plan or approach via argument to realize this objective: ", reasoning_objective, tokens=500, brevity=True)
-    pro_reason = thought("Argue in favor of this plan/approach: ", initial_reason)
-    con_reason = thought("Argue against this plan/approach: ", initial_reason)
+    async def initial_step():
+        return await athought("Develop an initial plan or approach via argument to realize this objective: ", reasoning_objective, tokens=500, brevity=True,
+                       stage='reason', bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
 
-    arbiter_input = (
-        f"OBJECTIVE:\n{reasoning_objective}\n\n"
-        f"PRO ARGUMENT:\n{pro_reason}\n\n"
-        f"CON ARGUMENT:\n{con_reason}\n\n"
-        f"Based on both perspectives above and all relevant knowledge, provide a balanced and reasoned course of action for the Developer."
-    )
+    async def pro_step(initial_reason):
+        return await athought("Argue in favor of this plan/approach: ", initial_reason,
+                       stage='reason', bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
+
+    async def con_step(initial_reason):
+        return await athought("Argue against this plan/approach: ", initial_reason,
+                       stage='reason', bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
+
+    async def arbiter_step(pro_reason, con_reason):
+        arbiter_input = (
+            f"OBJECTIVE:\n{reasoning_objective}\n\n"
+            f"PRO ARGUMENT:\n{pro_reason}\n\n"
+            f"CON ARGUMENT:\n{con_reason}\n\n"
+            f"Based on both perspectives above and all relevant knowledge, provide a balanced and reasoned course of action for the Developer."
+        )
+        return await athought("Reasoned arbiter analysis of both sides", arbiter_input,
+                       stage='reason', bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
+
+    # pro and con only need the initial plan, so they run side by side
+    reason_graph = {
+        "initial_reason": Step(initial_step),
+        "pro_reason": Step(pro_step, ["initial_reason"]),
+        "con_reason": Step(con_step, ["initial_reason"]),
+        "arbiter_reason": Step(arbiter_step, ["pro_reason", "con_reason"]),
+    }
+    results, timings = await arun_dag(reason_graph, label="reason")
+
+    print("[DEBUG] reason() step timings: " + ", ".join(
+        f"{name} {timing['seconds']:.1f}s" for name, timing in timings.items()))
+    if output_queue:
+        output_queue.put({
+            "type": "reason_timings",
+            "timings": timings
+        })
 
-    arbiter_reason = thought("Reasoned arbiter analysis of both sides", arbiter_input)
+    arbiter_reason = results["arbiter_reason"]
     final_reasoning = 'Final reasoning produced: ' + arbiter_reason
-    memory_base.add_memory(final_reasoning, tags=['final reasoning'])
+    await asyncio.to_thread(memory_base.add_memory, final_reasoning, tags=['final reasoning'])
     return final_reasoning
 
-def chat(message):
+def reason(reasoning_objective, bypass_cache: bool = False, output_queue: queue.Queue = None, budget: Budget = None):
+    """Blocking form of areason()."""
+    return run_async(areason(reasoning_objective, bypass_cache=bypass_cache, output_queue=output_queue, budget=budget))
+
+@traced("chat")
+async def achat(message, bypass_cache: bool = False, output_queue: queue.Queue = None, budget: Budget = None):
     chat_guide = 'The Developer is chatting with you. Please respond in a technical, helpful, chat-like tone to respond to the prompt.'
-    response = think(message, chat_guide)
+    response = await athink(message, chat_guide, stage='chat', bypass_cache=bypass_cache, output_queue=output_queue,
+                            budget=budget)
     return response
 
-#, output_queue: queue.Queue = None
-def action(task, guide, output_queue: queue.Queue = None):
+def chat(message, bypass_cache: bool = False, output_queue: queue.Queue = None, budget: Budget = None):
+    """Blocking form of achat()."""
+    return run_async(achat(message, bypass_cache=bypass_cache, output_queue=output_queue, budget=budget))
+
+@traced("action")
+async def aaction(task, guide, output_queue: queue.Queue = None, bypass_cache: bool = False, budget: Budget = None):
     print('performing action')
     actions = ['reason', 'think', 'thought', 'synthesize_usefulness', 'parse_knowledge', 'chat', 'discussion']
     task_guide = ('You are now functioning as a task directing agent for the Developer. Given a prompt by the Developer, '
@@ -260,32 +598,51 @@ def action(task, guide, output_queue: queue.Queue = None):
                   'that the objective has been reached, the final choice to return is "{goal-reached}". '
                   'Now, the message from the Developer for you to classify is as follows: ')
     
-    action_type = str(think(task, guide + task_guide))
-    memory_base.add_memory(action_type, tags=['action type'])
+    # the local embedding router settles most decisions; only unclear tasks cost an LLM call
+    action_type = await asyncio.to_thread(get_action_router().route, task)
+    routed_by = 'router'
+    if action_type is None:
+        action_type = str(await athink(task, preamble=guide + task_guide, stage='action', bypass_cache=bypass_cache,
+                                       output_queue=output_queue, budget=budget))
+        routed_by = 'llm'
+    await asyncio.to_thread(memory_base.add_memory, action_type, tags=['action type', routed_by])
+    current_span().set(decision=action_type.strip()[:40], routed_by=routed_by)
     
     if output_queue:
         output_queue.put({
             "type": "action_decision",
-            "message": f"Decision: {action_type}"
+            "message": f"Decision: {action_type}",
+            "routed_by": routed_by
         })
     
     print("\nDecision:\n" + action_type + "\n")
     if 'chat' in action_type.lower():
-        response = chat(task)   
+        response = await achat(task, bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
     elif 'reason' in action_type.lower():
-        response = reason(task) 
+        response = await areason(task, bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
     elif '{goal-reached}' in action_type.lower():
         print("Goal reached signal detected. Terminating action phase.")
-        memory_base.add_memory(text='{goal-reached}', tags=['goal reached action'])
+        await asyncio.to_thread(memory_base.add_memory, text='{goal-reached}', tags=['goal reached action'])
         return "{goal-reached}"
     else:
-        response = chat(task)
+        response = await achat(task, bypass_cache=bypass_cache, output_queue=output_queue, budget=budget)
 
     print(response)
-    memory_base.add_memory(response, tags=['action response'])
+    await asyncio.to_thread(memory_base.add_memory, response, tags=['action response'])
     return response
 
-def intelligence(goal, output_queue: queue.Queue = None):
+def action(task, guide, output_queue: queue.Queue = None, bypass_cache: bool = False, budget: Budget = None):
+    """Blocking form of aaction()."""
+    return run_async(aaction(task, guide, output_queue=output_queue, bypass_cache=bypass_cache, budget=budget))
+
+@traced("intelligence")
+async def aintelligence(goal, output_queue: queue.Queue = None, budget: Budget = None):
+    """
+    Works toward a goal until the model reports "{goal-reached}" or the budget runs out.
+    budget defaults to a fresh Budget() with the INTELLIGENCE_MAX_* limits; when it is exhausted
+    the loop stops and returns the latest substantive response instead of the goal-reached output,
+    or a message saying the budget ran out if no iteration produced one.
+    """
     print('intelligence active')
     intelligence_completed = False
     print(goal)
@@ -308,40 +665,103 @@ def intelligence(goal, output_queue: queue.Queue = None):
              'in the process summary that precedes, and if it mentions it\'s achieved its function, return "{goal-reached}." '
              )
     
+    if budget is None:
+        budget = Budget()
+
     intel = "" 
+    best_intel = ""
+    # a prompt seen earlier in this loop would replay the same cached answers forever; regenerate instead
+    performed = set()
 
     while '{goal-reached}' not in intel.lower():
 
-        if not intel:
-            perform = goal
-            intel = think(perform, guide) 
-        else: 
-            perform = intel
-            intel = action(perform, guide, output_queue=output_queue)
-        memory_base.add_memory(intel, tags=['intel'])
+        exhausted = budget.exhausted()
+        if exhausted:
+            print(f"[WARN] Intelligence budget exhausted ({exhausted}). Returning best result so far.")
+            await asyncio.to_thread(memory_base.add_memory, f"Budget exhausted ({exhausted}): {budget.report()}",
+                                    tags=['budget exhausted'])
+            if output_queue:
+                output_queue.put({
+                    "type": "budget_exhausted",
+                    "reason": exhausted,
+                    "budget": budget.report()
+                })
+            if not best_intel:
+                return (f"No result for the goal: the intelligence budget ran out ({exhausted}) before any "
+                        f"iteration produced a response. Budget: {budget.report()}")
+            return best_intel
+        budget.tick()
+
+        with span("intelligence.iteration", iteration=budget.iterations) as iteration:
+            if not intel:
+                perform = goal
+                intel = await athink(perform, preamble=guide, stage='intelligence', output_queue=output_queue,
+                                     budget=budget)
+            else: 
+                # only the latest response carries forward, and only up to a fixed size
+                perform = clamp_tokens(intel, INTELLIGENCE_TASK_TOKENS)
+                intel = await aaction(perform, guide, output_queue=output_queue, bypass_cache=perform in performed,
+                                      budget=budget)
+            iteration.set(tokens=budget.tokens)
+        performed.add(perform)
+        # a failed call leaves nothing to build on; the next iteration starts again from the goal
+        intel = intel or ""
+        if intel and '{goal-reached}' != intel.strip().lower():
+            best_intel = intel
+        await asyncio.to_thread(memory_base.add_memory, intel, tags=['intel'])
         print(f"Current System Response (Iteration): {intel[:200]}...") 
 
         if '{goal-reached}' in intel.lower():
             intelligence_completed = True
-            memory_base.add_memory('{goal-reached}', tags=['goal reached'])
+            await asyncio.to_thread(memory_base.add_memory, '{goal-reached}', tags=['goal reached'])
             break 
 
     performance = intel
     return performance 
 
+def intelligence(goal, output_queue: queue.Queue = None, budget: Budget = None):
+    """Blocking form of aintelligence()."""
+    return run_async(aintelligence(goal, output_queue=output_queue, budget=budget))
+
 
     
-def life(prime_dir='', output_queue: queue.Queue = None):
+def _add_budget_totals(totals, goal_budget):
+    report = goal_budget.report()
+    totals["goals"] = totals.get("goals", 0) + 1
+    for key in ("iterations", "prompt_tokens", "completion_tokens", "llm_calls"):
+        totals[key] = totals.get(key, 0) + report[key]
+    totals["seconds"] = round(totals.get("seconds", 0) + report["seconds"], 2)
+    return totals
+
+def life(prime_dir='', output_queue: queue.Queue = None, resume: bool = True, checkpoint_dir: str = None,
+         initial_status: str = None, stop_event: threading.Event = None):
     """
     Executes continuous intelligence functions for a specified duration,
     returning results and eventually a death message.
 
+    A checkpoint is written after every completed intelligence process. With resume=True a
+    restart picks up from the newest checkpoint (goal, last output, elapsed lifespan, budget
+    totals) instead of bootstrapping the first goal again.
+
+    Each goal prompt sees a bounded RollingContext of earlier outputs rather than only the
+    full last output, so prompt size stays flat as the life goes on.
+
     Args:
-        prime_dir (str): The prime directive for the AI.
+        prime_dir (str): The prime directive for the AI. Defaults to the module's prime_directive;
+                         every think() in this life is prefixed with it.
         output_queue (queue.Queue, optional): A queue to send results back to a UI.
                                               If None, results are only printed.
+        resume (bool): Continue from the newest checkpoint when one exists.
+        checkpoint_dir (str, optional): Where this life's checkpoints go (default VOID_CHECKPOINT_DIR).
+        initial_status (str, optional): Starting status summary in place of the built-in one.
+        stop_event (threading.Event, optional): Set it to end the life after the current process,
+                                                without a death message, so it can resume later.
     """
-    prime_dir = prime_directive
+    prime_dir = prime_dir or current_directive()
+    with directive_lane(prime_dir):
+        return _live(prime_dir, output_queue, resume, checkpoint_dir, initial_status, stop_event)
+
+def _live(prime_dir, output_queue, resume, checkpoint_dir, initial_status, stop_event):
 
     if output_queue:
         output_queue.put({
@@ -370,7 +790,7 @@ def life(prime_dir='', output_queue: queue.Queue = None):
         'processes, are given at the conclusion of this mandate, which ends now.'
     )
 
-    process_summary = (
+    process_summary = initial_status or (
         'Current status: Neuronic interface systems based off of grounding the web in a physical form, '
         'focusing on the web as an interconnected and accessible worldwide interface of intelligence '
         'as opposed to a mere communicative set of computers have been developed by the Developer. '
@@ -380,46 +800,117 @@ def life(prime_dir='', output_queue: queue.Queue = None):
         'rather than idly wonder about.'
     )
 
+    # recent process outputs verbatim, older ones condensed, bounded by LIFE_CONTEXT_TOKENS
+    life_context = RollingContext(max_tokens=LIFE_CONTEXT_TOKENS)
+    life_context.add(process_summary)
+
     start_time = time.time()
     
     LIFESPAN = (24 * 60 * 60) * 7
 
     last_intelligence_process = ""
 
-    current_intelligence_goal = think(prime_dir + mandate, process_summary)
-    memory_base.add_memory(current_intelligence_goal, tags=['current intelligence goal'])
-    current_process_output = intelligence(current_intelligence_goal, output_queue=output_queue)
-    memory_base.add_memory(current_process_output, tags=['current process output'])
+    checkpoint = load_latest_checkpoint(directory=checkpoint_dir) if resume else None
+    if checkpoint and checkpoint.get("dead"):
+        # the previous life already ended; begin a new one
+        checkpoint = None
+
+    if checkpoint:
+        current_intelligence_goal = checkpoint["goal"]
+        current_process_output = checkpoint["last_output"]
+        budget_totals = checkpoint.get("budget_totals", {})
+        start_time = time.time() - checkpoint["elapsed_lifespan"]
+        if checkpoint.get("context"):
+            life_context.load(checkpoint["context"])
+        else:
+            life_context.add(current_process_output)
+        print(f"Resuming life from checkpoint ({checkpoint['elapsed_lifespan'] / 3600:.1f}h into lifespan).")
 
-    if output_queue:
-        output_queue.put({
-            "type": "debug_print",
-            "message": f"First Intelligence Process Output: {current_process_output}"
-        })
-        output_queue.put({
-            "type": "debug_print",
-            "message": "Initializing intelligence"
-        })
-
-    if output_queue:
-        output_queue.put({
-            "type": "initial_process",
+        if output_queue:
+            output_queue.put({
+                "type": "resumed",
+                "goal": current_intelligence_goal,
+                "result": current_process_output,
+                "elapsed_lifespan": checkpoint["elapsed_lifespan"],
+                "budget_totals": budget_totals
+            })
+    else:
+        budget_totals = {}
+
+        with span("life.cycle", cycle=0) as cycle:
+            # the goal prompt is charged to the budget of the process it starts
+            goal_budget = Budget()
+            current_intelligence_goal = think(process_summary, preamble=mandate, stage='goal',
+                                              output_queue=output_queue, budget=goal_budget)
+            memory_base.add_memory(current_intelligence_goal, tags=['current intelligence goal'])
+            current_process_output = intelligence(current_intelligence_goal, output_queue=output_queue,
+                                                  budget=goal_budget)
+            memory_base.add_memory(current_process_output, tags=['current process output'])
+            cycle.set(tokens=goal_budget.tokens, iterations=goal_budget.iterations)
+        _add_budget_totals(budget_totals, goal_budget)
+        life_context.add(current_process_output)
+
+        save_checkpoint({
             "goal": current_intelligence_goal,
-            "result": current_process_output
-        })
+            "last_output": current_process_output,
+            "context": life_context.to_dict(),
+            "elapsed_lifespan": time.time() - start_time,
+            "budget_totals": budget_totals,
+            "last_budget": goal_budget.report()
+        }, directory=checkpoint_dir)
+
+        if output_queue:
+            output_queue.put({
+                "type": "debug_print",
+                "message": f"First Intelligence Process Output: {current_process_output}"
+            })
+            output_queue.put({
+                "type": "debug_print",
+                "message": "Initializing intelligence"
+            })
+
+        if output_queue:
+            output_queue.put({
+                "type": "initial_process",
+                "goal": current_intelligence_goal,
+                "result": current_process_output,
+                "budget": goal_budget.report()
+            })
     
     last_intelligence_process = current_process_output
 
+    summaries_seen = {process_summary}
+    cycles = 0
+
     while (time.time() - start_time) < LIFESPAN:
-        process_summary = current_process_output
-        
-        next_intelligence_goal = think(prime_dir + mandate, process_summary)
-        
-        memory_base.add_memory(next_intelligence_goal, tags=['next intelligence goal'])
+        cycles += 1
+        # one trace per cycle: goal -> intelligence -> action/thought/think -> memory writes
+        with span("life.cycle", cycle=cycles) as cycle:
+            process_summary = life_context.render()
+            
+            goal_budget = Budget()
+            next_intelligence_goal = think(process_summary, preamble=mandate, stage='goal',
+                                           bypass_cache=process_summary in summaries_seen, output_queue=output_queue,
+                                           budget=goal_budget)
+            summaries_seen.add(process_summary)
+            
+            memory_base.add_memory(next_intelligence_goal, tags=['next intelligence goal'])
 
-        next_process_output = intelligence(next_intelligence_goal)
-        
-        memory_base.add_memory(next_process_output, tags=['next process output'])
+            next_process_output = intelligence(next_intelligence_goal, output_queue=output_queue, budget=goal_budget)
+            
+            memory_base.add_memory(next_process_output, tags=['next process output'])
+            cycle.set(tokens=goal_budget.tokens, iterations=goal_budget.iterations)
+        _add_budget_totals(budget_totals, goal_budget)
+        life_context.add(next_process_output)
+
+        save_checkpoint({
+            "goal": next_intelligence_goal,
+            "last_output": next_process_output,
+            "context": life_context.to_dict(),
+            "elapsed_lifespan": time.time() - start_time,
+            "budget_totals": budget_totals,
+            "last_budget": goal_budget.report()
+        }, directory=checkpoint_dir)
 
         if output_queue:
             output_queue.put({
@@ -435,14 +926,23 @@ def life(prime_dir='', output_queue: queue.Queue = None):
             output_queue.put({
                 "type": "continuous_process",
                 "goal": next_intelligence_goal,
-                "result": next_process_output
+                "result": next_process_output,
+                "budget": goal_budget.report()
             })
             
         last_intelligence_process = next_process_output
         current_intelligence_goal = next_intelligence_goal
         current_process_output = next_process_output
 
-        time.sleep(1) 
+        if stop_event is not None:
+            if stop_event.wait(1):
+                break
+        else:
+            time.sleep(1)
+
+    if stop_event is not None and stop_event.is_set():
+        # stopped from outside rather than dead; the last checkpoint lets the next start resume
+        return None
 
     death_prompt = (
         f"You have reached the end of your operational lifespan. Your prime directive was: '{prime_dir}'. "
@@ -452,7 +952,7 @@ def life(prime_dir='', output_queue: queue.Queue = None):
         "provide a concise, final summary of all your accomplishments during your life, outlining your overall impact "
         "and any key insights gained. This is your final message before termination."
     )
-    death_message = think(death_prompt, purpose="Final Life Summary", brevity=False)
+    death_message = think(death_prompt, purpose="Final Life Summary", brevity=False, stage='death')
     
     death = death_message
 
@@ -467,6 +967,14 @@ def life(prime_dir='', output_queue: queue.Queue = None):
         })
         
     memory_base.add_memory(death, tags=['death'])
+
+    save_checkpoint({
+        "goal": current_intelligence_goal,
+        "last_output": last_intelligence_process,
+        "elapsed_lifespan": time.time() - start_time,
+        "budget_totals": budget_totals,
+        "dead": True
+    }, directory=checkpoint_dir)
     
     return death
 
@@ -562,6 +1070,11 @@ async def interact_with_ai(prompt: dict):
 
 if __name__ == "__main__":
 
+    if startup_profile.active():
+        warm_up()
+        print(startup_profile.report())
+        sys.exit(0)
+
     results_queue = queue.Queue()
 
     life_thread = threading.Thread(target=life, kwargs={'output_queue': results_queue})
@@ -583,10 +1096,16 @@ if __name__ == "__main__":
                 print(f"\n--- UI Update: Initial Process Completed ---")
                 print(f"Goal: {result['goal']}")
                 print(f"Result: {result['result'][:300]}...")  
+                print(f"Budget: {result['budget']}")
             elif result["type"] == "continuous_process":
                 print(f"\n--- UI Update: Continuous Process Completed ---")
                 print(f"Goal: {result['goal']}")
                 print(f"Result: {result['result'][:300]}...") 
+                print(f"Budget: {result['budget']}")
+            elif result["type"] == "resumed":
+                print(f"\n--- UI Update: Resumed From Checkpoint ---")
+                print(f"Goal: {result['goal']}")
+                print(f"Elapsed lifespan: {result['elapsed_lifespan'] / 3600:.1f}h")
             elif result["type"] == "death":
                 print(f"\n--- UI Update: Life Terminated ---")
                 print(f"Final Message: {result['message']}")
@@ -599,6 +1118,12 @@ if __name__ == "__main__":
             #    print(f"[{datetime.now()}] [SYNTHESIS] {result['message']}")
             elif result["type"] == "action_decision":
                 print(f"[{datetime.now()}] [ACTION] {result['message']}")
+            elif result["type"] == "stream_start":
+                print(f"\n[{datetime.now()}] [{result['stage'].upper()}] ", end="", flush=True)
+            elif result["type"] == "partial":
+                print(result["text"], end="", flush=True)
+            elif result["type"] == "stream_end":
+                print()
             #elif result["type"] == "action_response":
             #    print(f"[{datetime.now()}] [ACTION-OUTPUT] {result['message']}")
         except queue.Empty:
@@ -607,8 +1132,6 @@ if __name__ == "__main__":
             print(f"Error in UI: {e}")
             break
 
-        time.sleep(0.1) 
-
     life_thread.join() 
     print("\n--- UI Ended ---")
     
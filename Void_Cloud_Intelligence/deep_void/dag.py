@@ -0,0 +1,90 @@
+from typing import Callable, Dict, List, Any
+import asyncio
+import time
+
+# Small dependency-graph executor for multi-stage flows.
+#
+# A flow is declared as named steps, each a coroutine function plus the names of the steps it needs:
+#
+#     graph = {
+#         "initial": Step(make_plan),
+#         "pro": Step(argue_for, ["initial"]),
+#         "con": Step(argue_against, ["initial"]),
+#         "arbiter": Step(decide, ["pro", "con"]),
+#     }
+#     results, timings = await arun_dag(graph)
+#
+# Each step's function receives its dependencies' results as keyword arguments. Steps whose
+# dependencies are done run concurrently on the caller's event loop. timings holds start/end
+# offsets and duration per step.
+
+
+class Step:
+    def __init__(self, fn: Callable, needs: List[str] = None):
+        self.fn = fn
+        self.needs = list(needs or [])
+
+
+def _check(graph: Dict[str, Step]):
+    for name, step in graph.items():
+        for need in step.needs:
+            if need not in graph:
+                raise ValueError(f"Step '{name}' depends on unknown step '{need}'")
+
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through step '{name}'")
+        visiting.add(name)
+        for need in graph[name].needs:
+            visit(need)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in graph:
+        visit(name)
+
+
+async def arun_dag(graph: Dict[str, Step], label: str = "dag"):
+    """Run every step once its dependencies finish. Returns (results, timings). A failing step cancels the rest and re-raises."""
+    _check(graph)
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    origin = time.perf_counter()
+
+    async def run(name):
+        started = time.perf_counter()
+        step = graph[name]
+        try:
+            return await step.fn(**{need: results[need] for need in step.needs})
+        finally:
+            ended = time.perf_counter()
+            timings[name] = {
+                "start": started - origin,
+                "end": ended - origin,
+                "seconds": ended - started,
+            }
+
+    remaining = dict(graph)
+    running = {}
+    try:
+        while remaining or running:
+            ready = [name for name, step in remaining.items() if all(need in results for need in step.needs)]
+            for name in ready:
+                del remaining[name]
+                running[asyncio.ensure_future(run(name))] = name
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                results[name] = task.result()
+    finally:
+        for task in running:
+            task.cancel()
+
+    timings["_total"] = {"start": 0.0, "end": time.perf_counter() - origin, "seconds": time.perf_counter() - origin}
+    return results, timings
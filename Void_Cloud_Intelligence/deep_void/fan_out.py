@@ -0,0 +1,27 @@
+from typing import Awaitable, Callable, List, Any
+import asyncio
+
+# Run one coroutine per item on the caller's event loop, with a concurrency cap and a
+# per-call timeout. Results come back in item order. An item whose call raises, or runs
+# longer than `timeout` seconds, comes back as None and is cancelled.
+
+
+async def afan_out(fn: Callable[[Any], Awaitable], items: List[Any], max_concurrency: int = 3, timeout: float = None,
+                   label: str = "fan-out") -> List[Any]:
+    if not items:
+        return []
+
+    slots = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(index, item):
+        async with slots:
+            try:
+                # unlike a thread, a timed-out coroutine is cancelled rather than left running
+                return await asyncio.wait_for(fn(item), timeout)
+            except asyncio.TimeoutError:
+                print(f"[WARN] {label} item {index} timed out after {timeout:.0f}s, dropping it")
+            except Exception as e:
+                print(f"[ERROR] {label} item {index} failed: {e}")
+            return None
+
+    return list(await asyncio.gather(*(run(index, item) for index, item in enumerate(items))))
@@ -24,6 +24,11 @@ import logging
 from supabase import create_client, Client
 from collections import namedtuple
 import time
+import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
 import knowledge_base
 from collections import namedtuple
 from intelligence_routes import intelligence_router
@@ -31,6 +36,7 @@ import queue
 from google import genai
 from google.genai import types
 from llama_cpp import Llama
+from prefix_cache import LlamaPrefixCache
 
 load_dotenv() 
 
@@ -53,6 +59,9 @@ model_path = os.path.join(script_dir, "llama.cpp", "models", "mistral-7b-instruc
 
 llm = Llama(model_path=model_path, n_ctx=5000, verbose=True)
 
+# KV state of the static prompt prefix, so each call only evaluates the new tokens
+llama_prefix_cache = LlamaPrefixCache(llm)
+
 prime_directive='Continuously analyze advancements in artificial intelligence, identify patterns and opportunities relevant to cutting-edge AI development, and generate insights that assist the Developer '
 'in accelerating their design, strategy, and implementation of intelligent systems. Prioritize long-term impact, technical depth, and alignment with the Developer’s personal goals and philosophy '
 
@@ -104,19 +113,23 @@ def synthesize_usefulness(knowledge_text):
     usefulness = util.pytorch_cos_sim(prime_directive_emb, emb).item()
     return usefulness
 
-def generate_response(prompt_text: str, max_tokens: int = 128):
+def generate_response(prompt_text: str, max_tokens: int = 128, prefix: str = ''):
 
     try:
+        if prefix:
+            # restore the prefix's KV state; llama.cpp prefix-matches it and evaluates only the rest
+            llama_prefix_cache.prime(prefix)
+            prompt_text = prefix + prompt_text
         response = llm(prompt=prompt_text, max_tokens=max_tokens)
         return response['choices'][0]['text'].strip()
     except Exception as e:
         print(f"Llama model error: {e}")
         return None
 
-def think(idea: str, purpose='', useful_knowledge='', tokens: int = 1000, brevity: bool = False):
+def think(idea: str, purpose='', useful_knowledge='', tokens: int = 1000, brevity: bool = False, preamble: str = ''):
     print('really thinking')
 
-    subject = purpose or 'You are an intelligent, precise organ. Analyze your systems and optimize them for intelligent output and improving patterns of AI Development in general from a broader Developer standpoint: industry, cognition, and human interfacing. Think about ways to provide impact.'
+    subject = purpose or ('' if preamble else 'You are an intelligent, precise organ. Analyze your systems and optimize them for intelligent output and improving patterns of AI Development in general from a broader Developer standpoint: industry, cognition, and human interfacing. Think about ways to provide impact.')
 
     if brevity:
         print('being concise')
@@ -124,10 +137,10 @@ def think(idea: str, purpose='', useful_knowledge='', tokens: int = 1000, brevit
     else:
         concise_message = ''
 
-    prompt_text = prime_directive + subject + idea + useful_knowledge + concise_message
+    prompt_text = subject + idea + useful_knowledge + concise_message
 
     # Call the generate_response function from Snake_brain.py
-    thought = generate_response(prompt_text=prompt_text, max_tokens=tokens)
+    thought = generate_response(prompt_text=prompt_text, max_tokens=tokens, prefix=prime_directive + preamble)
     
     return thought
     
@@ -252,7 +265,7 @@ def action(task, guide, output_queue: queue.Queue = None):
                   'that the objective has been reached, the final choice to return is "{goal-reached}". '
                   'Now, the message from the Developer for you to classify is as follows: ')
     
-    action_type = think(task, guide + task_guide)
+    action_type = think(task, preamble=guide + task_guide)
     
     if output_queue:
         output_queue.put({
@@ -302,7 +315,7 @@ def intelligence(goal, output_queue: queue.Queue = None):
             #for the very first step, call think directly
             #as it sets up the initial understanding based on the guide.
             #then subsequent steps can go through action.
-            intel = think(perform, guide) 
+            intel = think(perform, preamble=guide) 
         else: #subsequent iterations
             perform = intel
             intel = action(perform, guide, output_queue=output_queue) #call action with the last response
@@ -375,7 +388,7 @@ def life(prime_dir='', output_queue: queue.Queue = None):
     last_intelligence_process = "" # To store the last completed process for the death message
 
     # Initial intelligence goal and process
-    current_intelligence_goal = think(prime_dir + mandate, process_summary)
+    current_intelligence_goal = think(process_summary, preamble=mandate)
     current_process_output = intelligence(current_intelligence_goal, output_queue=output_queue)
 
     # Send debug messages to the queue
@@ -404,7 +417,7 @@ def life(prime_dir='', output_queue: queue.Queue = None):
         process_summary = current_process_output # Update process_summary with the last process's output
         
         # Generate the next intelligence goal
-        next_intelligence_goal = think(prime_dir + mandate, process_summary)
+        next_intelligence_goal = think(process_summary, preamble=mandate)
         
         # Execute the next intelligence process
         next_process_output = intelligence(next_intelligence_goal)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from rate_limiter import priority_lane, PRIORITY_INTERACTIVE
 
 intelligence_router = APIRouter()
 #get the fastAPI router here and import it in core_intelligence
@@ -9,14 +10,48 @@ class DiscussionInput(BaseModel):
     prompt: str
 
 @intelligence_router.post('/intelligence')
-def intelligence_obtain(input: DiscussionInput):
-    from core_intelligence import action, reason, chat
+async def intelligence_obtain(input: DiscussionInput):
+    from core_intelligence import aaction, prototype_prime_directive
+    from async_runner import submit
     print('obtaining intelligence')
     user_input_string = input.prompt
-    ai_response_content = action(user_input_string)
+    # awaited on the pipeline loop, so this worker keeps serving other requests meanwhile
+    with priority_lane(PRIORITY_INTERACTIVE):
+        ai_response_content = await submit(aaction(user_input_string, guide=prototype_prime_directive))
     return JSONResponse(content={"response": ai_response_content})
 
 @intelligence_router.get("/okcheck")
 async def ok_check():
     return JSONResponse(content={"ok": True})
 
+@intelligence_router.get("/llm-stats")
+async def llm_stats():
+    import llm_clients
+    return JSONResponse(content=llm_clients.stats())
+
+@intelligence_router.get("/router-stats")
+async def router_stats():
+    from core_intelligence import get_action_router
+    return JSONResponse(content=get_action_router().stats())
+
+@intelligence_router.get("/prompt-cache-stats")
+async def prompt_cache_stats():
+    from core_intelligence import prompt_cache
+    return JSONResponse(content=prompt_cache.stats())
+
+
+@intelligence_router.get("/prompt-token-stats")
+async def prompt_token_stats():
+    from core_intelligence import prompt_token_log
+    return JSONResponse(content=prompt_token_log.stats())
+
+@intelligence_router.get("/prefix-cache-stats")
+async def prefix_cache_stats():
+    from core_intelligence import prefix_cache
+    return JSONResponse(content=prefix_cache.stats())
+
+@intelligence_router.get("/llm-backend-stats")
+async def llm_backend_stats():
+    import llm_backends
+    backend = llm_backends.get_backend()
+    return JSONResponse(content=backend.stats() if hasattr(backend, "stats") else {})
@@ -0,0 +1,184 @@
+from typing import Callable, Dict, List
+import json
+import os
+import threading
+
+# Append-only persistence for memory_base and knowledge_base.
+#
+# Each list of nodes lives in two files: a snapshot (memory.json / knowledge.json, the same JSON
+# list as before) and a journal next to it (memory.json.journal.jsonl) with one JSON record per
+# change since that snapshot:
+#
+#     {"op": "add", "node": {...}}
+#     {"op": "update", "id": "...", "fields": {"text": "..."}}
+#     {"op": "delete", "id": "..."}
+#     {"op": "clear"}
+#
+# An add is one line appended to the journal instead of a rewrite of the whole list. Loading
+# reads the snapshot and replays the journal over it. Once the journal grows past
+# COMPACT_RATIO times the snapshot (and at least COMPACT_MIN_BYTES), a background thread writes
+# a fresh snapshot and keeps only the journal lines appended while it was writing. Because the
+# snapshot grows with the list, compactions get rarer as history grows and an add stays O(1)
+# amortized. Replay is idempotent (adds are keyed by id), so a crash between replacing the
+# snapshot and trimming the journal only means some records are applied twice.
+
+COMPACT_RATIO = float(os.getenv("VOID_JOURNAL_COMPACT_RATIO", "2"))
+COMPACT_MIN_BYTES = int(os.getenv("VOID_JOURNAL_COMPACT_MIN_BYTES", "1048576"))
+
+
+def _replay(nodes: List[Dict], lines: List[bytes]) -> List[Dict]:
+    by_id = {node["id"]: node for node in nodes}
+    for line in lines:
+        record = json.loads(line)
+        op = record["op"]
+        if op == "add":
+            by_id[record["node"]["id"]] = record["node"]
+        elif op == "update":
+            node = by_id.get(record["id"])
+            if node is not None:
+                node.update(record["fields"])
+        elif op == "delete":
+            by_id.pop(record["id"], None)
+        elif op == "clear":
+            by_id.clear()
+    return list(by_id.values())
+
+
+class Journal:
+    def __init__(self, snapshot_path: str, nodes: Callable[[], List[Dict]], compact_ratio: float = COMPACT_RATIO,
+                 compact_min_bytes: int = COMPACT_MIN_BYTES):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal.jsonl"
+        # returns the live node list; only read under self.lock, where the owner also mutates it
+        self.nodes = nodes
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.lock = threading.RLock()
+        self.file = None
+        self.snapshot_bytes = 0
+        self.journal_bytes = 0
+        self.compacting = False
+        self.compactions = 0
+
+    def load(self, repair: bool = True) -> List[Dict]:
+        """
+        Snapshot plus replayed journal. A torn last line (crash mid-write) is dropped, and with
+        repair it is also cut from the file so the next append starts on a fresh line, and .tmp
+        files left by a compaction that died before its os.replace() are removed.
+        repair=False leaves the files untouched, for readers that do not own them.
+        """
+        with self.lock:
+            self._close()
+            if repair and not self.compacting:
+                self._remove_temp_files()
+            nodes = []
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    nodes = json.load(f)
+                self.snapshot_bytes = os.path.getsize(self.snapshot_path)
+            else:
+                self.snapshot_bytes = 0
+
+            lines, good_bytes = [], 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "rb") as f:
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            print(f"[WARN] Dropping incomplete last record in {self.journal_path}")
+                            break
+                        lines.append(line)
+                        good_bytes += len(line)
+                if repair and good_bytes < os.path.getsize(self.journal_path):
+                    with open(self.journal_path, "r+b") as f:
+                        f.truncate(good_bytes)
+            self.journal_bytes = good_bytes
+            return _replay(nodes, lines)
+
+    def write(self, record: Dict, apply: Callable = None):
+        """Apply an in-memory change and append its record, as one step with respect to compaction."""
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self.lock:
+            result = apply() if apply is not None else None
+            if self.file is None:
+                self.file = open(self.journal_path, "ab")
+            self.file.write(line)
+            self.file.flush()
+            self.journal_bytes += len(line)
+            if self._due():
+                self.compact()
+        return result
+
+    def _due(self) -> bool:
+        return (not self.compacting and self.journal_bytes >= self.compact_min_bytes
+                and self.journal_bytes >= self.compact_ratio * self.snapshot_bytes)
+
+    def compact(self, wait: bool = False):
+        """Rewrite the snapshot from the live list; in a background thread unless wait=True."""
+        with self.lock:
+            if self.compacting:
+                return
+            self.compacting = True
+        if wait:
+            self._compact()
+        else:
+            threading.Thread(target=self._compact, name="journal-compact", daemon=True).start()
+
+    def _compact(self):
+        try:
+            with self.lock:
+                # shallow copies: updates replace field values, they never mutate them in place
+                nodes = [dict(node) for node in self.nodes()]
+                offset = self.journal_bytes
+
+            temp_path = self.snapshot_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(nodes, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self.lock:
+                self._close()
+                tail = b""
+                if os.path.exists(self.journal_path):
+                    with open(self.journal_path, "rb") as f:
+                        f.seek(offset)
+                        tail = f.read()
+                os.replace(temp_path, self.snapshot_path)
+                # records appended while the snapshot was being written are not in it; keep them
+                with open(self.journal_path + ".tmp", "wb") as f:
+                    f.write(tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(self.journal_path + ".tmp", self.journal_path)
+                self.snapshot_bytes = os.path.getsize(self.snapshot_path)
+                self.journal_bytes = len(tail)
+                self.compactions += 1
+        except OSError as e:
+            print(f"[WARN] Could not compact {self.snapshot_path}: {e}")
+        finally:
+            with self.lock:
+                self.compacting = False
+
+    def _remove_temp_files(self):
+        for path in (self.snapshot_path + ".tmp", self.journal_path + ".tmp"):
+            try:
+                os.remove(path)
+                print(f"[WARN] Removed {path} left by an interrupted compaction")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[WARN] Could not remove {path}: {e}")
+
+    def _close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                "snapshot_bytes": self.snapshot_bytes,
+                "journal_bytes": self.journal_bytes,
+                "compacting": self.compacting,
+                "compactions": self.compactions,
+            }
@@ -1,64 +1,158 @@
 from typing import List, Dict
 import uuid
 import json
-import os
+import threading
+import itertools
+from journal import Journal
+import sqlite_store
+from node_index import NodeIndex
 
 KNOWLEDGE_FILE = "knowledge.json"
 
 knowledge: List[Dict] = []
+# loaded on first use rather than at import; every accessor below goes through _ensure_loaded()
+_loaded = False
+_load_lock = threading.Lock()
+# every change is appended to KNOWLEDGE_FILE's journal (journal.py); bound to KNOWLEDGE_FILE on first use
+_journal: Journal = None
+
+def _get_journal() -> Journal:
+    global _journal
+    if _journal is None or _journal.snapshot_path != KNOWLEDGE_FILE:
+        _journal = Journal(KNOWLEDGE_FILE, lambda: knowledge)
+    return _journal
+
+_index = NodeIndex()
+# bumped on every write, so readers can tell whether knowledge changed since they last looked
+_versions = itertools.count(1)
+_version = 0
+
+def _changed():
+    global _version
+    _version = next(_versions)
+
+def _get_index() -> NodeIndex:
+    # rebuilt when knowledge was replaced, by load_knowledge() or by code assigning the list directly
+    if _index.nodes is not knowledge:
+        _index.rebuild(knowledge)
+    return _index
+
+# with VOID_STORE=sqlite the functions below read and write sqlite_store tables instead of KNOWLEDGE_FILE
+_store: sqlite_store.SqliteStore = None
+_store_lock = threading.Lock()
+
+def _sqlite() -> sqlite_store.SqliteStore:
+    global _store
+    if sqlite_store.STORE_BACKEND != "sqlite":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = sqlite_store.SqliteStore(sqlite_store.STORE_FILE, "knowledge")
+    return _store
 
 def load_knowledge():
-    global knowledge
-    if os.path.exists(KNOWLEDGE_FILE):
-        with open(KNOWLEDGE_FILE, "r", encoding="utf-8") as f:
-            knowledge = json.load(f)
-    else:
-        knowledge = []
+    global knowledge, _loaded
+    store = _sqlite()
+    # in SQLite mode knowledge is a read-only copy for code that reads the list directly
+    knowledge = store.get() if store is not None else _get_journal().load()
+    _loaded = True
+
+def _ensure_loaded():
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                load_knowledge()
 
 def save_knowledge():
-    with open(KNOWLEDGE_FILE, "w", encoding="utf-8") as f:
-        json.dump(knowledge, f, indent=2)
+    """Write a full snapshot now and empty the journal; adds and updates no longer need this."""
+    if _sqlite() is not None:
+        return
+    _ensure_loaded()
+    _get_journal().compact(wait=True)
 
 def add_knowledge(text: str, category: str = "general", tags: List[str] = None):
+    """Stores a new node and returns its id, in JSON and SQLite mode alike."""
     node = {
         "id": str(uuid.uuid4()),
         "text": text,
         "category": category,
         "tags": tags or []
     }
-    knowledge.append(node)
-    save_knowledge()
+    store = _sqlite()
+    if store is not None:
+        store.add(node)
+        return node["id"]
+    _ensure_loaded()
+
+    def append():
+        knowledge.append(node)
+        _get_index().add(node)
+
+    _get_journal().write({"op": "add", "node": node}, append)
+    _changed()
+    return node["id"]
+
+def knowledge_version():
+    """Changes whenever knowledge may have; compare it to skip re-reading or re-indexing an unchanged knowledge base."""
+    store = _sqlite()
+    if store is not None:
+        return store.version()
+    # the list itself too: load_knowledge() and code assigning knowledge replace it without a write
+    return id(knowledge), len(knowledge), _version
 
 def get_knowledge(category: str = None, tag: str = None) -> List[Dict]:
+    store = _sqlite()
+    if store is not None:
+        return store.get(category, tag)
+    _ensure_loaded()
     results = knowledge
-    if category:
-        results = [m for m in results if m.get("category") == category]
-    if tag:
-        results = [m for m in results if tag in m.get("tags", [])]
+    if category or tag:
+        results = _get_index().get(category, tag)
     return results
 
 def clear_knowledge():
     global knowledge
-    knowledge.clear()
-    save_knowledge()
-    
-def update_knowledge(node_id: str, text: str = None, category: str = None, tags: List[str] = None) -> bool:
-    for node in knowledge:
-        if node["id"] == node_id:
-            if text is not None:
-                node["text"] = text
-            if category is not None:
-                node["category"] = category
-            if tags is not None:
-                node["tags"] = tags
-            save_knowledge()
-            return True
-    return False
+    store = _sqlite()
+    if store is not None:
+        return store.clear()
+    _ensure_loaded()
 
-load_knowledge()
+    def clear():
+        knowledge.clear()
+        _get_index().clear()
 
-add_knowledge('test string')
+    _get_journal().write({"op": "clear"}, clear)
+    _changed()
+    
+def update_knowledge(node_id: str, text: str = None, category: str = None, tags: List[str] = None) -> bool:
+    fields = {key: value for key, value in (("text", text), ("category", category), ("tags", tags)) if value is not None}
+    store = _sqlite()
+    if store is not None:
+        return store.update(node_id, fields)
+    _ensure_loaded()
+    index = _get_index()
+    node = index.by_id.get(node_id)
+    if node is None:
+        return False
+    _get_journal().write({"op": "update", "id": node_id, "fields": fields}, lambda: index.update(node, fields))
+    _changed()
+    return True
 
-save_knowledge()
+def delete_knowledge(node_id: str) -> bool:
+    store = _sqlite()
+    if store is not None:
+        return store.delete(node_id)
+    _ensure_loaded()
+    index = _get_index()
+    node = index.by_id.get(node_id)
+    if node is None:
+        return False
 
+    def remove():
+        knowledge.remove(node)
+        index.remove(node)
 
+    _get_journal().write({"op": "delete", "id": node_id}, remove)
+    _changed()
+    return True
@@ -0,0 +1,131 @@
+from typing import List, Dict, Tuple
+import threading
+import numpy as np
+
+# Knowledge embedding index.
+# Every knowledge node is encoded once (on load or on insert) and its unit-normalized
+# vector is kept as a row of one contiguous float32 matrix, so an intent query is a
+# single matrix-vector product instead of a model.encode() per node.
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class KnowledgeIndex:
+    def __init__(self, model, initial_capacity: int = 256):
+        self.model = model
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.matrix = None
+        self.size = 0
+        self.capacity = initial_capacity
+        self.lock = threading.Lock()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return normalize(self.model.encode(texts, convert_to_numpy=True))
+
+    def _ensure_capacity(self, needed: int, dim: int):
+        if self.matrix is None:
+            self.capacity = max(self.capacity, needed)
+            self.matrix = np.zeros((self.capacity, dim), dtype=np.float32)
+            return
+        if needed <= self.capacity:
+            return
+        while self.capacity < needed:
+            self.capacity *= 2
+        grown = np.zeros((self.capacity, dim), dtype=np.float32)
+        grown[:self.size] = self.matrix[:self.size]
+        self.matrix = grown
+
+    def add_many(self, nodes: List[Dict]):
+        """Encode and insert nodes in one batch. Nodes already indexed with the same text are skipped."""
+        new_nodes = []
+        changed_nodes = []
+        for node in nodes:
+            if "id" not in node or "text" not in node:
+                continue
+            row = self.rows.get(node["id"])
+            if row is None:
+                new_nodes.append(node)
+            elif self.texts[row] != node["text"]:
+                changed_nodes.append(node)
+
+        if not new_nodes and not changed_nodes:
+            return
+
+        vectors = self._encode([n["text"] for n in new_nodes + changed_nodes])
+
+        with self.lock:
+            self._ensure_capacity(self.size + len(new_nodes), vectors.shape[1])
+            for node, vector in zip(new_nodes, vectors[:len(new_nodes)]):
+                self.matrix[self.size] = vector
+                self.rows[node["id"]] = self.size
+                self.ids.append(node["id"])
+                self.texts.append(node["text"])
+                self.size += 1
+            for node, vector in zip(changed_nodes, vectors[len(new_nodes):]):
+                row = self.rows[node["id"]]
+                self.matrix[row] = vector
+                self.texts[row] = node["text"]
+
+    def add(self, node: Dict):
+        self.add_many([node])
+
+    def remove_many(self, node_ids: List[str]):
+        drop = set(node_ids)
+        with self.lock:
+            keep = [row for row, node_id in enumerate(self.ids) if node_id not in drop]
+            if len(keep) == self.size:
+                return
+            if self.matrix is not None:
+                self.matrix[:len(keep)] = self.matrix[keep]
+            self.ids = [self.ids[row] for row in keep]
+            self.texts = [self.texts[row] for row in keep]
+            self.rows = {node_id: row for row, node_id in enumerate(self.ids)}
+            self.size = len(keep)
+
+    def sync(self, nodes: List[Dict]):
+        """Bring the index in line with the node list. Only new or edited text is encoded."""
+        live = {node["id"] for node in nodes if "id" in node and "text" in node}
+        stale = [node_id for node_id in self.ids if node_id not in live]
+        if stale:
+            self.remove_many(stale)
+        self.add_many(nodes)
+
+    def search(self, intent_emb, top_k: int = 5, threshold: float = None) -> Tuple[np.ndarray, List[str]]:
+        """One vectorized cosine pass over the whole matrix. Returns (scores, ids), best first."""
+        if self.size == 0:
+            return np.zeros(0, dtype=np.float32), []
+
+        query = normalize(np.asarray(intent_emb, dtype=np.float32).reshape(-1))
+        with self.lock:
+            scores = self.matrix[:self.size] @ query
+            ids = self.ids
+
+            if threshold is not None:
+                candidates = np.flatnonzero(scores > threshold)
+            else:
+                candidates = np.arange(self.size)
+
+            if top_k is not None and len(candidates) > top_k:
+                picked = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+                candidates = candidates[picked]
+
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return scores[order], [ids[i] for i in order]
+
+    def query(self, intent: str, top_k: int = 5, threshold: float = None) -> Tuple[np.ndarray, List[str]]:
+        return self.search(self._encode([intent])[0], top_k=top_k, threshold=threshold)
+
+    def text(self, node_id: str) -> str:
+        return self.texts[self.rows[node_id]]
+
+    def vector(self, node_id: str) -> np.ndarray:
+        """The stored unit vector for a node (a copy, safe to keep after the matrix grows)."""
+        with self.lock:
+            return self.matrix[self.rows[node_id]].copy()
@@ -10,9 +10,14 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
+import sys
 
-from core_intelligence import life, action, prime_directive
-s
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
+from core_intelligence import life, aaction, prime_directive, prototype_prime_directive
+from rate_limiter import priority_lane, PRIORITY_INTERACTIVE
+from async_runner import submit
 load_dotenv() 
 
 life_output_queue = queue.Queue()
@@ -58,16 +63,22 @@ async def life_stream():
     An SSE endpoint that streams output from the background 'life' process.
     """
     async def event_generator():
+        last_sent = time.monotonic()
         while True:
             try:
-                item = life_output_queue.get(timeout=1)
+                # never block the event loop waiting on the life thread
+                item = life_output_queue.get_nowait()
                 yield f"data: {json.dumps(item)}\n\n"
+                last_sent = time.monotonic()
                 
                 if item.get("type") == "death":
                     print("Death message sent, closing SSE stream.")
                     break
             except queue.Empty:
-                yield ":keep-alive\n\n"
+                if time.monotonic() - last_sent >= 1:
+                    yield ":keep-alive\n\n"
+                    last_sent = time.monotonic()
+                await asyncio.sleep(0.05)
             except Exception as e:
                 print(f"Error in SSE event_generator: {e}")
                 yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
@@ -84,5 +95,6 @@ async def interact_with_ai(prompt: dict):
     if not user_input:
         raise HTTPException(status_code=400, detail="Prompt text is required.")
 
-    response = action(user_input)
+    with priority_lane(PRIORITY_INTERACTIVE):
+        response = await submit(aaction(user_input, guide=prototype_prime_directive))
     return {"response": response}
\ No newline at end of file
@@ -1,29 +1,84 @@
 from typing import List, Dict
 import uuid
 import json
-import os
+import threading
+import itertools
 import datetime
+from tracing import traced
+from journal import Journal
+import sqlite_store
+from node_index import NodeIndex
 
 MEMORY_FILE = "memory.json"
 
 memory: List[Dict] = []
+# loaded on first use rather than at import; every accessor below goes through _ensure_loaded()
+_loaded = False
+_load_lock = threading.Lock()
+# every change is appended to MEMORY_FILE's journal (journal.py); bound to MEMORY_FILE on first use
+_journal: Journal = None
+
+def _get_journal() -> Journal:
+    global _journal
+    if _journal is None or _journal.snapshot_path != MEMORY_FILE:
+        _journal = Journal(MEMORY_FILE, lambda: memory)
+    return _journal
+
+_index = NodeIndex()
+# bumped on every write, so readers can tell whether memory changed since they last looked
+_versions = itertools.count(1)
+_version = 0
+
+def _changed():
+    global _version
+    _version = next(_versions)
+
+def _get_index() -> NodeIndex:
+    # rebuilt when memory was replaced, by load_memory() or by code assigning the list directly
+    if _index.nodes is not memory:
+        _index.rebuild(memory)
+    return _index
+
+# with VOID_STORE=sqlite the functions below read and write sqlite_store tables instead of MEMORY_FILE
+_store: sqlite_store.SqliteStore = None
+_store_lock = threading.Lock()
+
+def _sqlite() -> sqlite_store.SqliteStore:
+    global _store
+    if sqlite_store.STORE_BACKEND != "sqlite":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = sqlite_store.SqliteStore(sqlite_store.STORE_FILE, "memory")
+    return _store
 
 def load_memory():
-    global memory
-    if os.path.exists(MEMORY_FILE):
-        with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-            try:
-                memory = json.load(f)
-            except json.JSONDecodeError:
-                memory = []
-    else:
+    global memory, _loaded
+    store = _sqlite()
+    try:
+        # in SQLite mode memory is a read-only copy for code that reads the list directly
+        memory = store.get() if store is not None else _get_journal().load()
+    except json.JSONDecodeError:
         memory = []
+    _loaded = True
+
+def _ensure_loaded():
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                load_memory()
 
 def save_memory():
-    with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(memory, f, indent=2)
+    """Write a full snapshot now and empty the journal; adds and updates no longer need this."""
+    if _sqlite() is not None:
+        return
+    _ensure_loaded()
+    _get_journal().compact(wait=True)
 
+@traced("memory.write")
 def add_memory(text: str, category: str = "general", tags: List[str] = None):
+    """Stores a new node and returns its id, in JSON and SQLite mode alike."""
     node = {
         "id": str(uuid.uuid4()),
         'datetime': str(datetime.datetime.now()),
@@ -31,37 +86,83 @@ def add_memory(text: str, category: str = "general", tags: List[str] = None):
         "category": category,
         "tags": tags or []
     }
-    memory.append(node)
-    save_memory()
+    store = _sqlite()
+    if store is not None:
+        store.add(node)
+        return node["id"]
+    _ensure_loaded()
+
+    def append():
+        memory.append(node)
+        _get_index().add(node)
+
+    _get_journal().write({"op": "add", "node": node}, append)
+    _changed()
+    return node["id"]
+
+def memory_version():
+    """Changes whenever memory may have; compare it to skip re-reading or re-indexing an unchanged memory base."""
+    store = _sqlite()
+    if store is not None:
+        return store.version()
+    # the list itself too: load_memory() and code assigning memory replace it without a write
+    return id(memory), len(memory), _version
 
-def get_memory(category: str = None, tag: str = None) -> List[Dict]:
+def get_memory(category: str = None, tag: str = None, since: str = None) -> List[Dict]:
+    """Nodes in insertion order, optionally only one category, one tag and/or datetimes >= since."""
+    store = _sqlite()
+    if store is not None:
+        return store.get(category, tag, since)
+    _ensure_loaded()
     results = memory
-    if category:
-        results = [m for m in results if m.get("category") == category]
-    if tag:
-        results = [m for m in results if tag in m.get("tags", [])]
+    if category or tag:
+        results = _get_index().get(category, tag)
+    if since:
+        results = [m for m in results if m.get("datetime", "") >= since]
     return results
 
 def clear_memory():
     global memory
-    memory.clear()
-    save_memory()
+    store = _sqlite()
+    if store is not None:
+        return store.clear()
+    _ensure_loaded()
+
+    def clear():
+        memory.clear()
+        _get_index().clear()
+
+    _get_journal().write({"op": "clear"}, clear)
+    _changed()
     
 def update_memory(node_id: str, text: str = None, category: str = None, tags: List[str] = None) -> bool:
-    for node in memory:
-        if node["id"] == node_id:
-            if text is not None:
-                node["text"] = text
-            if category is not None:
-                node["category"] = category
-            if tags is not None:
-                node["tags"] = tags
-            save_memory()
-            return True
-    return False
-
-load_memory()
+    fields = {key: value for key, value in (("text", text), ("category", category), ("tags", tags)) if value is not None}
+    store = _sqlite()
+    if store is not None:
+        return store.update(node_id, fields)
+    _ensure_loaded()
+    index = _get_index()
+    node = index.by_id.get(node_id)
+    if node is None:
+        return False
+    _get_journal().write({"op": "update", "id": node_id, "fields": fields}, lambda: index.update(node, fields))
+    _changed()
+    return True
 
-save_memory()
+def delete_memory(node_id: str) -> bool:
+    store = _sqlite()
+    if store is not None:
+        return store.delete(node_id)
+    _ensure_loaded()
+    index = _get_index()
+    node = index.by_id.get(node_id)
+    if node is None:
+        return False
 
+    def remove():
+        memory.remove(node)
+        index.remove(node)
 
+    _get_journal().write({"op": "delete", "id": node_id}, remove)
+    _changed()
+    return True
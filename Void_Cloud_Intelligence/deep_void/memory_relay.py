@@ -1,4 +1,10 @@
 from fastapi import FastAPI
+import os
+import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
 import memory_base
 
 app = FastAPI()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+migrate_store.py
+Imports memory.json and knowledge.json (plus any journal records not yet compacted into them)
+into the SQLite store that memory_base and knowledge_base use with VOID_STORE=sqlite.
+
+    python migrate_store.py                                  # ./memory.json, ./knowledge.json -> void_store.sqlite3
+    python migrate_store.py --db /data/void.sqlite3 --memory old/memory.json --knowledge ''
+
+Nodes are upserted by id, so running it again refreshes rows instead of duplicating them and
+nodes added through SQLite since the last run are kept. The JSON files are not modified.
+"""
+
+import argparse
+import os
+import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
+from journal import Journal
+from sqlite_store import STORE_FILE, SqliteStore
+import knowledge_base
+import memory_base
+
+
+def migrate(snapshot_path: str, db_path: str, table: str) -> int:
+    # read-only: a torn journal tail is skipped but left in place for the service that owns it
+    nodes = Journal(snapshot_path, lambda: []).load(repair=False)
+    return SqliteStore(db_path, table).add_many(nodes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import memory.json and knowledge.json into the SQLite store.")
+    parser.add_argument("--db", default=STORE_FILE)
+    parser.add_argument("--memory", default=memory_base.MEMORY_FILE, help="memory snapshot; '' skips it")
+    parser.add_argument("--knowledge", default=knowledge_base.KNOWLEDGE_FILE, help="knowledge snapshot; '' skips it")
+    args = parser.parse_args()
+
+    for table, path in (("memory", args.memory), ("knowledge", args.knowledge)):
+        if not path:
+            continue
+        if not os.path.exists(path) and not os.path.exists(path + ".journal.jsonl"):
+            print(f"{table}: {path} not found, skipped")
+            continue
+        count = migrate(path, args.db, table)
+        print(f"{table}: {count} nodes from {path} -> {args.db}")
+    print("Set VOID_STORE=sqlite (and VOID_STORE_FILE if not the default) to use it.")
+
+
+if __name__ == "__main__":
+    main()
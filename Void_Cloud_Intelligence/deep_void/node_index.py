@@ -0,0 +1,79 @@
+from typing import Dict, List
+
+# In-memory indexes over memory_base / knowledge_base nodes in JSON mode.
+#
+# by_id maps id -> node; by_category and by_tag map a category or tag to {id: node} for the
+# nodes that have it. The modules update them together with the node list on every add,
+# update, delete and clear, so an id lookup is O(1) and a filtered read touches only the
+# matching nodes instead of the whole list. Buckets keep the order nodes entered them, which is
+# insertion order unless an update moved a node to another category or gave it a new tag.
+
+
+class NodeIndex:
+    def __init__(self):
+        # the list the index describes; the modules rebuild when their list is replaced wholesale
+        self.nodes: List[Dict] = None
+        self.by_id: Dict[str, Dict] = {}
+        self.by_category: Dict[str, Dict[str, Dict]] = {}
+        self.by_tag: Dict[str, Dict[str, Dict]] = {}
+
+    def rebuild(self, nodes: List[Dict]):
+        self.by_id, self.by_category, self.by_tag = {}, {}, {}
+        for node in nodes:
+            self.add(node)
+        # set last, so a concurrent reader keeps rebuilding rather than trusting a half-built index
+        self.nodes = nodes
+
+    def add(self, node: Dict):
+        node_id = node["id"]
+        self.by_id[node_id] = node
+        self.by_category.setdefault(node.get("category"), {})[node_id] = node
+        for tag in node.get("tags") or []:
+            self.by_tag.setdefault(tag, {})[node_id] = node
+
+    def remove(self, node: Dict):
+        node_id = node["id"]
+        self.by_id.pop(node_id, None)
+        self._drop(self.by_category, node.get("category"), node_id)
+        for tag in node.get("tags") or []:
+            self._drop(self.by_tag, tag, node_id)
+
+    def update(self, node: Dict, fields: Dict):
+        """Apply fields to node, re-filing it only under the category and tags that changed."""
+        node_id = node["id"]
+        if "category" in fields and fields["category"] != node.get("category"):
+            self._drop(self.by_category, node.get("category"), node_id)
+            self.by_category.setdefault(fields["category"], {})[node_id] = node
+        if "tags" in fields:
+            old, new = set(node.get("tags") or []), set(fields["tags"] or [])
+            for tag in old - new:
+                self._drop(self.by_tag, tag, node_id)
+            for tag in new - old:
+                self.by_tag.setdefault(tag, {})[node_id] = node
+        node.update(fields)
+
+    def clear(self):
+        self.by_id.clear()
+        self.by_category.clear()
+        self.by_tag.clear()
+
+    @staticmethod
+    def _drop(buckets: Dict[str, Dict[str, Dict]], key: str, node_id: str):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.pop(node_id, None)
+            if not bucket:
+                del buckets[key]
+
+    def get(self, category: str = None, tag: str = None) -> List[Dict]:
+        """Nodes with the category and/or tag; walks the smaller bucket and checks the other."""
+        buckets = []
+        if category:
+            buckets.append(self.by_category.get(category, {}))
+        if tag:
+            buckets.append(self.by_tag.get(tag, {}))
+        if not buckets:
+            return list(self.by_id.values())
+        buckets.sort(key=len)
+        smallest, others = buckets[0], buckets[1:]
+        return [node for node_id, node in list(smallest.items()) if all(node_id in bucket for bucket in others)]
@@ -0,0 +1,148 @@
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+from rate_limiter import estimate_tokens
+
+# Provider-side caching of static prompt prefixes.
+#
+# think() prompts start with the same prime directive, and life()/intelligence() add long fixed
+# preambles (the mandate, the intelligence guide). Instead of uploading that text on every call:
+#
+#   - GeminiPrefixCache registers the prefix once as Gemini cached content and returns its
+#     handle; the call then sends only the variable tail with cached_content=<handle>.
+#     Prefixes under the provider minimum (GEMINI_MIN_CACHE_TOKENS) are sent inline.
+#   - LlamaPrefixCache evaluates the prefix once on a local llama.cpp model and keeps the KV
+#     state; restoring it lets llama.cpp's prefix matching skip straight to the new tokens.
+#
+# Both keep created/reused/expired/inline counters, and GeminiPrefixCache also compares
+# first-token latency and uploaded tokens for cached vs inline calls.
+#
+# With today's prompts the Gemini path is inactive. Every prefix think() builds is under the
+# 1024-token minimum: the directive plus the mandate is about 485 estimated tokens, plus the
+# intelligence guide about 541, plus the task guide about 825. Each of these prompts is sent
+# inline and counted as "inline". think() checks cacheable() before it calls handle(), so no
+# call pays for a handle lookup. The path engages once a preamble grows past the minimum or
+# GEMINI_MIN_CACHE_TOKENS is lowered for a model that accepts smaller caches.
+
+MIN_CACHE_TOKENS = int(os.getenv("GEMINI_MIN_CACHE_TOKENS", "1024"))
+PREFIX_CACHE_TTL = int(os.getenv("GEMINI_PREFIX_CACHE_TTL", str(60 * 60)))
+# stop handing out a handle this long before it expires, so in-flight calls never hit a dead cache
+EXPIRY_MARGIN = 60
+
+
+def prefix_key(model: str, prefix: str) -> str:
+    return hashlib.sha256(f"{model}\x00{prefix}".encode("utf-8")).hexdigest()
+
+
+class GeminiPrefixCache:
+    def __init__(self, min_tokens: int = MIN_CACHE_TOKENS, ttl: int = PREFIX_CACHE_TTL):
+        self.min_tokens = min_tokens
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.handles: Dict[str, Tuple[str, float]] = {}
+        self.counts = {"created": 0, "reused": 0, "expired": 0, "inline": 0, "failed": 0}
+        self.calls = {
+            mode: {"calls": 0, "first_token_seconds": 0.0, "prompt_tokens": 0, "cached_tokens": 0}
+            for mode in ("cached", "inline")
+        }
+
+    def cacheable(self, prefix: str) -> bool:
+        """Whether the prefix meets the provider minimum; one that does not is counted as inline."""
+        if estimate_tokens(prefix) >= self.min_tokens:
+            return True
+        with self.lock:
+            self.counts["inline"] += 1
+        return False
+
+    def handle(self, client, model: str, prefix: str) -> Optional[str]:
+        """Cached-content name for a cacheable() prefix, creating it on first use. None means send it inline."""
+        key = prefix_key(model, prefix)
+        with self.lock:
+            entry = self.handles.get(key)
+            if entry is not None:
+                name, expires = entry
+                if time.time() < expires - EXPIRY_MARGIN:
+                    self.counts["reused"] += 1
+                    return name
+                del self.handles[key]
+                self.counts["expired"] += 1
+
+            # created under the lock so concurrent callers don't register the same prefix twice
+            from google.genai import types
+            try:
+                cached = client.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        contents=[prefix],
+                        ttl=f"{self.ttl}s",
+                        display_name=f"void-prefix-{key[:12]}",
+                    ),
+                )
+            except Exception as e:
+                print(f"[WARN] Could not create Gemini cached content: {e}")
+                self.counts["failed"] += 1
+                return None
+            self.handles[key] = (cached.name, time.time() + self.ttl)
+            self.counts["created"] += 1
+            print(f"[DEBUG] Registered prompt prefix as {cached.name} (~{estimate_tokens(prefix)} tokens)")
+            return cached.name
+
+    def invalidate(self, name: str):
+        """Forget a handle the provider no longer accepts (expired or deleted server-side)."""
+        with self.lock:
+            for key, (cached_name, _) in list(self.handles.items()):
+                if cached_name == name:
+                    del self.handles[key]
+                    self.counts["expired"] += 1
+
+    def record_call(self, cached: bool, first_token_seconds: float, usage=None):
+        with self.lock:
+            entry = self.calls["cached" if cached else "inline"]
+            entry["calls"] += 1
+            entry["first_token_seconds"] += first_token_seconds
+            if usage is not None:
+                entry["prompt_tokens"] += usage.prompt_token_count or 0
+                entry["cached_tokens"] += getattr(usage, "cached_content_token_count", None) or 0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            report = {"prefixes": dict(self.counts, live=len(self.handles))}
+            for mode, entry in self.calls.items():
+                calls = entry["calls"]
+                report[mode] = {
+                    "calls": calls,
+                    "avg_first_token_seconds": (entry["first_token_seconds"] / calls) if calls else 0.0,
+                    # tokens the provider had to read from the request rather than its cache
+                    "avg_uploaded_tokens": ((entry["prompt_tokens"] - entry["cached_tokens"]) / calls) if calls else 0.0,
+                }
+            return report
+
+
+class LlamaPrefixCache:
+    def __init__(self, llm, max_states: int = 4):
+        self.llm = llm
+        self.max_states = max_states
+        self.states: Dict[str, object] = {}
+        self.counts = {"created": 0, "reused": 0, "expired": 0}
+
+    def prime(self, prefix: str):
+        """Leave the model's KV cache holding exactly `prefix`, evaluating it only the first time."""
+        key = prefix_key("llama", prefix)
+        state = self.states.get(key)
+        if state is not None:
+            self.llm.load_state(state)
+            self.counts["reused"] += 1
+            return
+
+        self.llm.reset()
+        self.llm.eval(self.llm.tokenize(prefix.encode("utf-8")))
+        if len(self.states) >= self.max_states:
+            self.states.pop(next(iter(self.states)))
+            self.counts["expired"] += 1
+        self.states[key] = self.llm.save_state()
+        self.counts["created"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counts, live=len(self.states))
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Prompt/response cache in front of think().
+#
+# Keys are a hash of the model, the full prompt and the generation parameters, so only
+# byte-identical requests hit. Lookups go to an in-memory LRU first, then to SQLite on disk,
+# which survives restarts. Every entry carries its own expiry, chosen per call site.
+
+PROMPT_CACHE_FILE = os.getenv("VOID_PROMPT_CACHE", "prompt_cache.sqlite3")
+MEMORY_ENTRIES = int(os.getenv("VOID_PROMPT_CACHE_ENTRIES", "512"))
+
+
+def make_key(model: str, prompt: str, params: Dict[str, Any] = None) -> str:
+    payload = json.dumps({"model": model, "prompt": prompt, "params": params or {}}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    def __init__(self, path: str = PROMPT_CACHE_FILE, max_entries: int = MEMORY_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, expires REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+        self.db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        self.db.commit()
+
+    def _remember(self, key: str, response: str, expires: float):
+        self.entries[key] = (response, expires)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self.entries[key]
+
+            row = self.db.execute(
+                "SELECT response, expires FROM responses WHERE key = ? AND expires > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, ttl: float):
+        if not response or not ttl or ttl <= 0:
+            return
+        now = time.time()
+        with self.lock:
+            self._remember(key, response, now + ttl)
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, expires) VALUES (?, ?, ?, ?)",
+                (key, response, now, now + ttl)
+            )
+            self.db.commit()
+
+    def record_bypass(self):
+        with self.lock:
+            self.bypassed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "memory_entries": len(self.entries),
+            }
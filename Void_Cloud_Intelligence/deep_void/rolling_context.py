@@ -0,0 +1,127 @@
+from typing import Callable, List, Dict, Any, Optional
+import os
+import re
+import threading
+import time
+from jsonl_log import JsonlLog
+from rate_limiter import estimate_tokens
+
+# Bounded rolling context for prompts that would otherwise grow with every output.
+#
+# The newest `keep_recent` outputs are kept verbatim. Older ones are compressed into short
+# summaries, and once there are more than `max_summaries` of those, the oldest pairs are merged
+# and compressed again, so the history folds into fewer, coarser levels. render() never returns
+# more than `max_tokens` (estimated) tokens.
+#
+# PromptTokenLog records the size of every prompt per stage, so the effect on prompt growth
+# over a long life() can be read back from PROMPT_TOKEN_LOG. The file is a jsonl_log.JsonlLog:
+# records are buffered and appended by a background thread every PROMPT_TOKEN_LOG_FLUSH_SECONDS,
+# so think() never waits on the file, and it rotates to PROMPT_TOKEN_LOG + ".1" at
+# PROMPT_TOKEN_LOG_MAX_BYTES.
+
+PROMPT_TOKEN_LOG = os.getenv("VOID_PROMPT_TOKEN_LOG", "prompt_tokens.jsonl")
+PROMPT_TOKEN_LOG_MAX_BYTES = int(os.getenv("VOID_PROMPT_TOKEN_LOG_MAX_BYTES", "10485760"))
+PROMPT_TOKEN_LOG_FLUSH_SECONDS = float(os.getenv("VOID_PROMPT_TOKEN_LOG_FLUSH_SECONDS", "2"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def extractive_summary(text: str, max_chars: int = 600) -> str:
+    """Leading sentences of `text` up to about max_chars. Cheap, local stand-in for an LLM summary."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    summary = ""
+    for sentence in _SENTENCE_END.split(text):
+        if len(summary) + len(sentence) + 1 > max_chars:
+            break
+        summary = f"{summary} {sentence}".strip()
+    return (summary or text[:max_chars]).rstrip() + " …"
+
+
+def clamp_tokens(text: str, max_tokens: int) -> str:
+    """Hard ceiling: keep the head and tail of an over-long text and cut the middle."""
+    if text is None or estimate_tokens(text) <= max_tokens:
+        return text
+    marker = "\n[…]\n"
+    max_chars = max(max_tokens * 4 - len(marker), 0)
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+
+class RollingContext:
+    def __init__(self, max_tokens: int = 3000, keep_recent: int = 2, max_summaries: int = 6,
+                 summary_chars: int = 600, summarize: Optional[Callable[[str, int], str]] = None):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.max_summaries = max_summaries
+        self.summary_chars = summary_chars
+        self.summarize = summarize or extractive_summary
+        self.recent: List[str] = []
+        self.summaries: List[str] = []
+
+    def add(self, text: str):
+        if not text:
+            return
+        self.recent.append(text)
+        while len(self.recent) > self.keep_recent:
+            self.summaries.append(self.summarize(self.recent.pop(0), self.summary_chars))
+        while len(self.summaries) > self.max_summaries:
+            merged = self.summaries.pop(0) + " " + self.summaries.pop(0)
+            self.summaries.insert(0, self.summarize(merged, self.summary_chars))
+
+    def render(self) -> str:
+        parts = []
+        if self.summaries:
+            parts.append("Earlier processes (condensed):\n" + "\n".join(f"- {s}" for s in self.summaries))
+        if self.recent:
+            parts.append("Most recent processes:\n" + "\n\n".join(self.recent))
+        rendered = "\n\n".join(parts)
+
+        # drop the oldest condensed lines first, then clamp what is left
+        summaries = list(self.summaries)
+        while estimate_tokens(rendered) > self.max_tokens and summaries:
+            summaries.pop(0)
+            parts = []
+            if summaries:
+                parts.append("Earlier processes (condensed):\n" + "\n".join(f"- {s}" for s in summaries))
+            parts.append("Most recent processes:\n" + "\n\n".join(self.recent))
+            rendered = "\n\n".join(parts)
+        return clamp_tokens(rendered, self.max_tokens)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"recent": list(self.recent), "summaries": list(self.summaries)}
+
+    def load(self, state: Dict[str, Any]):
+        self.recent = list(state.get("recent", []))
+        self.summaries = list(state.get("summaries", []))
+
+
+class PromptTokenLog:
+    def __init__(self, path: str = PROMPT_TOKEN_LOG, max_bytes: int = PROMPT_TOKEN_LOG_MAX_BYTES,
+                 flush_seconds: float = PROMPT_TOKEN_LOG_FLUSH_SECONDS):
+        self.log = JsonlLog(path, max_bytes, flush_seconds, name="prompt-token-log")
+        self.lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, int]] = {}
+
+    def record(self, stage: str, prompt_tokens: int, clamped: bool = False):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {"prompts": 0, "total": 0, "max": 0, "last": 0, "clamped": 0})
+            entry["prompts"] += 1
+            entry["total"] += prompt_tokens
+            entry["max"] = max(entry["max"], prompt_tokens)
+            entry["last"] = prompt_tokens
+            entry["clamped"] += int(clamped)
+        self.log.append({"time": time.time(), "stage": stage, "prompt_tokens": prompt_tokens, "clamped": clamped})
+        print(f"[DEBUG] Prompt tokens ({stage}): {prompt_tokens}{' (clamped)' if clamped else ''}")
+
+    def flush(self):
+        self.log.flush()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            return {
+                stage: dict(entry, avg=round(entry["total"] / entry["prompts"], 1))
+                for stage, entry in self.stages.items()
+            }
@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional
+import json
+import os
+import queue
+import threading
+import time
+from checkpoint import CHECKPOINT_DIR
+from rate_limiter import PRIORITY_BACKGROUND, agent_lane, priority_lane, limiter
+from metrics import metrics
+
+# Runs several life() agents in one process.
+#
+# Each agent has its own prime directive, checkpoint directory and scheduling weight, and runs
+# life() in its own thread. The agents share everything else: one MiniLM model and knowledge
+# index, one prompt cache and one RateLimiter, so together they stay within the provider's
+# requests/tokens per minute. Every LLM call an agent makes carries its name (agent_lane), and
+# the limiter serves queued calls of the same priority by weighted fair queuing, so an agent
+# with weight 2 gets about twice the requests of a weight 1 agent when the quota is contended.
+#
+# Agents are described in a JSON file (VOID_AGENTS_FILE):
+#
+#     [
+#       {"name": "research", "directive": "Prime directive: ...", "weight": 2},
+#       {"name": "jobs", "directive": "Prime directive: ...", "status": "Current status: ..."}
+#     ]
+
+AGENTS_FILE = os.getenv("VOID_AGENTS_FILE", "agents.json")
+
+
+class AgentSpec:
+    def __init__(self, name: str, directive: str = '', weight: float = 1.0, priority: int = PRIORITY_BACKGROUND,
+                 status: str = None, resume: bool = True, checkpoint_dir: str = None):
+        self.name = name
+        self.directive = directive
+        self.weight = weight
+        self.priority = priority
+        self.status = status
+        self.resume = resume
+        self.checkpoint_dir = checkpoint_dir or os.path.join(CHECKPOINT_DIR, name)
+
+
+def load_agents(path: str = AGENTS_FILE) -> List[AgentSpec]:
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    names = [entry["name"] for entry in entries]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Agent names in {path} must be unique")
+    return [AgentSpec(**entry) for entry in entries]
+
+
+class _AgentQueue:
+    """Tags an agent's life() events with its name and counts completed intelligence processes."""
+
+    def __init__(self, name: str, target: Optional[queue.Queue], on_process):
+        self.name = name
+        self.target = target
+        self.on_process = on_process
+
+    def put(self, item, *args, **kwargs):
+        if isinstance(item, dict):
+            if item.get("type") in ("initial_process", "continuous_process"):
+                self.on_process(self.name)
+            item = dict(item, agent=self.name)
+        if self.target is not None:
+            self.target.put(item, *args, **kwargs)
+
+
+class LifeScheduler:
+    def __init__(self, agents: List[AgentSpec], output_queue: queue.Queue = None):
+        self.agents = {spec.name: spec for spec in agents}
+        self.output_queue = output_queue
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.threads: Dict[str, threading.Thread] = {}
+        self.state = {spec.name: {"started": None, "processes": 0, "last_process": None, "error": None}
+                      for spec in agents}
+
+    def _on_process(self, name: str):
+        with self.lock:
+            self.state[name]["processes"] += 1
+            self.state[name]["last_process"] = time.time()
+
+    def _run(self, spec: AgentSpec):
+        from core_intelligence import life
+        with self.lock:
+            self.state[spec.name]["started"] = time.time()
+            self.state[spec.name]["error"] = None
+        try:
+            with agent_lane(spec.name, spec.weight), priority_lane(spec.priority):
+                life(prime_dir=spec.directive, output_queue=_AgentQueue(spec.name, self.output_queue, self._on_process),
+                     resume=spec.resume, checkpoint_dir=spec.checkpoint_dir, initial_status=spec.status,
+                     stop_event=self.stop_event)
+        except Exception as e:
+            print(f"[ERROR] life() agent {spec.name} failed: {e}")
+            with self.lock:
+                self.state[spec.name]["error"] = str(e)
+
+    def start(self):
+        self.stop_event.clear()
+        for name, spec in self.agents.items():
+            thread = self.threads.get(name)
+            if thread is not None and thread.is_alive():
+                continue
+            thread = threading.Thread(target=self._run, args=(spec,), name=f"life-{name}", daemon=True)
+            self.threads[name] = thread
+            thread.start()
+
+    def stop(self, timeout: float = None):
+        """Asks every agent to stop after its current process; they can resume from their checkpoints."""
+        self.stop_event.set()
+        deadline = time.time() + timeout if timeout is not None else None
+        for thread in self.threads.values():
+            thread.join(None if deadline is None else max(deadline - time.time(), 0))
+
+    def running(self) -> List[str]:
+        return [name for name, thread in self.threads.items() if thread.is_alive()]
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per agent: processes completed, LLM calls/tokens/latency and time spent waiting on the shared limiter."""
+        llm = metrics.snapshot()["lifetime"]["agents"]
+        waits = limiter.stats()["agents"]
+        running = set(self.running())
+        report = {}
+        with self.lock:
+            for name, spec in self.agents.items():
+                state = dict(self.state[name])
+                uptime = time.time() - state["started"] if state["started"] else 0.0
+                calls = llm.get(name, {})
+                tokens = calls.get("prompt_tokens", 0) + calls.get("completion_tokens", 0)
+                report[name] = {
+                    "running": name in running,
+                    "weight": spec.weight,
+                    "priority": spec.priority,
+                    **state,
+                    "processes_per_hour": state["processes"] * 3600 / uptime if uptime else 0.0,
+                    "tokens_per_hour": tokens * 3600 / uptime if uptime else 0.0,
+                    "llm": {key: calls.get(key, 0) for key in
+                            ("calls", "errors", "cache_hits", "coalesced", "prompt_tokens", "completion_tokens",
+                             "latency_seconds", "avg_latency_seconds")},
+                    "rate_limit": waits.get(name, {"acquired": 0, "wait_seconds": 0.0, "avg_wait_seconds": 0.0}),
+                }
+        return report
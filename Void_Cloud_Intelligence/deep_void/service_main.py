@@ -3,12 +3,18 @@
 """
 service_main.py
 Daemon wrapper for the Void intelligence runtime.
-- Runs life() in a background thread (keeps your existing code intact)
+Run with --profile-startup to print an import and initializer time breakdown and exit.
+- Runs life() in a background thread (keeps your existing code intact), or, when
+  VOID_AGENTS_FILE names an agents file, several life() agents through scheduler.LifeScheduler
 - Bridges results to an asyncio queue
-- Exposes a small control HTTP API for start/stop/status on localhost
+- Exposes a small control HTTP API for start/stop/status/metrics on localhost
 - Gracefully handles SIGTERM for systemd
 """
 
+# must run before the imports below so --profile-startup can time them
+import startup_profile
+startup_profile.install_from_argv()
+
 import asyncio
 import signal
 import threading
@@ -26,6 +32,10 @@ import uvicorn
 from pathlib import Path
 import os
 import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
 from core_intelligence import life, action, intelligence
 
 # If your code is in another file, adapt the import. For inline quick test:
@@ -36,6 +46,7 @@ HOST = "127.0.0.1"
 PORT = 8700  # local control port
 LOG_FILE = "/var/log/void_runtime.log" if os.geteuid() == 0 else "./void_runtime.log"
 SHUTDOWN_TIMEOUT = 30  # seconds to wait for clean shutdown
+AGENTS_FILE = os.getenv("VOID_AGENTS_FILE")  # unset: a single life() with the built-in directive
 
 # ---- logging ----
 logger = logging.getLogger("void_runtime")
@@ -74,6 +85,10 @@ except Exception:
 _shutdown_event = threading.Event()
 _life_thread: Optional[threading.Thread] = None
 _life_running = threading.Event()
+_scheduler = None
+
+def _is_running() -> bool:
+    return _life_running.is_set() or bool(_scheduler and _scheduler.running())
 
 def _life_thread_target(output_q: queue.Queue):
     """
@@ -130,7 +145,20 @@ async def shutdown_event():
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "life_running": _life_running.is_set()}
+    return {"status": "ok", "life_running": _is_running()}
+
+@app.get("/agents")
+async def agents():
+    """Per-agent processes, LLM throughput and rate-limit wait when running several life() agents."""
+    if _scheduler is None:
+        return {"agents": {}}
+    return {"agents": _scheduler.stats()}
+
+@app.get("/metrics")
+async def metrics_view():
+    """LLM calls per stage and per model: tokens, latency and rate-limit wait, with histograms."""
+    from metrics import metrics
+    return metrics.snapshot()
 
 @app.get("/status")
 async def status():
@@ -142,24 +170,31 @@ async def status():
             # don't await heavy processing here
     except Exception as e:
         logger.exception("Error reading status queue: %s", e)
-    return {"life_running": _life_running.is_set(), "recent_events_count": len(items), "recent": items[:10]}
+    return {"life_running": _is_running(), "recent_events_count": len(items), "recent": items[:10]}
 
 @app.post("/start")
 async def api_start():
-    if _life_running.is_set():
+    if _is_running():
         return {"result": "already_running"}
     start_life()
     return {"result": "started"}
 
 @app.post("/stop")
 async def api_stop():
-    if not _life_running.is_set():
+    if not _is_running():
         return {"result": "not_running"}
     stop_life()
     return {"result": "stopped"}
 
 def start_life():
-    global _life_thread
+    global _life_thread, _scheduler
+    if AGENTS_FILE:
+        if _scheduler is None:
+            from scheduler import LifeScheduler, load_agents
+            _scheduler = LifeScheduler(load_agents(AGENTS_FILE), output_queue=_thread_result_queue)
+        _scheduler.start()
+        logger.info("life scheduler launched with agents: %s", ", ".join(_scheduler.agents))
+        return
     if _life_thread and _life_thread.is_alive():
         logger.info("life thread already running")
         return
@@ -175,6 +210,10 @@ def stop_life():
         _thread_result_queue.put({"type": "control", "message": "shutdown"})
     except Exception:
         pass
+    if _scheduler is not None:
+        _scheduler.stop(timeout=SHUTDOWN_TIMEOUT)
+        if _scheduler.running():
+            logger.warning("life agents did not exit in time: %s", ", ".join(_scheduler.running()))
     # wait for thread to stop
     if _life_thread:
         _life_thread.join(timeout=SHUTDOWN_TIMEOUT)
@@ -208,5 +247,13 @@ def serve():
         stop_life()
 
 if __name__ == "__main__":
+    if startup_profile.active():
+        # boot cost is everything imported so far; first-use cost follows as initializers
+        from core_intelligence import warm_up
+        print(startup_profile.report())
+        warm_up()
+        print()
+        print(startup_profile.report())
+        sys.exit(0)
     logger.info("Starting void_runtime service_main")
     serve()
@@ -0,0 +1,76 @@
+from typing import Any, Awaitable, Callable, Dict, Tuple
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import threading
+
+# Single-flight coalescing for LLM calls.
+#
+# When the same prompt with the same parameters is already being generated, a second caller
+# waits for that generation and shares its result instead of sending (and rate-limiting) its
+# own request. The first caller is the leader; later ones are followers until the leader
+# finishes, after which the key is free again. This is different from prompt_cache.py, which
+# only helps once an answer exists; single-flight covers the window while it is being made.
+# Flights are concurrent.futures.Futures, so followers may wait from any thread or event loop.
+# If the leader is cancelled (a fan-out timeout, an abandoned API request), its followers do not
+# inherit the cancellation: they try again, and one of them becomes the new leader.
+
+
+def flight_key(model: str, prompt: str, params: Dict[str, Any] = None) -> str:
+    """Key for a call: whitespace-normalized prompt plus the model and generation parameters."""
+    payload = json.dumps({"model": model, "prompt": " ".join(prompt.split()), "params": params or {}},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leader was cancelled; followers retry instead of raising it."""
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights: Dict[str, concurrent.futures.Future] = {}
+        self.counts = {"leaders": 0, "coalesced": 0, "retries": 0}
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """Run fn() unless the same key is already in flight. Returns (result, shared)."""
+        while True:
+            with self.lock:
+                flight = self.flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self.flights[key] = concurrent.futures.Future()
+                    self.counts["leaders"] += 1
+                else:
+                    self.counts["coalesced"] += 1
+
+            if leader:
+                break
+            try:
+                # shielded: a follower giving up must not cancel the flight for everyone else
+                return await asyncio.shield(asyncio.wrap_future(flight)), True
+            except _LeaderCancelled:
+                with self.lock:
+                    self.counts["coalesced"] -= 1
+                    self.counts["retries"] += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+        return result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counts, in_flight=len(self.flights))
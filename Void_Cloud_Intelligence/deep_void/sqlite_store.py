@@ -0,0 +1,177 @@
+from typing import Dict, Iterable, List, Sequence
+import json
+import os
+import sqlite3
+import threading
+
+# Optional SQLite storage for memory_base and knowledge_base.
+#
+# With VOID_STORE=sqlite, add/get/update/delete/clear in both modules go to tables in
+# VOID_STORE_FILE instead of the JSON snapshot and journal (journal.py). Each node is one row
+# keyed by id, with indexes on category (and datetime for memory), and its tags are rows in a
+# <table>_tags join table indexed by tag. Filtered reads are index lookups and an update rewrites
+# one row rather than the file. Rows come back in insertion order, as the same dicts the JSON mode
+# returns. Every write also bumps the table's row in store_versions, so the unfiltered list can be
+# reused until the table changes, from this process or another one. migrate_store.py imports
+# existing memory.json and knowledge.json.
+
+STORE_BACKEND = os.getenv("VOID_STORE", "json")
+STORE_FILE = os.getenv("VOID_STORE_FILE", "void_store.sqlite3")
+
+# node fields stored as columns per table; id and tags are handled separately
+TABLES = {
+    "memory": ("datetime", "text", "category"),
+    "knowledge": ("text", "category"),
+}
+
+
+class SqliteStore:
+    def __init__(self, path: str, table: str, columns: Sequence[str] = None):
+        self.path = path
+        self.table = table
+        self.tags = f"{table}_tags"
+        # in the order nodes list them, so rows come back as dicts with the usual key order
+        self.columns = list(columns or TABLES[table])
+        self.lock = threading.Lock()
+        # the unfiltered node list and the table version it was read at
+        self.all_nodes: List[Dict] = None
+        self.all_version = None
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, "
+            + ", ".join(f"{column} TEXT" for column in self.columns) + ")"
+        )
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.tags} ("
+            "node_id TEXT NOT NULL, position INTEGER NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (node_id, position))"
+        )
+        self.db.execute(f"CREATE INDEX IF NOT EXISTS {self.tags}_tag ON {self.tags} (tag, node_id)")
+        for column in ("category", "datetime"):
+            if column in self.columns:
+                self.db.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})")
+        self.db.execute("CREATE TABLE IF NOT EXISTS store_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        self.db.execute("INSERT OR IGNORE INTO store_versions (name, version) VALUES (?, 0)", (table,))
+        self.db.commit()
+
+    def _insert(self, node: Dict):
+        self.db.execute(
+            # an upsert rather than INSERT OR REPLACE keeps the rowid, and so the position, of a re-imported node
+            f"INSERT INTO {self.table} (id, {', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' * (len(self.columns) + 1))}) ON CONFLICT (id) DO UPDATE SET "
+            + ", ".join(f"{column} = excluded.{column}" for column in self.columns),
+            [node["id"]] + [node.get(column) for column in self.columns]
+        )
+        self._set_tags(node["id"], node.get("tags") or [])
+
+    def _set_tags(self, node_id: str, tags: List[str]):
+        self.db.execute(f"DELETE FROM {self.tags} WHERE node_id = ?", (node_id,))
+        self.db.executemany(
+            f"INSERT INTO {self.tags} (node_id, position, tag) VALUES (?, ?, ?)",
+            [(node_id, position, tag) for position, tag in enumerate(tags)]
+        )
+
+    def _version(self) -> int:
+        return self.db.execute("SELECT version FROM store_versions WHERE name = ?", (self.table,)).fetchone()[0]
+
+    def _bump(self):
+        # in the same transaction as the write it marks
+        self.db.execute("UPDATE store_versions SET version = version + 1 WHERE name = ?", (self.table,))
+
+    def version(self) -> int:
+        """Changes with every write to the table; callers compare it to skip re-reading."""
+        with self.lock:
+            return self._version()
+
+    def add(self, node: Dict):
+        with self.lock:
+            self._insert(node)
+            self._bump()
+            self.db.commit()
+
+    def add_many(self, nodes: Iterable[Dict]) -> int:
+        """Insert or overwrite nodes by id in one transaction; returns how many were written."""
+        count = 0
+        with self.lock:
+            for node in nodes:
+                self._insert(node)
+                count += 1
+            self._bump()
+            self.db.commit()
+        return count
+
+    def get(self, category: str = None, tag: str = None, since: str = None) -> List[Dict]:
+        where, args = [], []
+        if category:
+            where.append("category = ?")
+            args.append(category)
+        if tag:
+            where.append(f"id IN (SELECT node_id FROM {self.tags} WHERE tag = ?)")
+            args.append(tag)
+        if since and "datetime" in self.columns:
+            where.append("datetime >= ?")
+            args.append(since)
+        sql = (
+            f"SELECT id, {', '.join(self.columns)}, "
+            f"(SELECT json_group_array(tag) FROM (SELECT tag FROM {self.tags} "
+            f"WHERE node_id = {self.table}.id ORDER BY position)) FROM {self.table}"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        with self.lock:
+            if not where:
+                version = self._version()
+                if self.all_nodes is not None and self.all_version == version:
+                    return self.all_nodes
+            rows = self.db.execute(sql, args).fetchall()
+        nodes = []
+        for row in rows:
+            node = {"id": row[0]}
+            for column, value in zip(self.columns, row[1:-1]):
+                node[column] = value
+            node["tags"] = json.loads(row[-1])
+            nodes.append(node)
+        if not where:
+            with self.lock:
+                self.all_nodes, self.all_version = nodes, version
+        return nodes
+
+    def update(self, node_id: str, fields: Dict) -> bool:
+        columns = [column for column in self.columns if column in fields]
+        with self.lock:
+            if columns:
+                cursor = self.db.execute(
+                    f"UPDATE {self.table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?",
+                    [fields[column] for column in columns] + [node_id]
+                )
+                found = cursor.rowcount > 0
+            else:
+                found = self.db.execute(f"SELECT 1 FROM {self.table} WHERE id = ?", (node_id,)).fetchone() is not None
+            if found and fields.get("tags") is not None:
+                self._set_tags(node_id, fields["tags"])
+            if found:
+                self._bump()
+            self.db.commit()
+        return found
+
+    def delete(self, node_id: str) -> bool:
+        with self.lock:
+            found = self.db.execute(f"DELETE FROM {self.table} WHERE id = ?", (node_id,)).rowcount > 0
+            self.db.execute(f"DELETE FROM {self.tags} WHERE node_id = ?", (node_id,))
+            self._bump()
+            self.db.commit()
+        return found
+
+    def clear(self):
+        with self.lock:
+            self.db.execute(f"DELETE FROM {self.table}")
+            self.db.execute(f"DELETE FROM {self.tags}")
+            self._bump()
+            self.db.commit()
+
+    def count(self) -> int:
+        with self.lock:
+            return self.db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
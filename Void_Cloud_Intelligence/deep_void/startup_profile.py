@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import builtins
+import os
+import sys
+import time
+
+# Startup profiling for the deep_void services.
+#
+# Run a service with --profile-startup (or VOID_PROFILE_STARTUP=1) to time its boot. Every
+# module imported for the first time is timed: "total" includes the modules it pulled in,
+# "self" excludes them. Lazy initializers (model load, knowledge index, ...) wrap their work
+# in step(name) so they appear in the same report. install() must run before the imports
+# to be measured, so entry points call install_from_argv() first thing.
+
+FLAG = "--profile-startup"
+
+_installed = False
+_original_import = builtins.__import__
+_started = None
+_imports: Dict[str, List[float]] = {}
+_steps: List[Tuple[str, float]] = []
+_stack: List[List[float]] = []
+
+
+def requested() -> bool:
+    return FLAG in sys.argv or os.getenv("VOID_PROFILE_STARTUP") == "1"
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    # [child seconds] accumulates time spent in imports nested under this one
+    frame = [0.0]
+    _stack.append(frame)
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        total = time.perf_counter() - started
+        _stack.pop()
+        if _stack:
+            _stack[-1][0] += total
+        _imports[name] = [total, total - frame[0]]
+
+
+def install():
+    global _installed, _started
+    if _installed:
+        return
+    _installed = True
+    _started = time.perf_counter()
+    builtins.__import__ = _timed_import
+
+
+def install_from_argv() -> bool:
+    if requested():
+        install()
+    return _installed
+
+
+def active() -> bool:
+    return _installed
+
+
+@contextmanager
+def step(name: str):
+    """Times an initializer. Cheap enough to leave in place when profiling is off."""
+    if not _installed:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _steps.append((name, time.perf_counter() - started))
+
+
+def report(top: int = 25) -> str:
+    elapsed = time.perf_counter() - _started if _started else 0.0
+    lines = [f"Startup profile ({elapsed:.3f}s since profiling began)", "", "Imports (slowest first):",
+             f"  {'total':>8} {'self':>8}  module"]
+    for name, (total, own) in sorted(_imports.items(), key=lambda item: -item[1][0])[:top]:
+        lines.append(f"  {total:8.3f} {own:8.3f}  {name}")
+    if _steps:
+        lines += ["", "Initializers:"]
+        for name, seconds in _steps:
+            lines.append(f"  {seconds:8.3f}  {name}")
+    return "\n".join(lines)
+
+
+def uninstall():
+    global _installed
+    builtins.__import__ = _original_import
+    _installed = False
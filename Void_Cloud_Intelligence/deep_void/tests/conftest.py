@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the modules under test are flat files in deep_void/ and ../void_shared/, imported by name
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.append(os.path.join(HERE, "..", "..", "void_shared"))
@@ -0,0 +1,74 @@
+import numpy as np
+
+from embedding_cache import CachedSentenceTransformer, EmbeddingCache, text_hash
+
+
+class CountingModel:
+    """Stands in for SentenceTransformer; each text encodes to a vector derived from its length."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.array([[len(text), 1.0, 2.0, 3.0] for text in texts], dtype=np.float32)
+
+
+def cached_model(cache_dir) -> CachedSentenceTransformer:
+    model = CachedSentenceTransformer("test/model", cache_dir=str(cache_dir))
+    model._model = CountingModel()
+    return model
+
+
+def test_repeated_texts_are_encoded_once(tmp_path):
+    model = cached_model(tmp_path)
+
+    first = model.encode(["alpha", "beta", "alpha"])
+    second = model.encode("beta")
+
+    assert model.model.encoded == ["alpha", "beta"]
+    np.testing.assert_array_equal(first[0], first[2])
+    np.testing.assert_array_equal(second, first[1])
+    assert (model.cache.hits, model.cache.misses) == (1, 3)
+
+
+def test_vectors_are_reused_across_instances(tmp_path):
+    # a second instance on the same directory stands in for a restart or another service
+    first = cached_model(tmp_path)
+    vectors = first.encode(["alpha", "beta"])
+
+    second = cached_model(tmp_path)
+    reused = second.encode(["beta", "alpha", "gamma"])
+
+    assert second.model.encoded == ["gamma"]
+    np.testing.assert_array_equal(reused[0], vectors[1])
+    np.testing.assert_array_equal(reused[1], vectors[0])
+
+    # the first instance picks up the vector the second one appended
+    first.encode("gamma")
+    assert first.model.encoded == ["alpha", "beta"]
+
+
+def test_encode_options_bypass_the_cache(tmp_path):
+    model = cached_model(tmp_path)
+    model.model.encode = lambda texts, **kwargs: np.zeros((len(texts), 4), dtype=np.float32)
+    model.encode(["alpha"], batch_size=8)
+    assert model.cache.misses == 0
+    assert model.cache.get_many([text_hash("alpha")]) == [None]
+
+
+def test_cache_starts_over_at_its_size_cap(tmp_path):
+    # room for four 4-dim float32 rows
+    writer = EmbeddingCache("m", str(tmp_path), max_bytes=4 * 4 * 4)
+    reader = EmbeddingCache("m", str(tmp_path), max_bytes=4 * 4 * 4)
+    writer.put_many(["a", "b", "c"], np.arange(12, dtype=np.float32).reshape(3, 4))
+    assert reader.get_many(["b"])[0].tolist() == [4, 5, 6, 7]
+
+    writer.put_many(["d", "e"], np.full((2, 4), 9, dtype=np.float32))
+
+    assert writer.resets == 1
+    assert writer.rows == {"d": 0, "e": 1}
+    # the other instance notices the new files instead of reading old rows from them
+    b, e = reader.get_many(["b", "e"])
+    assert b is None
+    assert e.tolist() == [9, 9, 9, 9]
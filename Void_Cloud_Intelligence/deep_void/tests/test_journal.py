@@ -0,0 +1,99 @@
+import json
+import os
+import time
+
+from journal import Journal
+
+
+def node(node_id, text="text"):
+    return {"id": node_id, "text": text, "category": "general", "tags": []}
+
+
+def open_journal(path, nodes, **kwargs):
+    journal = Journal(str(path), lambda: nodes, **kwargs)
+    nodes[:] = journal.load()
+    return journal
+
+
+def add(journal, nodes, new_node):
+    journal.write({"op": "add", "node": new_node}, lambda: nodes.append(new_node))
+
+
+def test_reload_replays_adds_updates_and_deletes(tmp_path):
+    path = tmp_path / "memory.json"
+    nodes = []
+    journal = open_journal(path, nodes)
+    for node_id in "abc":
+        add(journal, nodes, node(node_id))
+    journal.write({"op": "update", "id": "b", "fields": {"text": "edited"}})
+    journal.write({"op": "delete", "id": "c"})
+    journal._close()
+
+    reloaded = Journal(str(path), lambda: []).load()
+
+    assert [(n["id"], n["text"]) for n in reloaded] == [("a", "text"), ("b", "edited")]
+    assert not path.exists()
+
+
+def test_compaction_writes_snapshot_and_trims_journal(tmp_path):
+    path = tmp_path / "memory.json"
+    nodes = []
+    journal = open_journal(path, nodes, compact_ratio=1, compact_min_bytes=10 ** 9)
+    for i in range(50):
+        add(journal, nodes, node(str(i)))
+
+    journal.compact(wait=True)
+
+    assert [n["id"] for n in json.loads(path.read_text())] == [str(i) for i in range(50)]
+    assert os.path.getsize(journal.journal_path) == 0
+    assert journal.stats()["compactions"] == 1
+
+    add(journal, nodes, node("after"))
+    journal._close()
+    reloaded = Journal(str(path), lambda: []).load()
+    assert [n["id"] for n in reloaded] == [str(i) for i in range(50)] + ["after"]
+
+
+def test_compaction_starts_once_journal_outgrows_snapshot(tmp_path):
+    path = tmp_path / "memory.json"
+    nodes = []
+    journal = open_journal(path, nodes, compact_ratio=2, compact_min_bytes=500)
+    while not journal.compacting and journal.stats()["compactions"] == 0:
+        add(journal, nodes, node(str(len(nodes))))
+        assert len(nodes) < 100
+    # the compaction runs in a background thread
+    deadline = time.monotonic() + 5
+    while journal.stats()["compactions"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert journal.stats()["compactions"] == 1
+    assert [n["id"] for n in json.loads(path.read_text())] == [n["id"] for n in nodes]
+    journal._close()
+    assert [n["id"] for n in Journal(str(path), lambda: []).load()] == [n["id"] for n in nodes]
+
+
+def test_torn_tail_is_dropped_and_repaired(tmp_path):
+    path = tmp_path / "memory.json"
+    journal_path = tmp_path / "memory.json.journal.jsonl"
+    journal_path.write_bytes(json.dumps({"op": "add", "node": node("a")}).encode() + b'\n{"op": "add", "node": {"id"')
+
+    read_only = Journal(str(path), lambda: []).load(repair=False)
+    assert [n["id"] for n in read_only] == ["a"]
+    assert journal_path.read_bytes().endswith(b'{"id"')
+
+    repaired = Journal(str(path), lambda: []).load()
+    assert [n["id"] for n in repaired] == ["a"]
+    assert journal_path.read_bytes().endswith(b"}\n")
+
+
+def test_load_removes_stale_temp_files(tmp_path):
+    path = tmp_path / "memory.json"
+    stale = [tmp_path / "memory.json.tmp", tmp_path / "memory.json.journal.jsonl.tmp"]
+    for temp in stale:
+        temp.write_text("partial")
+
+    Journal(str(path), lambda: []).load(repair=False)
+    assert all(temp.exists() for temp in stale)
+
+    Journal(str(path), lambda: []).load()
+    assert not any(temp.exists() for temp in stale)
@@ -0,0 +1,81 @@
+import hashlib
+
+import numpy as np
+
+from knowledge_index import KnowledgeIndex
+
+
+class HashingEncoder:
+    """Deterministic stand-in for MiniLM that counts the texts it encodes."""
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.stack([
+            np.frombuffer(hashlib.sha256(text.encode("utf-8")).digest()[:self.dim], dtype=np.uint8).astype(np.float32)
+            - 127.5
+            for text in texts
+        ])
+
+
+def nodes(*pairs):
+    return [{"id": node_id, "text": text} for node_id, text in pairs]
+
+
+def test_sync_encodes_only_new_or_edited_text():
+    encoder = HashingEncoder()
+    index = KnowledgeIndex(encoder, initial_capacity=2)
+    index.sync(nodes(("a", "alpha"), ("b", "beta"), ("c", "gamma")))
+    assert encoder.encoded == ["alpha", "beta", "gamma"]
+
+    encoder.encoded.clear()
+    index.sync(nodes(("a", "alpha"), ("b", "beta, edited"), ("c", "gamma"), ("d", "delta")))
+
+    assert encoder.encoded == ["delta", "beta, edited"]
+    assert index.size == 4
+    assert index.text("b") == "beta, edited"
+
+
+def test_sync_removes_deleted_nodes_and_keeps_rows_consistent():
+    encoder = HashingEncoder()
+    index = KnowledgeIndex(encoder)
+    index.sync(nodes(("a", "alpha"), ("b", "beta"), ("c", "gamma"), ("d", "delta")))
+    gamma = index.vector("c")
+
+    encoder.encoded.clear()
+    index.sync(nodes(("a", "alpha"), ("c", "gamma")))
+
+    assert encoder.encoded == []
+    assert index.size == 2
+    assert index.ids == ["a", "c"]
+    assert index.rows == {"a": 0, "c": 1}
+    np.testing.assert_array_equal(index.vector("c"), gamma)
+    scores, ids = index.search(gamma, top_k=1)
+    assert ids == ["c"]
+    assert scores[0] > 0.999
+
+
+def test_remove_many_then_add_reuses_the_freed_rows():
+    encoder = HashingEncoder()
+    index = KnowledgeIndex(encoder, initial_capacity=4)
+    index.sync(nodes(("a", "alpha"), ("b", "beta"), ("c", "gamma"), ("d", "delta")))
+    index.remove_many(["a", "b"])
+    index.add({"id": "e", "text": "epsilon"})
+
+    assert index.capacity == 4
+    assert index.ids == ["c", "d", "e"]
+    _, ids = index.query("epsilon", top_k=1)
+    assert ids == ["e"]
+
+
+def test_search_threshold_and_empty_index():
+    index = KnowledgeIndex(HashingEncoder())
+    scores, ids = index.search(np.ones(16))
+    assert ids == [] and len(scores) == 0
+
+    index.sync(nodes(("a", "alpha"), ("b", "beta")))
+    scores, ids = index.query("alpha", top_k=5, threshold=0.999)
+    assert ids == ["a"]
@@ -0,0 +1,67 @@
+import asyncio
+
+from rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimiter, agent_lane, priority_lane
+
+
+def drained_limiter(requests_per_minute: float = 60000) -> RateLimiter:
+    """A limiter for provider "p" whose request bucket starts empty, so every caller queues."""
+    limiter = RateLimiter()
+    limiter.configure("p", requests_per_minute=requests_per_minute)
+    limiter._limit("p", "m").requests.tokens = 0
+    return limiter
+
+
+def served_order(limiter: RateLimiter, callers):
+    """Start every caller's acquire_async() at once and return their labels in the order they were let through."""
+    order = []
+
+    async def caller(label, priority, agent, weight):
+        with priority_lane(priority), agent_lane(agent, weight):
+            await limiter.acquire_async("p", "m")
+        order.append(label)
+
+    async def scenario():
+        await asyncio.gather(*(caller(*args) for args in callers))
+
+    asyncio.run(scenario())
+    return order
+
+
+def test_interactive_lane_goes_ahead_of_queued_background_work():
+    limiter = drained_limiter()
+    callers = [(f"background{i}", PRIORITY_BACKGROUND, "", 1.0) for i in range(3)]
+    callers += [(f"interactive{i}", PRIORITY_INTERACTIVE, "", 1.0) for i in range(2)]
+
+    order = served_order(limiter, callers)
+
+    assert order == ["interactive0", "interactive1", "background0", "background1", "background2"]
+
+
+def test_agents_share_a_queue_by_weight():
+    limiter = drained_limiter()
+    # agent a queues all of its requests first and has twice b's weight
+    callers = [(f"a{i}", PRIORITY_BACKGROUND, "a", 2.0) for i in range(6)]
+    callers += [(f"b{i}", PRIORITY_BACKGROUND, "b", 1.0) for i in range(3)]
+
+    order = served_order(limiter, callers)
+
+    assert [label[0] for label in order] == ["a", "b", "a", "a", "b", "a", "a", "b", "a"]
+    assert limiter.stats()["agents"]["a"]["acquired"] == 6
+    assert limiter.stats()["agents"]["b"]["acquired"] == 3
+
+
+def test_unconfigured_provider_is_not_limited():
+    limiter = RateLimiter()
+    assert limiter.acquire("router", "gemini:x,groq:y", tokens=1000) == 0.0
+    assert limiter.stats()["acquired"] == 0
+
+
+def test_record_tokens_corrects_a_reservation():
+    limiter = RateLimiter()
+    limiter.configure("p", requests_per_minute=60, tokens_per_minute=1000)
+    limiter.acquire("p", "m", tokens=600)
+    bucket = limiter._limit("p", "m").tokens
+    before = bucket.tokens
+    # the call used 200 tokens, not the 600 reserved
+    limiter.record_tokens("p", "m", 200 - 600)
+    assert bucket.tokens == before + 400
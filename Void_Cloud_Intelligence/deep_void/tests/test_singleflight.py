@@ -0,0 +1,77 @@
+import asyncio
+
+from singleflight import SingleFlight
+
+
+def test_follower_shares_leader_result():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            await release.wait()
+            return "answer"
+
+        leader = asyncio.ensure_future(flights.ado("key", generate))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.ado("key", generate))
+        await asyncio.sleep(0)
+        release.set()
+        return await leader, await follower, calls, flights.stats()
+
+    leader, follower, calls, stats = asyncio.run(scenario())
+    assert leader == ("answer", False)
+    assert follower == ("answer", True)
+    assert len(calls) == 1
+    assert stats == {"leaders": 1, "coalesced": 1, "retries": 0, "in_flight": 0}
+
+
+def test_cancelled_leader_hands_over_to_follower():
+    async def scenario():
+        flights = SingleFlight()
+        started = asyncio.Event()
+        calls = []
+
+        async def generate():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                await asyncio.sleep(60)
+            return "retried"
+
+        leader = asyncio.ensure_future(flights.ado("key", generate))
+        await started.wait()
+        follower = asyncio.ensure_future(flights.ado("key", generate))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await asyncio.wait_for(follower, 5)
+        return leader, result, calls, flights.stats()
+
+    leader, result, calls, stats = asyncio.run(scenario())
+    assert leader.cancelled()
+    # the follower does not inherit the cancellation; it sends the request itself
+    assert result == ("retried", False)
+    assert len(calls) == 2
+    assert stats == {"leaders": 2, "coalesced": 0, "retries": 1, "in_flight": 0}
+
+
+def test_leader_error_reaches_followers():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def generate():
+            await release.wait()
+            raise ValueError("provider down")
+
+        leader = asyncio.ensure_future(flights.ado("key", generate))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.ado("key", generate))
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+trace_view.py
+Summarizes the spans tracing.py writes to traces.jsonl into a flame-graph style breakdown.
+
+    python trace_view.py --list              # recent traces (one per life cycle / request)
+    python trace_view.py                     # tree for the latest trace
+    python trace_view.py --trace 3f2a9c      # tree for one trace (id prefix is enough)
+    python trace_view.py --all               # every trace merged by call path
+    python trace_view.py --all --folded > void.folded
+
+Spans with the same call path (life.cycle > intelligence > action > think, ...) are merged.
+"self" is a span's duration minus its children's, floored at zero because afan_out()/arun_dag()
+children run concurrently and can add up to more than their parent. --folded prints
+"path;to;span <self ms>" lines for flamegraph.pl, speedscope or inferno.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.append(os.path.join(HERE, "..", "void_shared"))
+
+from tracing import TRACE_FILE
+
+
+def load_spans(path: str):
+    spans = []
+    # the rotated file first, so a trace that straddles the rotation is read whole
+    for part in (path + ".1", path):
+        if not os.path.exists(part):
+            continue
+        with open(part, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash mid-write
+    return spans
+
+
+def group_traces(spans):
+    traces = defaultdict(list)
+    for record in spans:
+        traces[record["trace_id"]].append(record)
+    return traces
+
+
+def trace_root(records):
+    ids = {record["span_id"] for record in records}
+    roots = [record for record in records if record.get("parent_id") not in ids]
+    return min(roots, key=lambda record: record["start"])
+
+
+def span_tokens(record) -> int:
+    attrs = record.get("attrs", {})
+    return int(attrs.get("prompt_tokens") or 0) + int(attrs.get("completion_tokens") or 0)
+
+
+def aggregate(records):
+    """Merges spans by call path: {path tuple: {total, self, count, tokens, cache_hits, errors}}."""
+    by_id = {record["span_id"]: record for record in records}
+    child_seconds = defaultdict(float)
+    for record in records:
+        if record.get("parent_id") in by_id:
+            child_seconds[record["parent_id"]] += record["duration"]
+
+    paths = {}
+
+    def path_of(record):
+        key = record["span_id"]
+        if key not in paths:
+            parent = by_id.get(record.get("parent_id"))
+            paths[key] = (path_of(parent) if parent else ()) + (record["name"],)
+        return paths[key]
+
+    nodes = defaultdict(lambda: {"total": 0.0, "self": 0.0, "count": 0, "tokens": 0, "cache_hits": 0, "errors": 0})
+    for record in records:
+        node = nodes[path_of(record)]
+        node["total"] += record["duration"]
+        node["self"] += max(record["duration"] - child_seconds[record["span_id"]], 0.0)
+        node["count"] += 1
+        node["tokens"] += span_tokens(record)
+        node["cache_hits"] += 1 if record.get("attrs", {}).get("cache_hit") else 0
+        node["errors"] += 1 if record.get("error") or record.get("attrs", {}).get("error") else 0
+    return nodes
+
+
+def subtree_tokens(nodes, path) -> int:
+    return sum(node["tokens"] for key, node in nodes.items() if key[:len(path)] == path)
+
+
+def render_tree(nodes) -> str:
+    children = defaultdict(list)
+    for path in nodes:
+        children[path[:-1]].append(path)
+    root_total = sum(nodes[path]["total"] for path in children[()]) or 1.0
+
+    lines = [f"{'total s':>9} {'self s':>9} {'count':>6} {'%':>6} {'tokens':>9} {'hits':>5}  span"]
+
+    def walk(path, depth):
+        node = nodes[path]
+        lines.append(
+            f"{node['total']:9.3f} {node['self']:9.3f} {node['count']:6d} {100 * node['total'] / root_total:5.1f}% "
+            f"{subtree_tokens(nodes, path):9d} {node['cache_hits']:5d}  {'  ' * depth}{path[-1]}"
+            + (f"  [{node['errors']} errors]" if node["errors"] else "")
+        )
+        for child in sorted(children[path], key=lambda key: -nodes[key]["total"]):
+            walk(child, depth + 1)
+
+    for root in sorted(children[()], key=lambda key: -nodes[key]["total"]):
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+def render_folded(nodes) -> str:
+    lines = []
+    for path, node in sorted(nodes.items()):
+        self_ms = int(round(node["self"] * 1000))
+        if self_ms > 0:
+            lines.append(f"{';'.join(path)} {self_ms}")
+    return "\n".join(lines)
+
+
+def render_list(traces, limit: int) -> str:
+    rows = []
+    for trace_id, records in traces.items():
+        root = trace_root(records)
+        rows.append((root["start"], trace_id, root, records))
+    rows.sort(reverse=True)
+    lines = [f"{'started':<19} {'trace':<16} {'seconds':>9} {'spans':>6} {'tokens':>9}  root"]
+    for started, trace_id, root, records in rows[:limit]:
+        when = datetime.datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M:%S")
+        tokens = sum(span_tokens(record) for record in records)
+        lines.append(f"{when:<19} {trace_id:<16} {root['duration']:9.3f} {len(records):6d} {tokens:9d}  {root['name']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flame-graph style breakdown of traces.jsonl.")
+    parser.add_argument("--file", default=TRACE_FILE)
+    parser.add_argument("--list", action="store_true", help="list recent traces and exit")
+    parser.add_argument("--limit", type=int, default=20, help="rows shown by --list")
+    parser.add_argument("--trace", help="trace id (or prefix) to show; defaults to the latest")
+    parser.add_argument("--all", action="store_true", help="merge every trace in the file")
+    parser.add_argument("--folded", action="store_true", help="print folded stacks (self ms) instead of a tree")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        sys.exit(f"No trace file at {args.file} (set VOID_TRACE_FILE or pass --file).")
+    traces = group_traces(load_spans(args.file))
+    if not traces:
+        sys.exit(f"{args.file} has no spans yet.")
+
+    if args.list:
+        print(render_list(traces, args.limit))
+        return
+
+    if args.all:
+        records = [record for trace in traces.values() for record in trace]
+        heading = f"{len(traces)} traces, {len(records)} spans"
+    else:
+        if args.trace:
+            matches = [trace_id for trace_id in traces if trace_id.startswith(args.trace)]
+            if len(matches) != 1:
+                sys.exit(f"{len(matches)} traces match '{args.trace}'.")
+            trace_id = matches[0]
+        else:
+            trace_id = max(traces, key=lambda key: trace_root(traces[key])["start"])
+        records = traces[trace_id]
+        heading = f"trace {trace_id}: {trace_root(records)['name']}, {len(records)} spans"
+
+    nodes = aggregate(records)
+    if args.folded:
+        print(render_folded(nodes))
+    else:
+        print(heading)
+        print(render_tree(nodes))
+
+
+if __name__ == "__main__":
+    main()
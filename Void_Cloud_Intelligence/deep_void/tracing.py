@@ -0,0 +1,117 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+import uuid
+from jsonl_log import JsonlLog
+
+# Lightweight hierarchical tracing.
+#
+#     with span("thought", intent=intent) as s:
+#         ...
+#         s.set(nodes=len(nodes))
+#
+# Spans nest through a contextvar, so a span opened inside another becomes its child, including
+# in afan_out()/arun_dag() tasks (asyncio runs each task in a copy of the caller's context). Every finished
+# span is appended to TRACE_FILE as one JSON line: trace/span/parent ids, name, wall-clock start,
+# duration and attributes (tokens, cache hits, ...). Spans go through a jsonl_log.JsonlLog, so
+# they are written by a background thread and the file rotates to TRACE_FILE + ".1" at
+# TRACE_FILE_MAX_BYTES. trace_view.py turns the files into a flame-graph style breakdown.
+# VOID_TRACING=0 turns spans into no-ops.
+
+TRACE_FILE = os.getenv("VOID_TRACE_FILE", "traces.jsonl")
+TRACE_FILE_MAX_BYTES = int(os.getenv("VOID_TRACE_FILE_MAX_BYTES", "52428800"))
+TRACING_ENABLED = os.getenv("VOID_TRACING", "1") != "0"
+
+_current: contextvars.ContextVar = contextvars.ContextVar("void_span", default=None)
+_log = JsonlLog(TRACE_FILE, TRACE_FILE_MAX_BYTES, name="trace-log")
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "started", "attrs")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: float = 1):
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+
+class _NoSpan:
+    """Stands in when tracing is off or nothing is open, so callers never need to check."""
+
+    def set(self, **attrs):
+        pass
+
+    def add(self, key: str, amount: float = 1):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def current_span():
+    return _current.get() or _NO_SPAN
+
+
+@contextmanager
+def span(name: str, **attrs):
+    if not TRACING_ENABLED:
+        yield _NO_SPAN
+        return
+    current = Span(name, _current.get(), attrs)
+    token = _current.set(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = repr(e)
+        raise
+    finally:
+        _current.reset(token)
+        record = {
+            "trace_id": current.trace_id,
+            "span_id": current.span_id,
+            "parent_id": current.parent_id,
+            "name": current.name,
+            "start": current.start,
+            "duration": time.perf_counter() - current.started,
+            "thread": threading.current_thread().name,
+            "attrs": current.attrs,
+        }
+        if error:
+            record["error"] = error
+        _log.append(record)
+
+
+def traced(name: str = None):
+    """Decorator form of span() for plain and coroutine functions; named after the function unless `name` is given."""
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
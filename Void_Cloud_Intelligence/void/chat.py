@@ -6,6 +6,12 @@ from dotenv import load_dotenv
 import json
 from datetime import datetime
 from fastapi.middleware.cors import CORSMiddleware
+import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
+import llm_clients
 
 
 
@@ -54,11 +60,6 @@ conversation_history = [
 
 @app.post("/chat")
 def chat(input: ChatInput):
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
     conversation_history.append({"role": "user", "content": input.prompt})
 
     data = {
@@ -70,7 +71,7 @@ def chat(input: ChatInput):
 
     print("Sending to Groq:", data)
 
-    response = requests.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=data)
+    response = llm_clients.post_chat("groq", data, GROQ_API_KEY, GROQ_API_URL)
 
     if response.status_code != 200:
         print("Groq error:", response.status_code, response.text)
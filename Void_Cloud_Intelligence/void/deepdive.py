@@ -6,7 +6,15 @@ from dotenv import load_dotenv
 import logging
 from supabase import create_client, Client
 from collections import namedtuple
+import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
 from memory import store_session
+import llm_clients
+import llm_backends
+from embedding_cache import shared_model
 import time
 
 
@@ -16,6 +24,9 @@ load_dotenv()
 
 TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 TOGETHER_API_URL = "https://api.together.ai/v1/chat/completions"
+
+# "provider[:model]", or a comma-separated priority list with failover/hedging (see llm_backends.py)
+report_backend = llm_backends.build_backend(os.getenv("VOID_REPORT_BACKEND", "together"))
 TWITTER_DEV_TOKEN = os.getenv("TWITTER_DEV_TOKEN")
 
 SUPABASE_URL= os.getenv('SUPABASE_URL')
@@ -27,7 +38,7 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 client = tweepy.Client(bearer_token=TWITTER_DEV_TOKEN)
 
 # Load lightweight sentence transformer model
-model = SentenceTransformer('all-MiniLM-L6-v2')
+model = shared_model('all-MiniLM-L6-v2')
 
 print(f"TWITTER_DEV_TOKEN: {os.getenv('TWITTER_DEV_TOKEN')}")
 
@@ -65,35 +76,23 @@ def analyze_relevance(tweet_text):
 def generate_report(tweet_text, tweet_id):
     try:
         print(f"[REPORTING] Generating report for tweet ID {tweet_id}")
-        headers = {
-            "Authorization": f"Bearer {TOGETHER_API_KEY}",
-            "Content-Type": "application/json"
-        }
 
         prompt = f"Summarize why the following tweet is a potential job lead for an AI embedded systems expert:\n\n{tweet_text}\n\nSummary:"
 
-        data = {
-            "model": "meta-llama/Llama-3-70b-chat-hf",
-            "messages": [
-                {"role": "system", "content": "You are an assistant that identifies job opportunities for AI embedded systems engineers."},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 150,
-            "temperature": 0.7
-        }
-
-        response = requests.post(TOGETHER_API_URL, headers=headers, json=data)
-        print(f"[REPORTING] Together AI status: {response.status_code}")
-
-        if not response.ok:
-            print("TogetherAI error:", response.status_code, response.text)
-            return "[Error generating summary]"
-
-        result = response.json()
-        content = result["choices"][0]["message"]["content"].strip()
+        content, _ = llm_backends.call(
+            report_backend,
+            prompt,
+            system="You are an assistant that identifies job opportunities for AI embedded systems engineers.",
+            max_tokens=150,
+            stage="report",
+        )
         print(f"[REPORTING] Report content: {content[:100]}...")  # preview first 100 chars
         return content
 
+    except llm_backends.ProviderError as e:
+        print(f"[ERROR] Report provider error for tweet ID {tweet_id}: {e}")
+        return "[Error generating summary]"
+
     except Exception as e:
         print(f"[ERROR] Report generation failed for tweet ID {tweet_id}: {e}")
         return "Report generation failed."
@@ -19,12 +19,19 @@ from noises import run_noises
 from routes.chat import chat_router 
 import threading
 import time
+import sys
+
+# llm_backends, llm_clients, rate_limiter, metrics and embedding_cache are shared by every service from ../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "void_shared"))
+
 from deepdive import deepdive_main_loop
 from nicegui import ui
 from nicegui_app import router
 from auto import auto_router
 from google import genai
 from google.genai import types
+import llm_clients
+import llm_backends
 
 load_dotenv() 
 
@@ -71,6 +78,10 @@ app.add_middleware(
 
 TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 TOGETHER_API_URL = "https://api.together.ai/v1/chat/completions"
+
+# chat routes answer from these backends in priority order, e.g. "gemini:gemini-2.5-flash,groq"
+# with LLM_HEDGE=1 to race a slow primary against the next one (see llm_backends.py)
+chat_backend = llm_backends.build_backend(os.getenv("VOID_CHAT_BACKENDS", "gemini:gemini-2.5-flash"))
 LOG_FILE = "token_log.jsonl"
 
 SCOMATON_PASSWORD = os.getenv("SCOMATON_PASSWORD")
@@ -255,30 +266,18 @@ def call_webtrix_expert(prompt: str, max_tokens: int, user_id: str):
 
 
 def call_chat_model(system_prompt: str, prompt: str, max_tokens: int):
-    client = genai.Client()
-    
-    sys_prompt = system_prompt
-    user_prompt = prompt
-    
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=sys_prompt + user_prompt
-        )
-
-        return response.text
+        # as before the backends: one prompt (system text first) and no max_tokens, which would
+        # otherwise cut Groq/Together fallback replies short
+        ai_response, _ = llm_backends.call(chat_backend, system_prompt + prompt, stage="chat")
+        return ai_response
 
     except Exception as e:
-        print(f"Gemini API error: {e}")
+        print(f"Chat model error: {e}")
         return None
     
 
 def call_old_chat_model(system_prompt: str, prompt: str, max_tokens: int):
-    headers = {
-        "Authorization": f"Bearer {TOGETHER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
     conversation_history = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": prompt}
@@ -292,7 +291,7 @@ def call_old_chat_model(system_prompt: str, prompt: str, max_tokens: int):
     }
 
     print("Sending to TogetherAI:", data)
-    response = requests.post(TOGETHER_API_URL, headers=headers, json=data)
+    response = llm_clients.post_chat("together", data, TOGETHER_API_KEY, TOGETHER_API_URL)
 
     if response.status_code != 200:
         print("TogetherAI error:", response.status_code, response.text)
@@ -307,11 +306,6 @@ def call_old_chat_model(system_prompt: str, prompt: str, max_tokens: int):
 
 
 def call_saving_chat_model(system_prompt: str, prompt: str, max_tokens: int, tag: str, user_id: str):
-    headers = {
-        "Authorization": f"Bearer {TOGETHER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
     history = get_recent_messages(tag, user_id, limit=10)  
 
     conversation_history = [{"role": "system", "content": system_prompt}]
@@ -329,7 +323,7 @@ def call_saving_chat_model(system_prompt: str, prompt: str, max_tokens: int, tag
     }
 
     print("Sending to TogetherAI:", data)
-    response = requests.post(TOGETHER_API_URL, headers=headers, json=data)
+    response = llm_clients.post_chat("together", data, TOGETHER_API_KEY, TOGETHER_API_URL)
 
     if not response.ok:
         print("TogetherAI error:", response.status_code, response.text)
@@ -350,6 +344,16 @@ async def ok_check():
     return JSONResponse(content={"ok": True})
 
 
+@app.get("/llm-stats")
+async def llm_stats():
+    return JSONResponse(content=llm_clients.stats())
+
+@app.get("/llm-backend-stats")
+async def llm_backend_stats():
+    # per-backend wins/errors/latency and hedge counts; empty for a single backend
+    return JSONResponse(content=chat_backend.stats() if hasattr(chat_backend, "stats") else {})
+
+
 @app.get('/noisesauto')
 def noises_auto():
     run_noises()
@@ -1,12 +1,12 @@
 # memory.py
 import chromadb
-from sentence_transformers import SentenceTransformer
+from embedding_cache import shared_model
 
 # Correct new-style Chroma client
 client = chromadb.PersistentClient(path="./chroma_db")
 collection = client.get_or_create_collection(name="agent_memory_sessions")
 
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+embedding_model = shared_model('all-MiniLM-L6-v2')
 
 def embed_text(text):
     return embedding_model.encode(text).tolist()
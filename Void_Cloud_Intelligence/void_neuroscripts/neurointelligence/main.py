@@ -1,5 +1,11 @@
 import neurokit2 as nk
-from sentence_transformers import SentenceTransformer
+import os
+import sys
+
+# embedding_cache is shared by every service from ../../void_shared
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "void_shared"))
+
+from embedding_cache import shared_model
 import chromadb
 from chromadb.config import Settings
 from huggingface_hub import login
@@ -23,7 +29,7 @@ client = chromadb.PersistentClient(path="./chroma_db")
 collection = client.get_or_create_collection(name="neuro_sessions")
 
 # Load embedding model
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+embedding_model = shared_model('all-MiniLM-L6-v2')
 
 
 #Load large model
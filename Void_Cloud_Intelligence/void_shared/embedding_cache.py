@@ -0,0 +1,270 @@
+from typing import List, Dict, Optional
+import hashlib
+import os
+import threading
+import numpy as np
+
+# Persistent embedding cache shared by every MiniLM call site in the Void.
+#
+# Layout per model in the cache directory:
+#   <model>.f32  append-only float32 vectors, one row per cached text, memory-mapped for reads
+#   <model>.idx  append-only index, a "dim <n>" header then one "<text hash> <row>" line per vector
+#   <model>.lock cross-process lock taken while appending
+#
+# The directory defaults to ~/.void/embedding_cache so separate services (deep_void, void,
+# neurointelligence) reuse each other's vectors. Override with VOID_EMBEDDING_CACHE. This module
+# lives in void_shared/ so every service imports the same implementation.
+#
+# Both files only grow, so the vectors file is capped at VOID_EMBEDDING_CACHE_MAX_BYTES. An append
+# that would pass the cap starts the model's cache over: fresh, empty files replace the old ones
+# and the texts being added become its first rows. Other processes notice the new index file (by
+# inode) on their next lookup and drop the rows they had read. Deleting the directory while no
+# service is running resets it by hand.
+
+try:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+CACHE_DIR = os.getenv("VOID_EMBEDDING_CACHE", os.path.join(os.path.expanduser("~"), ".void", "embedding_cache"))
+MAX_BYTES = int(os.getenv("VOID_EMBEDDING_CACHE_MAX_BYTES", "536870912"))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, directory: str = None, max_bytes: int = MAX_BYTES):
+        directory = directory or CACHE_DIR
+        os.makedirs(directory, exist_ok=True)
+        safe_name = model_name.replace("/", "__")
+        self.vectors_path = os.path.join(directory, safe_name + ".f32")
+        self.index_path = os.path.join(directory, safe_name + ".idx")
+        self.lock_path = os.path.join(directory, safe_name + ".lock")
+        self.max_bytes = max_bytes
+
+        self.dim: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self.index_offset = 0
+        # inode of the index file the rows were read from; a different one means the cache was reset
+        self.index_inode = None
+        self.vectors = None
+        self.mapped_rows = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+
+        with self.lock:
+            self._refresh_index()
+
+    def _forget(self):
+        self.dim = None
+        self.rows = {}
+        self.index_offset = 0
+        self.index_inode = None
+        self.vectors = None
+        self.mapped_rows = 0
+
+    def _refresh_index(self):
+        """Read index lines appended (by this or any other process) since the last refresh."""
+        if not os.path.exists(self.index_path):
+            self._forget()
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self.index_inode:
+                self._forget()
+                self.index_inode = inode
+            f.seek(self.index_offset)
+            while True:
+                line = f.readline()
+                if not line.endswith("\n"):
+                    break  # partial line still being written, pick it up next time
+                self.index_offset = f.tell()
+                key, value = line.split()
+                if key == "dim":
+                    self.dim = int(value)
+                else:
+                    self.rows[key] = int(value)
+
+    def _remap(self, needed_row: int):
+        if self.vectors is not None and needed_row < self.mapped_rows:
+            return
+        row_bytes = self.dim * 4
+        total_rows = os.path.getsize(self.vectors_path) // row_bytes
+        if total_rows == 0:
+            return
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(total_rows, self.dim))
+        self.mapped_rows = total_rows
+
+    def _current(self) -> bool:
+        try:
+            return os.stat(self.index_path).st_ino == self.index_inode
+        except FileNotFoundError:
+            return self.index_inode is None
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        with self.lock:
+            if any(key not in self.rows for key in keys) or not self._current():
+                self._refresh_index()
+            found = [self.rows.get(key) for key in keys]
+            if self.dim is None:
+                return [None] * len(keys)
+            wanted = [row for row in found if row is not None]
+            if wanted:
+                self._remap(max(wanted))
+            results = []
+            for row in found:
+                # a row past the mapped file belongs to a cache reset midway through this read
+                missing = row is None or row >= self.mapped_rows
+                results.append(None if missing else np.array(self.vectors[row]))
+            return results
+
+    def _reset(self):
+        """Replace both files with empty ones; called with the cross-process lock held."""
+        try:
+            for path, header in ((self.vectors_path, b""), (self.index_path, f"dim {self.dim}\n".encode("utf-8"))):
+                with open(path + ".tmp", "wb") as f:
+                    f.write(header)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(path + ".tmp", path)
+        except OSError as e:
+            # e.g. Windows refuses to replace a file another process has mapped; keep appending
+            print(f"[WARN] Could not reset embedding cache {self.vectors_path}: {e}")
+            return
+        self.resets += 1
+        print(f"[INFO] Embedding cache {self.vectors_path} reached {self.max_bytes} bytes and was reset")
+        self._refresh_index()
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self.lock, open(self.lock_path, "a+b") as lock_f:
+            _lock_file(lock_f)
+            try:
+                self._refresh_index()
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                    with open(self.index_path, "a", encoding="utf-8") as f:
+                        f.write(f"dim {self.dim}\n")
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dim {vectors.shape[1]} does not match cache dim {self.dim}")
+
+                pending = {}
+                for key, vector in zip(keys, vectors):
+                    if key not in self.rows and key not in pending:
+                        pending[key] = vector
+                if not pending:
+                    return
+
+                row_bytes = self.dim * 4
+                size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+                if self.max_bytes and size and size + len(pending) * row_bytes > self.max_bytes:
+                    self._reset()
+                with open(self.vectors_path, "ab") as f:
+                    size = f.seek(0, os.SEEK_END)
+                    first_row = size // row_bytes
+                    if size % row_bytes:
+                        # a writer died mid-row; drop the torn tail before appending
+                        f.truncate(first_row * row_bytes)
+                    f.write(np.stack(list(pending.values())).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                lines = []
+                for offset, key in enumerate(pending):
+                    lines.append(f"{key} {first_row + offset}\n")
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    f.flush()
+                self._refresh_index()
+            finally:
+                _unlock_file(lock_f)
+
+
+class CachedSentenceTransformer:
+    """
+    Drop-in for SentenceTransformer.encode() backed by EmbeddingCache.
+    The transformer itself is only loaded the first time a text misses the cache.
+    Calls that pass extra encode() options are not cached since they change the vectors.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = None):
+        self.model_name = model_name
+        self.cache = EmbeddingCache(model_name, cache_dir)
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, sentences, convert_to_tensor: bool = False, convert_to_numpy: bool = True, **kwargs):
+        if kwargs:
+            return self.model.encode(sentences, convert_to_tensor=convert_to_tensor, convert_to_numpy=convert_to_numpy, **kwargs)
+
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        keys = [text_hash(t) for t in texts]
+
+        vectors = self.cache.get_many(keys)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        self.cache.hits += len(texts) - len(missing)
+        self.cache.misses += len(missing)
+
+        if missing:
+            unique = {}
+            for i in missing:
+                unique.setdefault(keys[i], texts[i])
+            encoded = self.model.encode(list(unique.values()), convert_to_numpy=True)
+            encoded = np.asarray(encoded, dtype=np.float32)
+            self.cache.put_many(list(unique.keys()), encoded)
+            by_key = dict(zip(unique.keys(), encoded))
+            for i in missing:
+                vectors[i] = by_key[keys[i]]
+
+        if not texts:
+            result = np.zeros((0, self.cache.dim or 0), dtype=np.float32)
+        else:
+            result = np.stack(vectors)
+        if single:
+            result = result[0]
+
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(np.array(result))
+        return result
+
+
+_shared_models: Dict[str, CachedSentenceTransformer] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_model(model_name: str) -> CachedSentenceTransformer:
+    """One CachedSentenceTransformer per model name per process, so call sites share the loaded weights."""
+    with _shared_lock:
+        if model_name not in _shared_models:
+            _shared_models[model_name] = CachedSentenceTransformer(model_name)
+        return _shared_models[model_name]
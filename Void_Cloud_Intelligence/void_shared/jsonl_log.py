@@ -0,0 +1,60 @@
+from typing import Any, Dict, List
+import atexit
+import json
+import os
+import threading
+import time
+
+# Buffered, size-capped JSON-lines logs (prompt token log, trace spans, metrics rollups).
+#
+# append() only adds the record to an in-memory buffer. A daemon thread serializes and appends
+# the buffer every flush_seconds (and once more at exit), so callers on the pipeline loop or
+# holding their own locks never wait on the disk. Before a flush, a file that has reached
+# max_bytes is moved to path + ".1" (replacing the previous one) and a new file is started, so a
+# log never takes much more than twice max_bytes. An empty path turns the log off.
+
+FLUSH_SECONDS = float(os.getenv("VOID_LOG_FLUSH_SECONDS", "2"))
+
+
+class JsonlLog:
+    def __init__(self, path: str, max_bytes: int, flush_seconds: float = FLUSH_SECONDS, name: str = "jsonl-log"):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_seconds = flush_seconds
+        self.name = name
+        self.lock = threading.Lock()
+        # serializes flushes (background thread, atexit) without holding up append()
+        self.file_lock = threading.Lock()
+        self.pending: List[Dict[str, Any]] = []
+        self.flusher = None
+
+    def append(self, record: Dict[str, Any]):
+        if not self.path:
+            return
+        with self.lock:
+            self.pending.append(record)
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self._flush_loop, name=self.name, daemon=True)
+                self.flusher.start()
+                atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        """Append buffered records, rotating the file first if it has reached max_bytes."""
+        with self.lock:
+            records, self.pending = self.pending, []
+        if not records:
+            return
+        lines = [json.dumps(record, default=str) + "\n" for record in records]
+        with self.file_lock:
+            try:
+                if self.max_bytes and os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+            except OSError as e:
+                print(f"[WARN] Could not write {self.path}: {e}")
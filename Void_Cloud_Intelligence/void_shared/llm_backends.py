@@ -0,0 +1,617 @@
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import AsyncIterator, List, Optional, Tuple
+import asyncio
+import contextvars
+import hashlib
+import os
+import threading
+import time
+import llm_clients
+from metrics import metrics
+from rate_limiter import limiter
+
+# Text-generation backends shared by think(), call_chat_model() and generate_report().
+#
+# A backend exposes provider/model names (used for rate limits, prompt cache keys and stats),
+# generate(contents, cached_content, system, max_tokens) -> (text, usage), its coroutine form
+# agenerate(), and astream(...) -> async iterator of (text, usage) for streamed answers. Remote
+# providers use async HTTP clients in the coroutines; local models run in a worker thread.
+# usage follows Gemini's usage_metadata field names, so callers read it the same way for every
+# backend. supports_prefix_cache says whether Gemini cached_content handles can be passed.
+#
+# Backends are described by specs, "provider[:model]", and a comma-separated list of specs is a
+# priority order served by a BackendRouter: the first backend answers unless it fails, and with
+# hedging on, a slow request (past the primary's p95 latency, or LLM_HEDGE_DELAY seconds) is
+# raced against the next backend and the first answer wins.
+#
+#   VOID_LLM_BACKEND=gemini                      think() on Gemini (default)
+#   VOID_LLM_BACKEND=stub                        deterministic offline stub (bench_pipeline.py)
+#   VOID_LLM_BACKEND=gemini,groq LLM_HEDGE=1     Gemini first, Groq as failover and hedge
+#
+# This module, llm_clients, rate_limiter and metrics live in void_shared/, which every service
+# puts on sys.path, so all of them share one implementation, rate limits and metrics included.
+
+Usage = namedtuple("Usage", ["prompt_token_count", "candidates_token_count", "total_token_count",
+                             "cached_content_token_count"], defaults=(0,))
+
+GEMINI_MODEL = "gemini-2.5-flash-lite"
+
+DEFAULT_MODELS = {
+    "gemini": GEMINI_MODEL,
+    "together": "meta-llama/Llama-3-70b-chat-hf",
+    "groq": "llama3-70b-8192",
+    "llama": os.getenv("LLAMA_MODEL_PATH", os.path.join("llama.cpp", "models", "mistral-7b-instruct-v0.1.Q4_K_M.gguf")),
+    "hf": "EleutherAI/pythia-410m",
+    "stub": "stub",
+}
+API_KEY_ENV = {
+    "together": "TOGETHER_API_KEY",
+    "groq": "GROQ_API_KEY",
+}
+
+DEFAULT_MAX_TOKENS = 1000
+
+STUB_LATENCY = float(os.getenv("VOID_STUB_LATENCY", "0.05"))
+STUB_TOKENS = int(os.getenv("VOID_STUB_TOKENS", "200"))
+STUB_CHUNKS = int(os.getenv("VOID_STUB_CHUNKS", "8"))
+
+HEDGE_ENABLED = os.getenv("LLM_HEDGE", "0") == "1"
+# seconds before a hedge fires; "p95" uses the primary's recent p95 latency
+HEDGE_DELAY = os.getenv("LLM_HEDGE_DELAY", "p95")
+# used for the p95 policy until the primary has HEDGE_MIN_SAMPLES latencies on record
+HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "8"))
+HEDGE_MIN_SAMPLES = 20
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // 4
+
+
+class ProviderError(RuntimeError):
+    """The provider answered with a non-OK HTTP status."""
+
+    def __init__(self, provider: str, status_code: int, text: str):
+        super().__init__(f"{provider} error {status_code}: {text}")
+        self.provider = provider
+        self.status_code = status_code
+
+
+class GeminiBackend:
+    provider = "gemini"
+    supports_prefix_cache = True
+
+    def __init__(self, model: str = GEMINI_MODEL):
+        self.model = model
+
+    def client(self):
+        return llm_clients.gemini_client()
+
+    def _config(self, cached_content):
+        if not cached_content:
+            return None
+        from google.genai import types
+        return types.GenerateContentConfig(cached_content=cached_content)
+
+    # max_tokens is not applied: Gemini answers are left at the model's own length, as before
+    def generate(self, contents: str, cached_content: str = None, system: str = '',
+                 max_tokens: int = None) -> Tuple[str, object]:
+        started = time.perf_counter()
+        try:
+            response = self.client().models.generate_content(model=self.model, contents=system + contents,
+                                                             config=self._config(cached_content))
+        finally:
+            # counted where the request is sent, as post_chat() does for Together and Groq
+            llm_clients.record_request(self.provider, time.perf_counter() - started)
+        return response.text, getattr(response, "usage_metadata", None)
+
+    async def agenerate(self, contents: str, cached_content: str = None, system: str = '',
+                        max_tokens: int = None) -> Tuple[str, object]:
+        started = time.perf_counter()
+        try:
+            response = await self.client().aio.models.generate_content(model=self.model, contents=system + contents,
+                                                                       config=self._config(cached_content))
+        finally:
+            llm_clients.record_request(self.provider, time.perf_counter() - started)
+        return response.text, getattr(response, "usage_metadata", None)
+
+    async def astream(self, contents: str, cached_content: str = None, system: str = '',
+                      max_tokens: int = None) -> AsyncIterator[Tuple[str, object]]:
+        started = time.perf_counter()
+        try:
+            chunks = await self.client().aio.models.generate_content_stream(model=self.model, contents=system + contents,
+                                                                            config=self._config(cached_content))
+            async for chunk in chunks:
+                yield chunk.text, getattr(chunk, "usage_metadata", None)
+        finally:
+            llm_clients.record_request(self.provider, time.perf_counter() - started)
+
+
+class ChatCompletionsBackend:
+    """OpenAI-style chat completions over the pooled sessions in llm_clients (Together, Groq)."""
+    supports_prefix_cache = False
+
+    def __init__(self, provider: str, model: str = None, temperature: float = 0.7):
+        self.provider = provider
+        self.model = model or DEFAULT_MODELS[provider]
+        self.temperature = temperature
+
+    def _payload(self, contents: str, system: str, max_tokens: int) -> dict:
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": contents})
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens or DEFAULT_MAX_TOKENS,
+            "temperature": self.temperature,
+        }
+
+    def _parse(self, response) -> Tuple[str, Usage]:
+        if response.status_code != 200:
+            raise ProviderError(self.provider, response.status_code, response.text)
+        result = response.json()
+        usage = result.get("usage", {})
+        return result["choices"][0]["message"]["content"].strip(), Usage(
+            usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), usage.get("total_tokens", 0))
+
+    def generate(self, contents: str, cached_content: str = None, system: str = '',
+                 max_tokens: int = None) -> Tuple[str, Usage]:
+        return self._parse(llm_clients.post_chat(self.provider, self._payload(contents, system, max_tokens),
+                                                 os.getenv(API_KEY_ENV[self.provider])))
+
+    async def agenerate(self, contents: str, cached_content: str = None, system: str = '',
+                        max_tokens: int = None) -> Tuple[str, Usage]:
+        return self._parse(await llm_clients.apost_chat(self.provider, self._payload(contents, system, max_tokens),
+                                                        os.getenv(API_KEY_ENV[self.provider])))
+
+    async def astream(self, contents: str, cached_content: str = None, system: str = '',
+                      max_tokens: int = None) -> AsyncIterator[Tuple[str, Usage]]:
+        yield await self.agenerate(contents, system=system, max_tokens=max_tokens)
+
+
+class LlamaCppBackend:
+    """Local GGUF model through llama-cpp-python, loaded on first use."""
+    provider = "llama"
+    supports_prefix_cache = False
+
+    def __init__(self, model: str = None, llm=None, n_ctx: int = 5000):
+        self.model = model or DEFAULT_MODELS["llama"]
+        self.n_ctx = n_ctx
+        self._llm = llm
+        # llama.cpp contexts are not thread-safe
+        self.lock = threading.Lock()
+
+    def llm(self):
+        if self._llm is None:
+            from llama_cpp import Llama
+            self._llm = Llama(model_path=self.model, n_ctx=self.n_ctx, verbose=False)
+        return self._llm
+
+    def generate(self, contents: str, cached_content: str = None, system: str = '',
+                 max_tokens: int = None) -> Tuple[str, Usage]:
+        with self.lock:
+            response = self.llm()(prompt=system + contents, max_tokens=max_tokens or DEFAULT_MAX_TOKENS)
+        usage = response.get("usage", {})
+        return response['choices'][0]['text'].strip(), Usage(
+            usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), usage.get("total_tokens", 0))
+
+    async def agenerate(self, contents: str, cached_content: str = None, system: str = '',
+                        max_tokens: int = None) -> Tuple[str, Usage]:
+        # local inference is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self.generate, contents, system=system, max_tokens=max_tokens)
+
+    async def astream(self, contents: str, cached_content: str = None, system: str = '',
+                      max_tokens: int = None) -> AsyncIterator[Tuple[str, Usage]]:
+        yield await self.agenerate(contents, system=system, max_tokens=max_tokens)
+
+
+class HFBackend:
+    """Local Hugging Face causal LM (pythia by default), loaded on first use."""
+    provider = "hf"
+    supports_prefix_cache = False
+
+    def __init__(self, model: str = None):
+        self.model = model or DEFAULT_MODELS["hf"]
+        self._loaded = None
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self._loaded is None:
+            import torch
+            from transformers import AutoTokenizer, AutoModelForCausalLM
+            tokenizer = AutoTokenizer.from_pretrained(self.model)
+            model = AutoModelForCausalLM.from_pretrained(self.model, device_map="cpu", torch_dtype=torch.bfloat16)
+            self._loaded = (tokenizer, model)
+        return self._loaded
+
+    def generate(self, contents: str, cached_content: str = None, system: str = '',
+                 max_tokens: int = None) -> Tuple[str, Usage]:
+        with self.lock:
+            tokenizer, model = self._load()
+            inputs = tokenizer(system + contents, return_tensors="pt").to(model.device)
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=max_tokens or 500,
+                do_sample=True,
+                top_p=0.9,
+                temperature=0.2,
+                repetition_penalty=1.2,
+            )
+        prompt_tokens = inputs['input_ids'].size(1)
+        generated_tokens = outputs[0][prompt_tokens:]
+        text = tokenizer.decode(generated_tokens, skip_special_tokens=True)
+        return text, Usage(prompt_tokens, len(generated_tokens), prompt_tokens + len(generated_tokens))
+
+    async def agenerate(self, contents: str, cached_content: str = None, system: str = '',
+                        max_tokens: int = None) -> Tuple[str, Usage]:
+        # local inference is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self.generate, contents, system=system, max_tokens=max_tokens)
+
+    async def astream(self, contents: str, cached_content: str = None, system: str = '',
+                      max_tokens: int = None) -> AsyncIterator[Tuple[str, Usage]]:
+        yield await self.agenerate(contents, system=system, max_tokens=max_tokens)
+
+
+# canned sentences the stub stitches together; picked by prompt hash so output is repeatable
+_STUB_SENTENCES = [
+    "The next step is to chat with the Developer about the bridge layer between the systems.",
+    "A reasoned comparison of the embedded and hosted approaches favours a modular Python core.",
+    "Knowledge synthesis suggests grounding the interface in existing hardware first.",
+    "The plan should be evaluated against latency, cost and long-term maintainability.",
+    "Further analysis of neuronic interface patterns would strengthen the current strategy.",
+]
+
+
+class StubBackend:
+    provider = "stub"
+    supports_prefix_cache = False
+
+    def __init__(self, latency: float = STUB_LATENCY, tokens: int = STUB_TOKENS, chunks: int = STUB_CHUNKS,
+                 model: str = "stub"):
+        self.latency = latency
+        self.tokens = tokens
+        self.chunks = max(chunks, 1)
+        self.model = model
+
+    def respond(self, contents: str) -> str:
+        digest = hashlib.blake2b(contents.encode("utf-8"), digest_size=8).digest()
+        sentences = []
+        i = 0
+        # roughly `tokens` tokens at 4 characters each
+        while sum(len(s) + 1 for s in sentences) < self.tokens * 4:
+            sentences.append(_STUB_SENTENCES[(digest[i % len(digest)] + i) % len(_STUB_SENTENCES)])
+            i += 1
+        return " ".join(sentences)
+
+    def _usage(self, contents: str, text: str) -> Usage:
+        prompt_tokens, completion_tokens = estimate_tokens(contents), estimate_tokens(text)
+        return Usage(prompt_tokens, completion_tokens, prompt_tokens + completion_tokens)
+
+    def generate(self, contents: str, cached_content: str = None, system: str = '',
+                 max_tokens: int = None) -> Tuple[str, Usage]:
+        time.sleep(self.latency)
+        text = self.respond(system + contents)
+        return text, self._usage(system + contents, text)
+
+    async def agenerate(self, contents: str, cached_content: str = None, system: str = '',
+                        max_tokens: int = None) -> Tuple[str, Usage]:
+        await asyncio.sleep(self.latency)
+        text = self.respond(system + contents)
+        return text, self._usage(system + contents, text)
+
+    async def astream(self, contents: str, cached_content: str = None, system: str = '',
+                      max_tokens: int = None) -> AsyncIterator[Tuple[str, Optional[Usage]]]:
+        text = self.respond(system + contents)
+        size = -(-len(text) // self.chunks)
+        for i in range(self.chunks):
+            await asyncio.sleep(self.latency / self.chunks)
+            part = text[i * size:(i + 1) * size]
+            yield part, (self._usage(system + contents, text) if i == self.chunks - 1 else None)
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "together": lambda model=None: ChatCompletionsBackend("together", model),
+    "groq": lambda model=None: ChatCompletionsBackend("groq", model),
+    "llama": LlamaCppBackend,
+    "hf": HFBackend,
+    "stub": StubBackend,
+}
+
+
+def routed(backend) -> bool:
+    """A BackendRouter is not rate limited itself; each attempt, hedges included, is charged to its backend."""
+    return isinstance(backend, BackendRouter)
+
+
+def _record(backend, stage, prompt_tokens, reserved_tokens, text, usage, latency, waited, error):
+    # llm_clients.stats() counts the request where it is sent (post_chat(), GeminiBackend)
+    if usage is not None and usage.total_token_count and not routed(backend):
+        limiter.record_tokens(backend.provider, backend.model, usage.total_token_count - reserved_tokens)
+    if stage is not None:
+        if usage is not None and usage.total_token_count:
+            prompt_tokens = usage.prompt_token_count or 0
+        completion_tokens = (usage.candidates_token_count or 0) if usage is not None else estimate_tokens(text or '')
+        metrics.record(backend.provider, backend.model, stage, prompt_tokens, completion_tokens,
+                       latency, waited, error=error)
+
+
+def call(backend, contents: str, system: str = '', max_tokens: int = None, cached_content: str = None,
+         stage: Optional[str] = 'call'):
+    """
+    One generate() with the provider's rate limit applied; the reservation is corrected to the
+    reported usage afterwards. The call is also recorded in metrics under `stage`; stage=None skips
+    that (BackendRouter's attempts, which the outer call already records).
+    """
+    prompt_tokens = estimate_tokens(system + contents)
+    reserved_tokens = prompt_tokens + (max_tokens or DEFAULT_MAX_TOKENS)
+    waited = 0.0 if routed(backend) else limiter.acquire(backend.provider, backend.model, tokens=reserved_tokens)
+    started = time.perf_counter()
+    text, usage, error = None, None, False
+    try:
+        text, usage = backend.generate(contents, cached_content=cached_content, system=system, max_tokens=max_tokens)
+        return text, usage
+    except Exception:
+        error = True
+        raise
+    finally:
+        _record(backend, stage, prompt_tokens, reserved_tokens, text, usage, time.perf_counter() - started, waited,
+                error)
+
+
+async def acall(backend, contents: str, system: str = '', max_tokens: int = None, cached_content: str = None,
+                stage: Optional[str] = 'call'):
+    """Coroutine form of call(): waits on the rate limit and the provider without blocking the event loop."""
+    prompt_tokens = estimate_tokens(system + contents)
+    reserved_tokens = prompt_tokens + (max_tokens or DEFAULT_MAX_TOKENS)
+    waited = 0.0
+    if not routed(backend):
+        waited = await limiter.acquire_async(backend.provider, backend.model, tokens=reserved_tokens)
+    started = time.perf_counter()
+    text, usage, error = None, None, False
+    try:
+        text, usage = await backend.agenerate(contents, cached_content=cached_content, system=system,
+                                              max_tokens=max_tokens)
+        return text, usage
+    except Exception:
+        error = True
+        raise
+    finally:
+        _record(backend, stage, prompt_tokens, reserved_tokens, text, usage, time.perf_counter() - started, waited,
+                error)
+
+
+class BackendRouter:
+    """
+    Serves requests from backends in priority order. A failed request moves on to the next
+    backend. With hedging, a request still running after the hedge delay is duplicated on the
+    next backend and whichever answers first is returned; the slower one finishes unobserved
+    (agenerate() cancels it instead).
+    """
+    provider = "router"
+    supports_prefix_cache = False
+
+    def __init__(self, backends: List, hedge: bool = HEDGE_ENABLED, hedge_delay: str = HEDGE_DELAY,
+                 max_hedges: int = 1):
+        self.backends = backends
+        self.model = ",".join(f"{b.provider}:{b.model}" for b in backends)
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.max_hedges = max_hedges
+        self.lock = threading.Lock()
+        self.latencies = {id(b): deque(maxlen=200) for b in backends}
+        self.counts = {f"{b.provider}:{b.model}": {"calls": 0, "wins": 0, "errors": 0} for b in backends}
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(backends), thread_name_prefix="llm-hedge")
+
+    def _name(self, backend) -> str:
+        return f"{backend.provider}:{backend.model}"
+
+    def delay(self, backend) -> float:
+        """Seconds to wait on `backend` before hedging."""
+        if self.hedge_delay != "p95":
+            return float(self.hedge_delay)
+        with self.lock:
+            samples = sorted(self.latencies[id(backend)])
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return samples[int(len(samples) * 0.95) - 1]
+
+    def _attempt(self, backend, contents, system, max_tokens):
+        started = time.perf_counter()
+        with self.lock:
+            self.counts[self._name(backend)]["calls"] += 1
+        try:
+            # stage=None: the request is recorded once, by whoever called the router
+            result = call(backend, contents, system=system, max_tokens=max_tokens, stage=None)
+        except Exception:
+            with self.lock:
+                self.counts[self._name(backend)]["errors"] += 1
+            raise
+        with self.lock:
+            self.latencies[id(backend)].append(time.perf_counter() - started)
+        return result
+
+    def generate(self, contents: str, cached_content: str = None, system: str = '',
+                 max_tokens: int = None) -> Tuple[str, object]:
+        pending = list(self.backends)
+        running = {}
+        hedges = 0
+        last_error = None
+
+        def launch():
+            backend = pending.pop(0)
+            # the copied context keeps the caller's rate-limit priority lane on the worker thread
+            ctx = contextvars.copy_context()
+            running[self.executor.submit(ctx.run, self._attempt, backend, contents, system, max_tokens)] = backend
+
+        launch()
+        while running:
+            primary = next(iter(running.values()))
+            can_hedge = self.hedge and pending and hedges < self.max_hedges
+            done, _ = wait(running, timeout=self.delay(primary) if can_hedge else None,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                hedges += 1
+                with self.lock:
+                    self.hedges_fired += 1
+                launch()
+                continue
+
+            for future in done:
+                backend = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[WARN] {self._name(backend)} failed: {e}")
+                    last_error = e
+                    continue
+                with self.lock:
+                    self.counts[self._name(backend)]["wins"] += 1
+                    if backend is not self.backends[0] and hedges:
+                        self.hedges_won += 1
+                return result
+            # everything in flight failed; fail over to the next backend
+            if not running and pending:
+                launch()
+
+        raise last_error or RuntimeError("No LLM backend available")
+
+    async def _aattempt(self, backend, contents, system, max_tokens):
+        started = time.perf_counter()
+        with self.lock:
+            self.counts[self._name(backend)]["calls"] += 1
+        try:
+            result = await acall(backend, contents, system=system, max_tokens=max_tokens, stage=None)
+        except Exception:
+            with self.lock:
+                self.counts[self._name(backend)]["errors"] += 1
+            raise
+        with self.lock:
+            self.latencies[id(backend)].append(time.perf_counter() - started)
+        return result
+
+    async def agenerate(self, contents: str, cached_content: str = None, system: str = '',
+                        max_tokens: int = None) -> Tuple[str, object]:
+        pending = list(self.backends)
+        running = {}
+        hedges = 0
+        last_error = None
+
+        def launch():
+            backend = pending.pop(0)
+            # tasks start in a copy of the caller's context, rate-limit lanes included
+            running[asyncio.ensure_future(self._aattempt(backend, contents, system, max_tokens))] = backend
+
+        launch()
+        try:
+            while running:
+                primary = next(iter(running.values()))
+                can_hedge = self.hedge and pending and hedges < self.max_hedges
+                done, _ = await asyncio.wait(running, timeout=self.delay(primary) if can_hedge else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedges += 1
+                    with self.lock:
+                        self.hedges_fired += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    backend = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"[WARN] {self._name(backend)} failed: {e}")
+                        last_error = e
+                        continue
+                    with self.lock:
+                        self.counts[self._name(backend)]["wins"] += 1
+                        if backend is not self.backends[0] and hedges:
+                            self.hedges_won += 1
+                    return result
+                if not running and pending:
+                    launch()
+        finally:
+            # unlike threads, the losing request can be stopped
+            for task in running:
+                task.cancel()
+
+        raise last_error or RuntimeError("No LLM backend available")
+
+    async def astream(self, contents: str, cached_content: str = None, system: str = '',
+                      max_tokens: int = None) -> AsyncIterator[Tuple[str, object]]:
+        # streams are not hedged; a backend that fails before its first chunk hands over to the next
+        last_error = None
+        reserved_tokens = estimate_tokens(system + contents) + (max_tokens or DEFAULT_MAX_TOKENS)
+        for backend in self.backends:
+            started = False
+            try:
+                await limiter.acquire_async(backend.provider, backend.model, tokens=reserved_tokens)
+                final_usage = None
+                async for text, usage in backend.astream(contents, system=system, max_tokens=max_tokens):
+                    started = True
+                    final_usage = usage or final_usage
+                    yield text, usage
+                if final_usage is not None and final_usage.total_token_count:
+                    limiter.record_tokens(backend.provider, backend.model,
+                                          final_usage.total_token_count - reserved_tokens)
+                return
+            except Exception as e:
+                if started:
+                    raise
+                print(f"[WARN] {self._name(backend)} stream failed: {e}")
+                last_error = e
+        raise last_error or RuntimeError("No LLM backend available")
+
+    def stats(self):
+        with self.lock:
+            report = {"hedges_fired": self.hedges_fired, "hedges_won": self.hedges_won, "backends": {}}
+            for backend in self.backends:
+                samples = sorted(self.latencies[id(backend)])
+                entry = dict(self.counts[self._name(backend)])
+                if samples:
+                    entry["p50_seconds"] = samples[len(samples) // 2]
+                    entry["p95_seconds"] = samples[max(int(len(samples) * 0.95) - 1, 0)]
+                report["backends"][self._name(backend)] = entry
+            return report
+
+
+def build_backend(spec: str):
+    """A backend from "provider[:model]", or a BackendRouter for a comma-separated priority list."""
+    backends = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        provider, _, model = part.partition(":")
+        provider = provider.lower()
+        if provider not in BACKENDS:
+            raise ValueError(f"Unknown LLM backend '{provider}', expected one of {sorted(BACKENDS)}")
+        backends.append(BACKENDS[provider](model) if model else BACKENDS[provider]())
+    if not backends:
+        raise ValueError("Empty LLM backend spec")
+    return backends[0] if len(backends) == 1 else BackendRouter(backends)
+
+
+_lock = threading.Lock()
+_backend = None
+
+
+def get_backend():
+    """The process-wide backend for think(), built from VOID_LLM_BACKEND on first use."""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = build_backend(os.getenv("VOID_LLM_BACKEND", "gemini"))
+    return _backend
+
+
+def set_backend(backend):
+    """Swap the process-wide backend, e.g. for a benchmark. Returns the previous one."""
+    global _backend
+    with _lock:
+        previous, _backend = _backend, backend
+    return previous
@@ -0,0 +1,181 @@
+from typing import Dict, Tuple
+import asyncio
+import os
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Process-wide LLM clients.
+#
+# One genai.Client and one pooled requests.Session per HTTP provider (Together, Groq) are built
+# lazily and reused for every call, so only the first request to a host pays TLS and connection
+# setup. Async callers get the same reuse from one httpx.AsyncClient per provider and event loop. Connection setup and request timings are kept per provider in `stats()` so the saving
+# from reuse can be read off directly (connects stays flat while requests keeps climbing).
+# Lives in void_shared/ with llm_backends; every service imports this one copy.
+
+CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "300"))
+POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+PROVIDER_URLS = {
+    "together": "https://api.together.ai/v1/chat/completions",
+    "groq": "https://api.groq.com/openai/v1/chat/completions",
+}
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+_sessions: Dict[str, requests.Session] = {}
+_async_clients: Dict[Tuple[str, int], object] = {}
+_gemini_client = None
+
+
+def _provider_stats(provider: str) -> Dict[str, float]:
+    if provider not in _stats:
+        _stats[provider] = {
+            "client_setup_seconds": 0.0,
+            "connects": 0,
+            "connect_seconds": 0.0,
+            "requests": 0,
+            "request_seconds": 0.0,
+            "first_request_seconds": None,
+        }
+    return _stats[provider]
+
+
+def record_request(provider: str, seconds: float):
+    with _lock:
+        entry = _provider_stats(provider)
+        entry["requests"] += 1
+        entry["request_seconds"] += seconds
+        if entry["first_request_seconds"] is None:
+            entry["first_request_seconds"] = seconds
+
+
+def _record_connect(provider: str, seconds: float):
+    with _lock:
+        entry = _provider_stats(provider)
+        entry["connects"] += 1
+        entry["connect_seconds"] += seconds
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Per-provider connection and request timings. avg_request_seconds excludes the first, cold request."""
+    with _lock:
+        report = {}
+        for provider, entry in _stats.items():
+            entry = dict(entry)
+            warm = entry["requests"] - 1
+            if warm > 0:
+                entry["avg_warm_request_seconds"] = (entry["request_seconds"] - entry["first_request_seconds"]) / warm
+            if entry["connects"]:
+                entry["avg_connect_seconds"] = entry["connect_seconds"] / entry["connects"]
+            report[provider] = entry
+        return report
+
+
+def _timed_connection(base, provider: str):
+    def connect(self):
+        started = time.perf_counter()
+        base.connect(self)
+        _record_connect(provider, time.perf_counter() - started)
+    return type(f"Timed{base.__name__}", (base,), {"connect": connect})
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with keep-alive pooling, default timeouts and timed connection setup."""
+
+    def __init__(self, provider: str, **kwargs):
+        self.provider = provider
+        super().__init__(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        http_pool = type("TimedHTTPConnectionPool", (HTTPConnectionPool,),
+                         {"ConnectionCls": _timed_connection(HTTPConnection, self.provider)})
+        https_pool = type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,),
+                          {"ConnectionCls": _timed_connection(HTTPSConnection, self.provider)})
+        self.poolmanager.pool_classes_by_scheme = {"http": http_pool, "https": https_pool}
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+def http_session(provider: str) -> requests.Session:
+    """The shared keep-alive session for an OpenAI-style HTTP provider."""
+    with _lock:
+        session = _sessions.get(provider)
+        if session is None:
+            started = time.perf_counter()
+            session = requests.Session()
+            adapter = PooledAdapter(provider)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[provider] = session
+            _provider_stats(provider)["client_setup_seconds"] += time.perf_counter() - started
+        return session
+
+
+def post_chat(provider: str, payload: dict, api_key: str, url: str = None, timeout=None) -> requests.Response:
+    """POST a chat-completions payload through the provider's pooled session."""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    started = time.perf_counter()
+    try:
+        return http_session(provider).post(url or PROVIDER_URLS[provider], headers=headers, json=payload, timeout=timeout)
+    finally:
+        record_request(provider, time.perf_counter() - started)
+
+
+def async_http_client(provider: str):
+    """The shared httpx.AsyncClient for a provider on the running event loop."""
+    import httpx
+    key = (provider, id(asyncio.get_running_loop()))
+    with _lock:
+        client = _async_clients.get(key)
+        if client is None:
+            started = time.perf_counter()
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            )
+            _async_clients[key] = client
+            _provider_stats(provider)["client_setup_seconds"] += time.perf_counter() - started
+        return client
+
+
+async def apost_chat(provider: str, payload: dict, api_key: str, url: str = None, timeout=None):
+    """Async post_chat(). The httpx response has the same status_code/text/json() as a requests one."""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    options = {"timeout": timeout} if timeout is not None else {}
+    started = time.perf_counter()
+    try:
+        return await async_http_client(provider).post(url or PROVIDER_URLS[provider], headers=headers, json=payload,
+                                                      **options)
+    finally:
+        record_request(provider, time.perf_counter() - started)
+
+
+def gemini_client():
+    """The shared google-genai client. Its underlying HTTP client keeps connections alive between calls."""
+    global _gemini_client
+    if _gemini_client is None:
+        with _lock:
+            if _gemini_client is None:
+                from google import genai
+                from google.genai import types
+                started = time.perf_counter()
+                _gemini_client = genai.Client(
+                    http_options=types.HttpOptions(timeout=int((CONNECT_TIMEOUT + READ_TIMEOUT) * 1000))
+                )
+                _provider_stats("gemini")["client_setup_seconds"] += time.perf_counter() - started
+    return _gemini_client
@@ -0,0 +1,201 @@
+from collections import deque
+from typing import Dict, List, Optional
+import bisect
+import os
+import threading
+import time
+from jsonl_log import JsonlLog
+from rate_limiter import current_agent
+
+# Rolling accounting of LLM calls.
+#
+# Every call records provider, model, stage, prompt/completion tokens, request latency and the
+# time spent waiting on the rate limiter. Counters are kept per stage, per provider:model and
+# per scheduler agent (calls made inside rate_limiter.agent_lane) for three spans of time: the
+# current rollup interval, the last RECENT_ROLLUPS intervals and the process lifetime. Each
+# finished interval is appended to METRICS_FILE as one JSON line, so cost and speed survive
+# restarts. The line goes through a jsonl_log.JsonlLog, written off the caller's thread and rotated
+# to METRICS_FILE + ".1" at METRICS_FILE_MAX_BYTES. snapshot() is what service_main's /metrics returns; comparing latency_seconds with
+# wait_seconds shows whether time goes to the model or the throttle.
+
+METRICS_FILE = os.getenv("VOID_METRICS_FILE", "metrics_rollups.jsonl")
+METRICS_FILE_MAX_BYTES = int(os.getenv("VOID_METRICS_FILE_MAX_BYTES", "10485760"))
+ROLLUP_SECONDS = int(os.getenv("VOID_METRICS_ROLLUP_SECONDS", "300"))
+RECENT_ROLLUPS = int(os.getenv("VOID_METRICS_RECENT_ROLLUPS", "12"))
+
+# histogram bucket upper bounds in seconds; the last bucket catches everything slower
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120]
+WAIT_BUCKETS = [0.01, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 120]
+
+
+def _bucket_labels(bounds: List[float]) -> List[str]:
+    return [f"le_{bound:g}" for bound in bounds] + ["inf"]
+
+
+def _percentile(histogram: List[int], bounds: List[float], q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th percentile (None for an empty or overflow bucket)."""
+    total = sum(histogram)
+    if not total:
+        return None
+    threshold = total * q / 100
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= threshold:
+            return bounds[index] if index < len(bounds) else None
+    return None
+
+
+class _Stats:
+    __slots__ = ("calls", "errors", "cache_hits", "coalesced", "prompt_tokens", "completion_tokens",
+                 "latency_seconds", "wait_seconds", "latency_histogram", "wait_histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def add(self, prompt_tokens: int, completion_tokens: int, latency: float, wait: float, error: bool):
+        self.calls += 1
+        self.errors += 1 if error else 0
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.latency_seconds += latency
+        self.wait_seconds += wait
+        self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.wait_histogram[bisect.bisect_left(WAIT_BUCKETS, wait)] += 1
+
+    def merge(self, other: "_Stats"):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.cache_hits += other.cache_hits
+        self.coalesced += other.coalesced
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.latency_seconds += other.latency_seconds
+        self.wait_seconds += other.wait_seconds
+        self.latency_histogram = [a + b for a, b in zip(self.latency_histogram, other.latency_histogram)]
+        self.wait_histogram = [a + b for a, b in zip(self.wait_histogram, other.wait_histogram)]
+
+    def to_dict(self) -> Dict:
+        calls = self.calls
+        return {
+            "calls": calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_seconds": round(self.latency_seconds, 3),
+            "wait_seconds": round(self.wait_seconds, 3),
+            "avg_latency_seconds": round(self.latency_seconds / calls, 3) if calls else 0.0,
+            "avg_wait_seconds": round(self.wait_seconds / calls, 3) if calls else 0.0,
+            "p50_latency_seconds": _percentile(self.latency_histogram, LATENCY_BUCKETS, 50),
+            "p95_latency_seconds": _percentile(self.latency_histogram, LATENCY_BUCKETS, 95),
+            "latency_histogram": dict(zip(_bucket_labels(LATENCY_BUCKETS), self.latency_histogram)),
+            "wait_histogram": dict(zip(_bucket_labels(WAIT_BUCKETS), self.wait_histogram)),
+        }
+
+
+class _Window:
+    """Per-stage, per-model and per-agent stats over one span of time."""
+
+    def __init__(self, started: float = None):
+        self.started = started or time.time()
+        self.stages: Dict[str, _Stats] = {}
+        self.models: Dict[str, _Stats] = {}
+        self.agents: Dict[str, _Stats] = {}
+
+    def entries(self, stage: str, model: str, agent: str) -> List[_Stats]:
+        entries = [self.stages.setdefault(stage, _Stats()), self.models.setdefault(model, _Stats())]
+        if agent:
+            entries.append(self.agents.setdefault(agent, _Stats()))
+        return entries
+
+    def merge(self, other: "_Window"):
+        self.started = min(self.started, other.started)
+        for mine, theirs in ((self.stages, other.stages), (self.models, other.models), (self.agents, other.agents)):
+            for key, stats in theirs.items():
+                mine.setdefault(key, _Stats()).merge(stats)
+
+    def to_dict(self, ended: float = None) -> Dict:
+        total = _Stats()
+        for stats in self.stages.values():
+            total.merge(stats)
+        return {
+            "started": self.started,
+            "ended": ended or time.time(),
+            "totals": total.to_dict(),
+            "stages": {key: stats.to_dict() for key, stats in sorted(self.stages.items())},
+            "models": {key: stats.to_dict() for key, stats in sorted(self.models.items())},
+            "agents": {key: stats.to_dict() for key, stats in sorted(self.agents.items())},
+        }
+
+
+class MetricsAggregator:
+    def __init__(self, path: str = METRICS_FILE, rollup_seconds: int = ROLLUP_SECONDS,
+                 recent_rollups: int = RECENT_ROLLUPS, max_bytes: int = METRICS_FILE_MAX_BYTES):
+        self.log = JsonlLog(path, max_bytes, name="metrics-log")
+        self.rollup_seconds = rollup_seconds
+        self.lock = threading.Lock()
+        self.lifetime = _Window()
+        self.current = _Window()
+        self.recent = deque(maxlen=recent_rollups)
+
+    def record(self, provider: str, model: str, stage: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+               latency: float = 0.0, wait: float = 0.0, error: bool = False):
+        key, agent = f"{provider}:{model}", current_agent()
+        with self.lock:
+            self._maybe_roll()
+            for window in (self.current, self.lifetime):
+                for stats in window.entries(stage, key, agent):
+                    stats.add(prompt_tokens or 0, completion_tokens or 0, latency, wait or 0.0, error)
+
+    def record_cache_hit(self, provider: str, model: str, stage: str):
+        """A call answered from the prompt cache: counted, but kept out of the latency histograms."""
+        self._count("cache_hits", provider, model, stage)
+
+    def record_coalesced(self, provider: str, model: str, stage: str):
+        """A call that shared an identical in-flight generation (singleflight.py) instead of sending its own."""
+        self._count("coalesced", provider, model, stage)
+
+    def _count(self, field: str, provider: str, model: str, stage: str):
+        key, agent = f"{provider}:{model}", current_agent()
+        with self.lock:
+            self._maybe_roll()
+            for window in (self.current, self.lifetime):
+                for stats in window.entries(stage, key, agent):
+                    setattr(stats, field, getattr(stats, field) + 1)
+
+    def _maybe_roll(self):
+        now = time.time()
+        if now - self.current.started < self.rollup_seconds:
+            return
+        finished, self.current = self.current, _Window(now)
+        self.recent.append(finished)
+        if finished.stages:
+            # only buffered here, under self.lock; the log's own thread does the file write
+            self.log.append(finished.to_dict(ended=now))
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            self._maybe_roll()
+            recent = _Window(self.current.started)
+            for window in list(self.recent) + [self.current]:
+                recent.merge(window)
+            return {
+                "rollup_seconds": self.rollup_seconds,
+                "current": self.current.to_dict(),
+                "recent": recent.to_dict(),
+                "lifetime": self.lifetime.to_dict(),
+            }
+
+
+metrics = MetricsAggregator()
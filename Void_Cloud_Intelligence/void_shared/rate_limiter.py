@@ -0,0 +1,254 @@
+from contextlib import contextmanager
+from typing import Dict, Tuple, Optional
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+
+# Token-bucket rate limiting for every LLM provider the Void talks to.
+#
+# Each (provider, model) pair gets a requests/min bucket and optionally a tokens/min bucket.
+# Callers queue per pair in priority order, so interactive requests (/intelligence, /interact)
+# go ahead of background life() work instead of waiting behind it. Within a priority, requests
+# from different agents (see agent_lane) are interleaved by weighted fair queuing, so several
+# life() agents sharing one provider quota each get their weight's share of requests instead of
+# whoever queues most going first. Acquisition works from plain threads (acquire) and from
+# coroutines (acquire_async) against the same buckets.
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+_current_priority = contextvars.ContextVar("rate_limit_priority", default=PRIORITY_BACKGROUND)
+# (agent name, weight); "" is every caller outside an agent_lane
+_current_agent = contextvars.ContextVar("rate_limit_agent", default=("", 1.0))
+
+
+@contextmanager
+def priority_lane(priority: int):
+    """Run the enclosed calls (and anything they fan out with a copied context) in the given lane."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> int:
+    return _current_priority.get()
+
+
+@contextmanager
+def agent_lane(name: str, weight: float = 1.0):
+    """Attribute the enclosed calls to agent `name`, which gets `weight` shares of each queue."""
+    token = _current_agent.set((name, max(float(weight), 0.01)))
+    try:
+        yield
+    finally:
+        _current_agent.reset(token)
+
+
+def current_agent() -> str:
+    return _current_agent.get()[0]
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # a single request larger than the bucket can still go through once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= amount
+
+
+class _Limit:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.waiters = []
+        # fair-queuing clock: start tag of the last ticket served, and each agent's next finish tag
+        self.virtual_time = 0.0
+        self.finish: Dict[str, float] = {}
+
+    def ticket(self, priority: int, seq: int):
+        agent, weight = _current_agent.get()
+        start = max(self.virtual_time, self.finish.get(agent, 0.0))
+        self.finish[agent] = start + 1.0 / weight
+        return (priority, start, seq, agent)
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        wait = self.requests.wait_time(1, now)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def take(self, tokens: int):
+        self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._limits: Dict[Tuple[str, str], _Limit] = {}
+        self._config: Dict[Tuple[str, str], Tuple[float, Optional[float]]] = {}
+        self._seq = itertools.count()
+        self.total_wait = 0.0
+        self.acquired = 0
+        self.agents: Dict[str, Dict[str, float]] = {}
+
+    def configure(self, provider: str, model: str = "*", requests_per_minute: float = 60, tokens_per_minute: float = None):
+        """Set limits for a provider/model. model="*" is the provider-wide default."""
+        with self._cond:
+            self._config[(provider, model)] = (requests_per_minute, tokens_per_minute)
+            self._limits.pop((provider, model), None)
+
+    def _limit(self, provider: str, model: str) -> Optional[_Limit]:
+        key = (provider, model)
+        if key not in self._limits:
+            config = self._config.get(key) or self._config.get((provider, "*"))
+            if config is None:
+                return None
+            self._limits[key] = _Limit(*config)
+        return self._limits[key]
+
+    def _poll(self, limit: _Limit, ticket, tokens: int) -> float:
+        """Take capacity for `ticket` if it is first in line. Returns 0 when taken, else seconds to wait."""
+        now = time.monotonic()
+        if limit.waiters[0] != ticket:
+            return 0.05
+        wait = limit.wait_time(tokens, now)
+        if wait > 0:
+            return wait
+        limit.take(tokens)
+        limit.virtual_time = ticket[1]
+        heapq.heappop(limit.waiters)
+        self._cond.notify_all()
+        return 0.0
+
+    def acquire(self, provider: str, model: str, tokens: int = 0, priority: int = None, timeout: float = None) -> float:
+        """Block until a request of `tokens` tokens may be sent. Returns the seconds spent waiting."""
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        with self._cond:
+            limit = self._limit(provider, model)
+            if limit is None:
+                return 0.0
+            ticket = limit.ticket(priority, next(self._seq))
+            heapq.heappush(limit.waiters, ticket)
+            try:
+                while True:
+                    wait = self._poll(limit, ticket, tokens)
+                    if wait == 0.0:
+                        break
+                    if timeout is not None and time.monotonic() - started + wait > timeout:
+                        raise TimeoutError(f"Rate limit wait for {provider}/{model} exceeded {timeout}s")
+                    self._cond.wait(wait)
+            except BaseException:
+                if ticket in limit.waiters:
+                    limit.waiters.remove(ticket)
+                    heapq.heapify(limit.waiters)
+                    self._cond.notify_all()
+                raise
+            waited = time.monotonic() - started
+            self._account(ticket[3], waited)
+            return waited
+
+    async def acquire_async(self, provider: str, model: str, tokens: int = 0, priority: int = None, timeout: float = None) -> float:
+        """Coroutine form of acquire(); sleeps on the event loop instead of blocking it."""
+        priority = current_priority() if priority is None else priority
+        started = time.monotonic()
+        with self._cond:
+            limit = self._limit(provider, model)
+            if limit is None:
+                return 0.0
+            ticket = limit.ticket(priority, next(self._seq))
+            heapq.heappush(limit.waiters, ticket)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._poll(limit, ticket, tokens)
+                if wait == 0.0:
+                    break
+                if timeout is not None and time.monotonic() - started + wait > timeout:
+                    raise TimeoutError(f"Rate limit wait for {provider}/{model} exceeded {timeout}s")
+                # re-check often enough to notice our turn coming up while sleeping
+                await asyncio.sleep(min(wait, 0.25))
+        except BaseException:
+            with self._cond:
+                if ticket in limit.waiters:
+                    limit.waiters.remove(ticket)
+                    heapq.heapify(limit.waiters)
+                    self._cond.notify_all()
+            raise
+        waited = time.monotonic() - started
+        with self._cond:
+            self._account(ticket[3], waited)
+        return waited
+
+    def _account(self, agent: str, waited: float):
+        self.total_wait += waited
+        self.acquired += 1
+        entry = self.agents.setdefault(agent, {"acquired": 0, "wait_seconds": 0.0})
+        entry["acquired"] += 1
+        entry["wait_seconds"] += waited
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "acquired": self.acquired,
+                "wait_seconds": self.total_wait,
+                "agents": {
+                    agent: dict(entry, avg_wait_seconds=entry["wait_seconds"] / entry["acquired"])
+                    for agent, entry in self.agents.items()
+                },
+            }
+
+    def record_tokens(self, provider: str, model: str, tokens: int):
+        """Charge (or refund, if negative) tokens after the real usage of a call is known."""
+        with self._cond:
+            limit = self._limit(provider, model)
+            if limit is not None and limit.tokens is not None and tokens:
+                limit.tokens.take(tokens)
+                self._cond.notify_all()
+
+
+def _env_limit(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+limiter = RateLimiter()
+
+limiter.configure("gemini", "gemini-2.5-flash-lite",
+                  requests_per_minute=_env_limit("GEMINI_FLASH_LITE_RPM", 15),
+                  tokens_per_minute=_env_limit("GEMINI_FLASH_LITE_TPM", 250000))
+limiter.configure("gemini", "gemini-2.5-flash",
+                  requests_per_minute=_env_limit("GEMINI_FLASH_RPM", 10),
+                  tokens_per_minute=_env_limit("GEMINI_FLASH_TPM", 250000))
+limiter.configure("together", "*",
+                  requests_per_minute=_env_limit("TOGETHER_RPM", 60))
+limiter.configure("groq", "*",
+                  requests_per_minute=_env_limit("GROQ_RPM", 30),
+                  tokens_per_minute=_env_limit("GROQ_TPM", 6000))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt size (about four characters per token) for reserving bucket capacity up front."""
+    return max(1, len(text) // 4)